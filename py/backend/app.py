@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
+import itertools
 import json
+import logging
+import os
+import re
 import sys
-from functools import lru_cache
-from itertools import combinations
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
 
 import numpy as np
-from fastapi import FastAPI, HTTPException
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -16,31 +27,116 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
-from mvp.kg import (  # noqa: E402
-    KGConfig,
-    build_kg,
-    relatedness_adamic_adar,
-    relatedness_jaccard,
-    relatedness_metapath,
-    relatedness_ppr,
-)
-from mvp.pipeline import RecruitingMVP  # noqa: E402
+from mvp.cache import LRUCache  # noqa: E402
+from mvp.data_utils import LOADER_VERSION, PERSONALITY_TRAITS  # noqa: E402
+from mvp.executor import Overloaded, WorkPool  # noqa: E402
+from mvp.kg import CompiledKG, KGConfig, build_compiled_kg, candidate_skill_names, load_roles  # noqa: E402
+from mvp.pipeline import Candidate, RecruitingMVP, RoleQuery  # noqa: E402
+from mvp.skills import DEFAULT_MATCHER  # noqa: E402
+from mvp.team import TeamProblem, optimize_teams  # noqa: E402
+from mvp.shards import candidate_sources  # noqa: E402
+from mvp.snapshot import Journal, content_hash, load_or_build, memory_report  # noqa: E402
 
 DATA_DIR = BASE_DIR / "mvp" / "data"
 CP_CUP_CSV = DATA_DIR / "DUMMY for CP CUP.csv"
+# Candidates split across files (a directory or glob of CSV exports) replace CP_CUP_CSV;
+# the shards load in KG_INGEST_WORKERS processes (default: one per CPU).
+CANDIDATE_SOURCE = os.environ.get("KG_CANDIDATES")
+INGEST_WORKERS = int(os.environ.get("KG_INGEST_WORKERS", "0")) or None
 TEAMS_CSV = DATA_DIR / "sample_teams.csv"
 ROLE_JSON = DATA_DIR / "role_requirements.json"
+# Further roles, one JSON file each in the role_requirements.json schema (optional).
+# ROLE_JSON stays the default role for requests that do not name one.
+ROLES_DIR = Path(os.environ.get("KG_ROLES_DIR", DATA_DIR / "roles"))
+INDEX_DIR = Path(os.environ.get("KG_INDEX_DIR", BASE_DIR / ".index"))
+# /search retrieval: "exact" scores everyone, "approx" scores a retrieved shortlist,
+# "auto" switches to approx once the roster reaches APPROX_MIN_ROWS.
+SEARCH_MODE = os.environ.get("SEARCH_MODE", "auto")
+APPROX_MIN_ROWS = int(os.environ.get("APPROX_MIN_ROWS", "20000"))
+SHORTLIST_SIZE = int(os.environ.get("SHORTLIST_SIZE", "300"))
+# Wall-clock budget for searching alternative teams in /team/evaluate.
+TEAM_SEARCH_BUDGET = float(os.environ.get("TEAM_SEARCH_BUDGET_MS", "200")) / 1000.0
+# Threads for scoring work, and per-endpoint (concurrency, queue) limits; override one
+# lane with e.g. SEARCH_CONCURRENCY=8 SEARCH_QUEUE=64.
+SCORING_WORKERS = int(os.environ.get("SCORING_WORKERS", str(min(8, os.cpu_count() or 1))))
+LANE_LIMITS = {"search": (4, 32), "candidates": (4, 32), "team": (2, 16), "ingest": (1, 16)}
+# Seconds between background TF-IDF refits after ingestion (0 disables the thread).
+REFIT_INTERVAL = float(os.environ.get("KG_REFIT_INTERVAL", "300"))
+# Rows per chunk when streaming CP_CUP_CSV into the index (0 reads it whole), and
+# KG_COMPACT_FRAMES=1 to keep experience and Big-5 scores as float32.
+LOAD_CHUNKSIZE = int(os.environ.get("KG_LOAD_CHUNKSIZE", "50000"))
+COMPACT_FRAMES = os.environ.get("KG_COMPACT_FRAMES", "0") == "1"
+# Seconds between data-file change checks that trigger a hot reload (0 disables the watcher).
+RELOAD_POLL_INTERVAL = float(os.environ.get("KG_RELOAD_POLL", "5"))
+
+logger = logging.getLogger(__name__)
 
-if not all(path.exists() for path in (CP_CUP_CSV, TEAMS_CSV, ROLE_JSON)):
-    missing = [str(p) for p in (CP_CUP_CSV, TEAMS_CSV, ROLE_JSON) if not p.exists()]
+_REQUIRED_FILES = (TEAMS_CSV, ROLE_JSON) if CANDIDATE_SOURCE else (CP_CUP_CSV, TEAMS_CSV, ROLE_JSON)
+if not all(path.exists() for path in _REQUIRED_FILES):
+    missing = [str(p) for p in _REQUIRED_FILES if not p.exists()]
     raise RuntimeError(f"Missing data files for knowledge graph backend: {missing}")
 
-ROLE_CONFIG = json.loads(ROLE_JSON.read_text())
-DEFAULT_REQUIRED = ROLE_CONFIG.get("required_skills", [])
-DEFAULT_NICE = ROLE_CONFIG.get("nice_to_have", [])
-ROLE_NODE = f"role:{ROLE_CONFIG['role']}"
 
-app = FastAPI(title="CP Konha Graph-RAG API", version="0.1.0")
+@dataclass(frozen=True)
+class RoleConfig:
+    title: str
+    required: List[str]
+    nice_to_have: List[str]
+
+    @property
+    def node(self) -> str:
+        return f"role:{self.title}"
+
+    @property
+    def slug(self) -> str:
+        return _slug(self.title)
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "RoleConfig":
+        return cls(config["role"], config.get("required_skills", []), config.get("nice_to_have", []))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RoleConfig":
+        return cls.from_dict(json.loads(path.read_text()))
+
+
+def _slug(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+def _role_files() -> List[Path]:
+    """Role definitions: ROLE_JSON first, then ROLES_DIR in file-name order."""
+    extra = sorted(ROLES_DIR.glob("*.json")) if ROLES_DIR.is_dir() else []
+    return [ROLE_JSON, *(path for path in extra if path.resolve() != ROLE_JSON.resolve())]
+
+
+def _candidate_files() -> List[Path]:
+    return candidate_sources(CANDIDATE_SOURCE) if CANDIDATE_SOURCE else [CP_CUP_CSV]
+
+
+def _load_roles(files: List[Path]) -> Dict[str, RoleConfig]:
+    """Role registry keyed by slug, in file order (the first role is the default)."""
+    roles: Dict[str, RoleConfig] = {}
+    for config in load_roles(files):
+        role = RoleConfig.from_dict(config)
+        if role.slug in roles:
+            raise ValueError(f"Roles {roles[role.slug].title!r} and {role.title!r} share the slug {role.slug!r}")
+        roles[role.slug] = role
+    return roles
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    stop = threading.Event()
+    if REFIT_INTERVAL > 0:
+        threading.Thread(target=_refit_loop, args=(stop,), name="index-refit", daemon=True).start()
+    if RELOAD_POLL_INTERVAL > 0:
+        threading.Thread(target=_watch_loop, args=(stop,), name="index-watch", daemon=True).start()
+    yield
+    stop.set()
+
+
+app = FastAPI(title="CP Konha Graph-RAG API", version="0.1.0", lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -67,11 +163,72 @@ class SearchRequest(BaseModel):
     niceToHave: List[str] | None = Field(default=None, description="List of optional skills")
     teamSize: Optional[int] = Field(default=None, ge=1)
     limit: int = Field(default=10, ge=1, le=100)
+    role: Optional[str] = Field(default=None, description="Role slug or title; defaults to the configured role")
+    mode: Optional[Literal["exact", "approx", "auto"]] = Field(
+        default=None, description="Retrieval mode; defaults to the SEARCH_MODE setting"
+    )
+    mustHave: List[str] | None = Field(default=None, description="Skills or name tokens every result must match")
+    anyOf: List[str] | None = Field(default=None, description="Skills or name tokens of which results match at least one")
+    exclude: List[str] | None = Field(default=None, description="Skills or name tokens that drop a candidate")
+    cursor: Optional[str] = Field(default=None, description="nextCursor of the previous page")
+    stream: bool = Field(default=False, description="Return one profile per line (NDJSON)")
+    fields: List[str] | str | None = Field(default=None, description="Profile fields to return; all when unset")
+
+    def filters(self) -> "Filters":
+        return tuple(tuple(sorted(set(_parse_skills(terms)))) for terms in (self.mustHave, self.anyOf, self.exclude))
+
+
+class CandidateIn(BaseModel):
+    id: str = Field(min_length=1, description="Employee id; must not already be indexed")
+    name: str = Field(min_length=1)
+    businessUnit: str = ""
+    role: str = ""
+    skills: List[str] | str = Field(default_factory=list)
+    yearsExperience: Optional[float] = None
+    pastProjects: str = ""
+    summary: str = ""
+    resumeText: str = ""
+    O: Optional[float] = None
+    C: Optional[float] = None
+    E: Optional[float] = None
+    A: Optional[float] = None
+    N: Optional[float] = None
+
+    def to_row(self) -> dict:
+        skills = self.skills if isinstance(self.skills, str) else "; ".join(self.skills)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "business_unit": self.businessUnit,
+            "role": self.role,
+            "skills": skills,
+            "years_experience": self.yearsExperience,
+            "past_projects": self.pastProjects,
+            "summary": self.summary,
+            "resume_text": self.resumeText,
+            **{trait: getattr(self, trait) for trait in "OCEAN"},
+        }
 
 
 class TeamEvaluationRequest(BaseModel):
     candidateIds: List[str] = Field(default_factory=list)
     requiredSkills: List[str] | None = None
+    role: Optional[str] = None
+    diversityWeight: float = Field(default=0.0, ge=0.0, le=1.0, description="Weight of Big-5 spread in alternatives")
+
+    @property
+    def required(self) -> List[str]:
+        skills = self.requiredSkills or []
+        return [s.strip().lower() for s in skills if s]
+
+
+class TeamBatchRequest(BaseModel):
+    teams: List[List[str]] = Field(default_factory=list, description="Candidate id lists, one per team")
+    requiredSkills: List[str] | None = None
+    role: Optional[str] = None
+    includeAlternatives: bool = False
+    diversityWeight: float = Field(default=0.0, ge=0.0, le=1.0)
+    stream: bool = Field(default=False, description="Return one JSON result per line (NDJSON)")
 
     @property
     def required(self) -> List[str]:
@@ -91,249 +248,1107 @@ class TeamEvaluationResponse(BaseModel):
     alternatives: List[dict]
 
 
-@lru_cache(maxsize=1)
-def _load_mvp() -> RecruitingMVP:
-    return RecruitingMVP(str(CP_CUP_CSV))
+def _build_index(role_files: List[Path], role: RoleConfig) -> Tuple[RecruitingMVP, CompiledKG]:
+    started = time.perf_counter()
+    source = CANDIDATE_SOURCE or str(CP_CUP_CSV)
+    mvp = RecruitingMVP(source, chunksize=LOAD_CHUNKSIZE or None, compact=COMPACT_FRAMES, workers=INGEST_WORKERS)
+    stages = {"mvp": time.perf_counter() - started}
+    if mvp.ingest_report is not None:
+        _RELOAD_STATUS["ingest"] = mvp.ingest_report
+        logger.info(
+            "Loaded %d candidates from %d files with %d workers (%.0f rows/s per core)",
+            mvp.ingest_report["rows"],
+            mvp.ingest_report["files"],
+            mvp.ingest_report["workers"],
+            mvp.ingest_report["rowsPerCoreSecond"],
+        )
+    # The KG reuses the parsed frame and links the raw "skills" entries, the same
+    # names ingestion links through candidate_skill_names. Every role becomes a
+    # node, so the snapshot stores one PPR vector per role.
+    cfg = KGConfig(role_id=role.node)
+    graph = build_compiled_kg(mvp.df, str(TEAMS_CSV), role_files, cfg, timings=stages, skills_column="skills")
+    _RELOAD_STATUS["buildStages"] = stages
+    logger.info("Index built in %.2fs: %s", time.perf_counter() - started, stages)
+    return mvp, graph
+
+
+def _index_key(role_files: List[Path], role: RoleConfig) -> str:
+    return content_hash(
+        (*_candidate_files(), TEAMS_CSV, *role_files),
+        json.dumps(DEFAULT_MATCHER.taxonomy, sort_keys=True),
+        repr(KGConfig(role_id=role.node)),
+        f"loader={LOADER_VERSION} compact={COMPACT_FRAMES}",
+    )
+
+
+@dataclass
+class KGSignals:
+    """Role-to-candidate KG signals aligned with the rows of the MVP frame."""
+
+    meta: np.ndarray
+    ppr: np.ndarray
+    aa: np.ndarray
+    max_meta: float
+    max_ppr: float
+    max_aa: float
+
+
+# Revisions come from one process-wide counter, so a version string is never
+# reused, not even by a reload that maps the same snapshot again.
+_REVISIONS = itertools.count()
+
+
+class SearchIndex:
+    """Everything a request reads (MVP, KG and lookups derived from them).
+
+    Instances are never mutated: ingestion builds a new one and swaps it in, so a
+    request that grabbed an index sees consistent rows, matrices and graph.
+    """
+
+    def __init__(
+        self,
+        mvp: RecruitingMVP,
+        graph: CompiledKG,
+        roles: Dict[str, RoleConfig],
+        key: str,
+        revision: Optional[int] = None,
+        build_seconds: float = 0.0,
+        journal: Optional[Journal] = None,
+    ):
+        self.mvp = mvp
+        self.graph = graph
+        self.roles = roles
+        self.role = next(iter(roles.values()))  # the default role
+        self.key = key
+        self.journal = journal  # candidate changes on top of the snapshot, shared by derived indexes
+        self.revision = next(_REVISIONS) if revision is None else revision
+        self.build_seconds = build_seconds
+        self.loaded_at = time.time()
+        # Per-role artifacts keyed by slug, built on first use and kept for this index.
+        self._kg_signals: Dict[str, KGSignals] = {}
+        self._role_queries: Dict[str, RoleQuery] = {}
+        self._role_rankings: Dict[str, ScoredProfiles] = {}
+
+    @property
+    def version(self) -> str:
+        return f"{self.key[:12]}.{self.revision}"
+
+    def derive(self, mvp: RecruitingMVP, graph: CompiledKG) -> "SearchIndex":
+        derived = SearchIndex(mvp, graph, self.roles, self.key, build_seconds=self.build_seconds, journal=self.journal)
+        derived.loaded_at = self.loaded_at
+        return derived
+
+    def resolve_role(self, name: Optional[str] = None) -> RoleConfig:
+        """Role by slug or title (the default role for None); KeyError if unknown."""
+        if not name:
+            return self.role
+        return self.roles[_slug(name)]
+
+    def kg_signals(self, role: RoleConfig) -> KGSignals:
+        # The KG signals only depend on the role node, so every query for a role shares them.
+        signals = self._kg_signals.get(role.slug)
+        if signals is None:
+            graph = self.graph
+            rows = graph.candidate_rows(f"candidate:{cid}" for cid in self.mvp.store().ids)
+            found = rows >= 0
+
+            def _per_row(values: np.ndarray) -> np.ndarray:
+                return np.where(found, values[np.where(found, rows, 0)] if len(values) else 0.0, 0.0)
+
+            node = role.node
+            meta = _per_row(graph.metapath(node))
+            ppr = _per_row(graph.ppr(node))
+            aa = _per_row(graph.adamic_adar(node))
+            signals = self._kg_signals[role.slug] = KGSignals(
+                meta=meta,
+                ppr=ppr,
+                aa=aa,
+                max_meta=float(meta.max()) if len(meta) else 1.0,
+                max_ppr=float(ppr.max()) if len(ppr) else 1.0,
+                max_aa=float(aa.max()) if len(aa) else 1.0,
+            )
+        return signals
+
+    def role_query(self, role: RoleConfig) -> RoleQuery:
+        """The role's own requirements, vectorised once per index."""
+        query = self._role_queries.get(role.slug)
+        if query is None:
+            required, nice_to_have = _role_key(role, [], [])
+            query = self._role_queries[role.slug] = self.mvp.role_query(list(required), list(nice_to_have))
+        return query
+
+    def role_ranking(self, role: RoleConfig) -> "ScoredProfiles":
+        """Exact ranking of everyone for the role's own requirements, scored once per index."""
+        ranking = self._role_rankings.get(role.slug)
+        if ranking is None:
+            query = self.role_query(role)
+            ranking = self._role_rankings[role.slug] = ScoredProfiles(
+                self, query.required, query.nice_to_have, role=role, query=query
+            )
+        return ranking
+
+    @property
+    def positions(self) -> Dict[str, int]:
+        return self.mvp.store().positions
+
+
+_INDEX: Optional[SearchIndex] = None
+_INDEX_LOCK = threading.RLock()  # serialises index swaps, ingestion and refits
+_RELOAD_LOCK = threading.Lock()  # one data reload at a time; held while building
+_RELOAD_STATUS: dict = {"reloads": 0, "lastError": None}
+
+
+def _data_signature() -> Tuple[Tuple[str, int, int], ...]:
+    # Role and candidate shard files are listed too, so adding or removing one counts as a change.
+    paths = (*_candidate_files(), TEAMS_CSV, *_role_files())
+    return tuple((str(path), st.st_mtime_ns, st.st_size) for path, st in ((p, p.stat()) for p in paths))
+
+
+def _load_search_index() -> SearchIndex:
+    """Read the data files and memory-map (or build) the matching snapshot."""
+    started = time.perf_counter()
+    role_files = _role_files()
+    roles = _load_roles(role_files)
+    default = next(iter(roles.values()))
+    key = _index_key(role_files, default)
+    mvp, graph = load_or_build(INDEX_DIR, key, lambda: _build_index(role_files, default))
+    journal = Journal(INDEX_DIR / key)
+    mvp, graph = _replay(mvp, graph, journal.read())
+    _warm_retriever(mvp)
+    index = SearchIndex(mvp, graph, roles, key, build_seconds=time.perf_counter() - started, journal=journal)
+    # Score every configured role up front so their rankings are lookups from the first request.
+    for role in roles.values():
+        index.role_ranking(role)
+    index.build_seconds = time.perf_counter() - started
+    return index
 
 
-@lru_cache(maxsize=1)
-def _load_graph():
-    cfg = KGConfig(role_id=ROLE_NODE)
-    return build_kg(str(CP_CUP_CSV), str(TEAMS_CSV), str(ROLE_JSON), cfg)
+def _warm_retriever(mvp: RecruitingMVP) -> None:
+    # Fit the SVD/IVF stage up front where /search will use it, not on the first request.
+    if SEARCH_MODE == "approx" or (SEARCH_MODE == "auto" and len(mvp.df) >= APPROX_MIN_ROWS):
+        mvp.retriever()
 
 
-def _candidate_row_by_id(candidate_id: str):
-    mvp = _load_mvp()
-    df = mvp.df
-    match = df[df["id"] == candidate_id]
-    if match.empty:
+def _index() -> SearchIndex:
+    """Current index; the first call memory-maps (or builds) the snapshot."""
+    global _INDEX
+    index = _INDEX
+    if index is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _RELOAD_STATUS["signature"] = _data_signature()
+                _INDEX = _load_search_index()
+            index = _INDEX
+    return index
+
+
+def _swap_index(index: SearchIndex) -> None:
+    global _INDEX
+    _INDEX = index
+    _PROFILE_STORE.clear()
+    _RESULT_CACHE.clear()
+
+
+def reload_index(force: bool = False) -> dict:
+    """Rebuild from the data files while the current index keeps serving, then swap.
+
+    Returns without rebuilding when the data hashes to the live index key unless
+    ``force`` is set. Candidates added or deleted through the API are replayed from
+    the snapshot's journal; when the files changed, the new snapshot starts with an
+    empty journal, since the files are the source of truth.
+    """
+    with _RELOAD_LOCK:
+        signature = _data_signature()
+        current = _index()
+        role_files = _role_files()
+        if not force and _index_key(role_files, RoleConfig.from_file(ROLE_JSON)) == current.key:
+            _RELOAD_STATUS["signature"] = signature
+            return {"reloaded": False, **_index_info(current)}
+        try:
+            fresh = _load_search_index()
+        except Exception as exc:
+            _RELOAD_STATUS["lastError"] = f"{type(exc).__name__}: {exc}"
+            raise
+        with _INDEX_LOCK:
+            _swap_index(fresh)
+        _RELOAD_STATUS.update(signature=signature, reloads=_RELOAD_STATUS["reloads"] + 1, lastError=None)
+        return {"reloaded": True, **_index_info(fresh)}
+
+
+def _index_info(index: SearchIndex) -> dict:
+    return {
+        "version": index.version,
+        "rows": len(index.mvp.df),
+        "role": index.role.title,
+        "roles": len(index.roles),
+        "buildSeconds": index.build_seconds,
+        "loadedAt": index.loaded_at,
+    }
+
+
+def _watch_loop(stop: threading.Event) -> None:
+    while not stop.wait(RELOAD_POLL_INTERVAL):
+        try:
+            if _INDEX is not None and _data_signature() != _RELOAD_STATUS.get("signature"):
+                reload_index()
+            elif _INDEX is not None:
+                with _INDEX_LOCK:
+                    _sync_journal()
+        except Exception:  # files may be mid-write; retry on the next tick
+            logger.exception("Index hot reload failed")
+
+
+def _candidate_by_id(index: SearchIndex, candidate_id: str) -> Candidate:
+    candidate = index.mvp.store().get(candidate_id)
+    if candidate is None:
         raise KeyError(candidate_id)
-    return match.iloc[0]
-
-
-def _score_candidates(required: List[str], nice_to_have: List[str], limit: int) -> List[dict]:
-    mvp = _load_mvp()
-    required = required or DEFAULT_REQUIRED
-    nice_to_have = nice_to_have or DEFAULT_NICE
-    df = mvp.search_candidates(required=required, nice_to_have=nice_to_have, top_k=max(limit, len(mvp.df)))
-
-    graph = _load_graph()
-    role_node = ROLE_NODE
-
-    records = df.to_dict(orient="records")
-    scores = []
-    meta_vals, ppr_vals, jac_vals, aa_vals = [], [], [], []
-
-    for row in records:
-        candidate_node = f"candidate:{row['id']}"
-        meta = float(relatedness_metapath(graph, role_node, candidate_node))
-        ppr = float(relatedness_ppr(graph, role_node, candidate_node))
-        jac = float(relatedness_jaccard(graph, role_node, candidate_node))
-        aa = float(relatedness_adamic_adar(graph, role_node, candidate_node))
-        meta_vals.append(meta)
-        ppr_vals.append(ppr)
-        jac_vals.append(jac)
-        aa_vals.append(aa)
-        scores.append((row, meta, ppr, jac, aa))
-
-    max_meta = max(meta_vals) if meta_vals else 1.0
-    max_ppr = max(ppr_vals) if ppr_vals else 1.0
-    max_jac = max(jac_vals) if jac_vals else 1.0
-    max_aa = max(aa_vals) if aa_vals else 1.0
-
-    payload: List[dict] = []
-    for row, meta, ppr, jac, aa in scores:
-        canon_skills = row.get("canonical_skills")
-        if isinstance(canon_skills, str):
-            canon_skills = canon_skills.replace(";", ",").split(",")
-        if isinstance(canon_skills, (set, tuple)):
-            canon_skills = list(canon_skills)
-        canon_skills = [skill.strip() for skill in canon_skills or [] if skill]
-
-        skill_score = float(row.get("coverage_required", 0.0))
-        network_score = 0.5 * (meta / max_meta if max_meta else 0.0) + 0.3 * (
-            ppr / max_ppr if max_ppr else 0.0
-        ) + 0.2 * (aa / max_aa if max_aa else 0.0)
-
-        semantic_score = float(row.get("sem_score", 0.0))
-        coverage_nice = float(row.get("coverage_nice", 0.0))
-        years_exp = float(row.get("years_experience", 0.0))
-        final_score = float(row.get("final_score", 0.0))
-
-        required_pct = int(round(skill_score * 100))
-        nice_pct = int(round(coverage_nice * 100))
-
-        rationale_short = (
-            f"{row['name']} covers {required_pct}% of required skills"
-            f" and brings {years_exp:.0f} years experience."
+    return candidate
+
+
+# (must-have, any-of, exclude) terms, each sorted and lower-cased.
+Filters = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+NO_FILTERS: Filters = ((), (), ())
+
+
+PROFILE_FIELDS = (
+    "id",
+    "name",
+    "title",
+    "photo",
+    "score",
+    "skillScore",
+    "networkScore",
+    "semanticScore",
+    "coverageNice",
+    "yearsExperience",
+    "topSkills",
+    "canonicalSkills",
+    "resumeText",
+    "rationaleShort",
+    "rationaleFull",
+)
+
+
+def _clip(value: float) -> float:
+    return max(0.0, min(1.0, value))
+
+
+class CandidateProfile:
+    """One candidate in a ranking: scores read up front, text fields formatted on access.
+
+    Reads like a read-only mapping over ``PROFILE_FIELDS``; ``to_dict`` builds the
+    JSON payload for just the fields asked for.
+    """
+
+    __slots__ = ("ranking", "pos", "skill_score", "network_score", "semantic_score", "coverage_nice", "final_score")
+
+    def __init__(self, ranking: "ScoredProfiles", pos: int):
+        scores, kg = ranking.scores, ranking.kg
+        self.ranking = ranking
+        self.pos = pos
+        self.skill_score = float(scores.coverage_required[pos])
+        self.semantic_score = float(scores.sem_score[pos])
+        self.coverage_nice = float(scores.coverage_nice[pos])
+        self.final_score = float(scores.final_score[pos])
+        meta, ppr, aa = float(kg.meta[pos]), float(kg.ppr[pos]), float(kg.aa[pos])
+        self.network_score = 0.5 * (meta / kg.max_meta if kg.max_meta else 0.0) + 0.3 * (
+            ppr / kg.max_ppr if kg.max_ppr else 0.0
+        ) + 0.2 * (aa / kg.max_aa if kg.max_aa else 0.0)
+
+    def __getitem__(self, field: str):
+        try:
+            getter = _PROFILE_GETTERS[field]
+        except KeyError:
+            raise KeyError(field) from None
+        return getter(self)
+
+    def get(self, field: str, default=None):
+        getter = _PROFILE_GETTERS.get(field)
+        return default if getter is None else getter(self)
+
+    def to_dict(self, fields: Optional[Tuple[str, ...]] = None) -> dict:
+        return {field: _PROFILE_GETTERS[field](self) for field in fields or PROFILE_FIELDS}
+
+    @property
+    def candidate(self) -> Candidate:
+        return Candidate(self.ranking.store, self.pos)
+
+    @property
+    def id(self) -> str:
+        return self.ranking.store.ids[self.pos]
+
+    @property
+    def name(self) -> str:
+        return self.candidate.name
+
+    @property
+    def years_experience(self) -> float:
+        return float(self.ranking.store.years[self.pos])
+
+    @property
+    def canonical_skills(self) -> List[str]:
+        return [skill.strip() for skill in self.candidate.skills if skill]
+
+    def rationale_short(self) -> str:
+        required_pct = int(round(self.skill_score * 100))
+        return (
+            f"{self.name} covers {required_pct}% of required skills"
+            f" and brings {self.years_experience:.0f} years experience."
         )
-        rationale_full = (
-            f"Semantic similarity {semantic_score:.2f}, required skill coverage {required_pct}%"
+
+    def rationale_full(self) -> str:
+        kg, pos = self.ranking.kg, self.pos
+        meta, ppr, aa = float(kg.meta[pos]), float(kg.ppr[pos]), float(kg.aa[pos])
+        required_pct = int(round(self.skill_score * 100))
+        nice_pct = int(round(self.coverage_nice * 100))
+        return (
+            f"Semantic similarity {self.semantic_score:.2f}, required skill coverage {required_pct}%"
             f" plus optional skill coverage {nice_pct}%."
             f" KG meta-path: {meta:.3f}, PPR: {ppr:.4f}, Adamic/Adar: {aa:.3f}."
         )
 
-        payload.append(
-            {
-                "id": row["id"],
-                "name": row.get("name", row["id"]),
-                "title": ROLE_CONFIG["role"],
-                "photo": f"https://i.pravatar.cc/150?u={row['id']}",
-                "score": max(0.0, min(1.0, final_score)),
-                "skillScore": max(0.0, min(1.0, skill_score)),
-                "networkScore": max(0.0, min(1.0, float(network_score))),
-                "semanticScore": max(0.0, min(1.0, semantic_score)),
-                "coverageNice": max(0.0, min(1.0, coverage_nice)),
-                "yearsExperience": years_exp,
-                "topSkills": [skill.title() for skill in canon_skills][:6],
-                "canonicalSkills": canon_skills,
-                "resumeText": row.get("resume_text", ""),
-                "rationaleShort": rationale_short,
-                "rationaleFull": rationale_full,
-            }
-        )
 
-    return payload
+_PROFILE_GETTERS = {
+    "id": lambda p: p.id,
+    "name": lambda p: p.name,
+    "title": lambda p: p.ranking.role.title,
+    "photo": lambda p: f"https://i.pravatar.cc/150?u={p.id}",
+    "score": lambda p: _clip(p.final_score),
+    "skillScore": lambda p: _clip(p.skill_score),
+    "networkScore": lambda p: _clip(p.network_score),
+    "semanticScore": lambda p: _clip(p.semantic_score),
+    "coverageNice": lambda p: _clip(p.coverage_nice),
+    "yearsExperience": lambda p: p.years_experience,
+    "topSkills": lambda p: [skill.title() for skill in p.canonical_skills][:6],
+    "canonicalSkills": lambda p: p.canonical_skills,
+    "resumeText": lambda p: p.candidate.text,
+    "rationaleShort": CandidateProfile.rationale_short,
+    "rationaleFull": CandidateProfile.rationale_full,
+}
+
+
+def _parse_fields(raw: Optional[Iterable[str] | str], allowed: Tuple[str, ...] = PROFILE_FIELDS) -> Optional[Tuple[str, ...]]:
+    """Sparse fieldset from a list or comma-separated string; None means every field.
+
+    ``id`` is always returned first so rows stay identifiable.
+    """
+    if raw is None:
+        return None
+    items = raw if isinstance(raw, (list, tuple)) else str(raw).split(",")
+    fields = [item.strip() for item in items if item and item.strip()]
+    if not fields:
+        return None
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}; choose from {list(allowed)}")
+    return tuple(dict.fromkeys(["id", *fields]))
+
+
+class ScoredProfiles:
+    """Scores of every candidate for one role query.
+
+    Ranking uses partial selection over the score arrays and profiles are only
+    created (then memoised) for the rows a caller actually reads.
+    """
+
+    def __init__(
+        self,
+        index: SearchIndex,
+        required: List[str],
+        nice_to_have: List[str],
+        shortlist_size: Optional[int] = None,
+        filters: Filters = NO_FILTERS,
+        role: Optional[RoleConfig] = None,
+        query: Optional[RoleQuery] = None,
+    ):
+        self.index = index
+        self.mvp = index.mvp
+        self.store = index.mvp.store()
+        self.role = role or index.role
+        self.kg = index.kg_signals(self.role)
+        self.required = required
+        # Boolean filters shrink the scored set first; a filtered set that is still
+        # larger than the shortlist is narrowed further by retrieval, within the
+        # filtered rows, in approx mode.
+        candidates = self.mvp.terms.select(*filters)
+        if shortlist_size and (candidates is None or len(candidates) > shortlist_size):
+            candidates = self.mvp.retriever().shortlist(required, nice_to_have, shortlist_size, rows=candidates)
+        self.scores = self.mvp.score(required, nice_to_have, candidates, query)
+        self._profiles: Dict[int, CandidateProfile] = {}
+        self._order: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def ranked(self, limit: Optional[int] = None) -> List[CandidateProfile]:
+        """Profiles of the ``limit`` best candidates (everyone when None), best first."""
+        return [self.profile(int(pos)) for pos in self.scores.top(limit)]
+
+    def order(self) -> np.ndarray:
+        """Row positions of every scored candidate, best first; sorted once, then shared by all pages."""
+        if self._order is None:
+            self._order = self.scores.top(None)
+        return self._order
+
+    def page(self, offset: int, size: int) -> np.ndarray:
+        # A first page only needs partial selection, which yields the same prefix as the full order.
+        if offset == 0 and self._order is None:
+            return self.scores.top(size)
+        return self.order()[offset : offset + size]
+
+    def stream(self, positions: Iterable[int]) -> Iterable[CandidateProfile]:
+        """Profiles for ``positions`` built one at a time, reusing memoised ones without adding to them."""
+        for pos in positions:
+            pos = int(pos)
+            cached = self._profiles.get(pos)
+            yield cached if cached is not None else CandidateProfile(self, pos)
+
+    def get(self, candidate_id: str) -> Optional[CandidateProfile]:
+        pos = self.index.positions.get(candidate_id)
+        return None if pos is None else self.profile(pos)
+
+    def profile(self, pos: int) -> CandidateProfile:
+        cached = self._profiles.get(pos)
+        if cached is None:
+            cached = self._profiles[pos] = CandidateProfile(self, pos)
+        return cached
+
+
+_PROFILE_STORE: LRUCache[ScoredProfiles] = LRUCache(maxsize=int(os.environ.get("PROFILE_STORE_SIZE", "32")))
+# Finished responses keyed on the normalised request and index version; identical
+# concurrent requests share one computation.
+_RESULT_CACHE: LRUCache[dict] = LRUCache(
+    maxsize=int(os.environ.get("RESULT_CACHE_SIZE", "256")),
+    ttl=float(os.environ.get("RESULT_CACHE_TTL", "30")) or None,
+)
+
+
+def _role_key(
+    role: RoleConfig, required: List[str], nice_to_have: List[str]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Normalise a skill query so reordered or repeated skills share one ranking."""
+    required = required or role.required
+    nice_to_have = nice_to_have or role.nice_to_have
+    return (
+        tuple(sorted({s.strip().lower() for s in required if s and s.strip()})),
+        tuple(sorted({s.strip().lower() for s in nice_to_have if s and s.strip()})),
+    )
+
+
+def _encode_cursor(index: SearchIndex, scope: tuple, offset: int) -> str:
+    """Opaque cursor for the page at ``offset`` of one ranking on one index version."""
+    digest = hashlib.sha1(repr(scope).encode()).hexdigest()[:16]
+    payload = json.dumps({"v": index.version, "q": digest, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str], index: SearchIndex, scope: tuple) -> int:
+    """Offset encoded in ``cursor`` (0 without one).
+
+    A cursor minted for another query is rejected with 400; one minted before the
+    index changed answers 410, since positions in the old ranking no longer hold.
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        version, digest, offset = payload["v"], payload["q"], int(payload["o"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if digest != hashlib.sha1(repr(scope).encode()).hexdigest()[:16] or offset < 0:
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this query")
+    if version != index.version:
+        raise HTTPException(status_code=410, detail="Cursor expired; the index changed, restart from the first page")
+    return offset
+
+
+def _page_response(
+    ranking: ScoredProfiles,
+    positions: np.ndarray,
+    scope: tuple,
+    end: int,
+    total: int,
+    stream: bool,
+    fields: Optional[Tuple[str, ...]] = None,
+    **extra,
+):
+    """One page of profiles as JSON, or as NDJSON lines built while the client reads."""
+    next_cursor = _encode_cursor(ranking.index, scope, end) if end < total else None
+    if stream:
+        headers = {"X-Total-Count": str(total)}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        lines = (json.dumps(profile.to_dict(fields)) + "\n" for profile in ranking.stream(positions))
+        return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+    candidates = [ranking.profile(int(pos)).to_dict(fields) for pos in positions]
+    return {"candidates": candidates, "total": total, **extra, "nextCursor": next_cursor}
+
+
+def _resolve_mode(index: SearchIndex, mode: str) -> str:
+    if mode == "auto":
+        return "approx" if len(index.mvp.df) >= APPROX_MIN_ROWS else "exact"
+    return mode
+
+
+def _resolve_role(index: SearchIndex, name: Optional[str]) -> RoleConfig:
+    try:
+        return index.resolve_role(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown role {name!r}") from None
+
+
+def _scored_profiles(
+    required: List[str],
+    nice_to_have: List[str],
+    mode: str = "exact",
+    filters: Filters = NO_FILTERS,
+    role: Optional[str] = None,
+) -> ScoredProfiles:
+    """Return the cached ranking for a role query, scoring the population on a miss.
+
+    Empty skill lists fall back to the requirements of ``role`` (slug or title; the
+    default role when None), and a query that is just those requirements is served
+    from the role's precomputed ranking. In ``approx`` mode (or ``auto`` on a large
+    roster) only a retrieved shortlist is scored, and ``filters`` restrict scoring to
+    the rows that pass them.
+    """
+    index = _index()
+    role_config = _resolve_role(index, role)
+    skills = _role_key(role_config, required, nice_to_have)
+    if filters == NO_FILTERS and skills == _role_key(role_config, [], []):
+        return index.role_ranking(role_config)
+    shortlist = SHORTLIST_SIZE if _resolve_mode(index, mode) == "approx" else None
+    return _PROFILE_STORE.get_or_create(
+        (index.version, role_config.slug, skills, shortlist, filters),
+        lambda: ScoredProfiles(index, list(skills[0]), list(skills[1]), shortlist, filters, role_config),
+    )
+
+
+_INGEST_STATS = {"added": 0, "removed": 0, "refits": 0, "totalMs": 0.0}
+
+
+def _ingest_result(index: SearchIndex, candidate_id: str, started: float, count_as: str) -> dict:
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    _INGEST_STATS[count_as] += 1
+    _INGEST_STATS["totalMs"] += elapsed_ms
+    return {"id": candidate_id, "version": index.version, "rows": len(index.mvp.df), "elapsedMs": elapsed_ms}
+
+
+def _refit_if_drifted() -> bool:
+    """Refit TF-IDF on the live rows if candidates were added since the last fit."""
+    with _INDEX_LOCK:
+        index = _index()
+        if index.mvp.docs_since_fit == 0:
+            return False
+        mvp = index.mvp.refit()
+        _warm_retriever(mvp)
+        _swap_index(index.derive(mvp, index.graph))
+        _INGEST_STATS["refits"] += 1
+        return True
+
+
+def _refit_loop(stop: threading.Event) -> None:
+    while not stop.wait(REFIT_INTERVAL):
+        try:
+            _refit_if_drifted()
+        except Exception:  # keep the thread alive; the next tick retries
+            logger.exception("Background index refit failed")
+
+
+_WORK = WorkPool(SCORING_WORKERS)
+for _lane, (_concurrency, _queue) in LANE_LIMITS.items():
+    _WORK.lane(
+        _lane,
+        int(os.environ.get(f"{_lane.upper()}_CONCURRENCY", _concurrency)),
+        int(os.environ.get(f"{_lane.upper()}_QUEUE", _queue)),
+    )
+
+
+async def _offload(http: Request, lane: str, fn, *args):
+    """Run ``fn`` on the scoring pool without blocking the event loop.
+
+    A full lane answers 503 with Retry-After straight away. If the client goes
+    away while the job is still queued it is cancelled (a running job finishes).
+    """
+    try:
+        future = _WORK.lanes[lane].submit(fn, *args)
+    except Overloaded as exc:
+        raise HTTPException(
+            status_code=503, detail=f"Server busy ({exc.lane}); retry later", headers={"Retry-After": str(exc.retry_after)}
+        ) from None
+    waiter = asyncio.wrap_future(future)
+    while True:
+        done, _ = await asyncio.wait({waiter}, timeout=0.25)
+        if done:
+            return waiter.result()
+        if await http.is_disconnected():
+            waiter.cancel()
+            return Response(status_code=499)
 
 
 @app.get("/health")
-def health() -> dict:
+async def health() -> dict:
+    # Runs on the event loop, never behind scoring work.
     return {"status": "ok"}
 
 
+@app.get("/admin/stats")
+def admin_stats() -> dict:
+    with _INDEX_LOCK:
+        ingest = dict(_INGEST_STATS)
+    records = ingest["added"] + ingest["removed"]
+    ingest["avgMsPerRecord"] = ingest["totalMs"] / records if records else 0.0
+    return {
+        "profileStore": _PROFILE_STORE.stats(),
+        "resultCache": _RESULT_CACHE.stats(),
+        "execution": _WORK.stats(),
+        "ingest": ingest,
+    }
+
+
+@app.get("/admin/index")
+def admin_index() -> dict:
+    return {
+        **_index_info(_index()),
+        "reloads": _RELOAD_STATUS["reloads"],
+        "lastError": _RELOAD_STATUS["lastError"],
+        # Seconds per build stage of the last snapshot this process built (empty if it only mapped one).
+        "buildStages": _RELOAD_STATUS.get("buildStages", {}),
+        # Shard throughput of that build when candidates come from several files.
+        "ingest": _RELOAD_STATUS.get("ingest"),
+    }
+
+
+@app.post("/admin/reload")
+def admin_reload(force: bool = False, wait: bool = False) -> dict:
+    """Reload the data files; by default in the background, returning the serving version."""
+    if wait:
+        try:
+            return reload_index(force)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"Reload failed: {exc}") from None
+    if _RELOAD_LOCK.locked():
+        return {"status": "running", **_index_info(_index())}
+
+    def _run() -> None:
+        try:
+            reload_index(force)
+        except Exception:
+            logger.exception("Index reload failed")
+
+    threading.Thread(target=_run, name="index-reload", daemon=True).start()
+    return {"status": "started", **_index_info(_index())}
+
+
+@app.get("/admin/memory")
+def admin_memory() -> dict:
+    """Footprint of this worker: index bytes mapped from the shared snapshot vs private."""
+    index = _index()
+    return memory_report(index.mvp, index.graph)
+
+
 @app.post("/search")
-def search(request: SearchRequest) -> dict:
-    required = _parse_skills(request.requiredSkills) or DEFAULT_REQUIRED
-    nice_to_have = _parse_skills(request.niceToHave) or DEFAULT_NICE
-    candidates = _score_candidates(required, nice_to_have, limit=request.limit)
+async def search(request: SearchRequest, http: Request):
+    """Ranked candidates for a skill query, a page of ``limit`` at a time.
+
+    Follow ``nextCursor`` for the next page; ``stream`` sends the page as NDJSON
+    with the total and next cursor in the X-Total-Count / X-Next-Cursor headers.
+    """
+    # Cached answers are served from the event loop; only misses take a pool slot.
+    if _INDEX is not None and not request.stream:
+        cached = _RESULT_CACHE.peek(_search_key(request, _INDEX))
+        if cached is not None:
+            return cached
+    return await _offload(http, "search", _cached_search, request)
+
+
+def _search_scope(request: SearchRequest, index: SearchIndex) -> tuple:
+    """Everything that decides the ranking, i.e. what a cursor is bound to."""
+    required, nice_to_have = _parse_skills(request.requiredSkills), _parse_skills(request.niceToHave)
+    role = _resolve_role(index, request.role)
+    return (
+        "search",
+        role.slug,
+        _role_key(role, required, nice_to_have),
+        (request.query or "").strip().lower(),
+        _resolve_mode(index, request.mode or SEARCH_MODE),
+        request.filters(),
+    )
+
+
+def _search_key(request: SearchRequest, index: SearchIndex) -> tuple:
+    return (index.version, _search_scope(request, index), request.limit, request.cursor, _parse_fields(request.fields))
+
+
+def _cached_search(request: SearchRequest):
+    if request.stream:
+        return _search(request)
+    return _RESULT_CACHE.get_or_create(_search_key(request, _index()), lambda: _search(request))
+
+
+def _search(request: SearchRequest):
+    required = _parse_skills(request.requiredSkills)
+    nice_to_have = _parse_skills(request.niceToHave)
+    ranking = _scored_profiles(required, nice_to_have, request.mode or SEARCH_MODE, request.filters(), request.role)
+    scope = _search_scope(request, ranking.index)
+    offset = _decode_cursor(request.cursor, ranking.index, scope)
+    fields = _parse_fields(request.fields)
+
+    if not (request.query or "").strip():
+        positions = ranking.page(offset, request.limit)
+        return _page_response(ranking, positions, scope, offset + request.limit, len(ranking), request.stream, fields)
+
+    # Free text matches names and canonical skills through the term index; ranked
+    # order is kept, and no match means an empty page rather than everyone.
+    order = ranking.order()
+    matches = order[np.isin(order, ranking.mvp.terms.matching(request.query))]
+
+    positions = matches[offset : offset + request.limit]
+    return _page_response(ranking, positions, scope, offset + request.limit, len(matches), request.stream, fields)
+
+
+@app.post("/candidates", status_code=201)
+async def add_candidate(candidate: CandidateIn, http: Request):
+    return await _offload(http, "ingest", _add_candidate, candidate)
+
+
+def _add_candidate(candidate: CandidateIn) -> dict:
+    """Index one candidate in place: no TF-IDF refit, skill re-extraction or graph rebuild."""
+    started = time.perf_counter()
+    row = candidate.to_row()
+    with _INDEX_LOCK, _index().journal.locked():
+        index = _sync_journal()
+        try:
+            mvp, graph = _with_added(index.mvp, index.graph, [row])
+        except ValueError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from None
+        index.journal.append({"op": "add", "row": row})
+        new_index = index.derive(mvp, graph)
+        _swap_index(new_index)
+        return _ingest_result(new_index, mvp.df["id"].iloc[-1], started, "added")
+
 
-    if request.query:
-        query_lower = request.query.lower()
-        filtered = []
-        for candidate in candidates:
-            name_match = query_lower in candidate["name"].lower()
-            skill_match = any(query_lower in skill.lower() for skill in candidate["canonicalSkills"])
-            if name_match or skill_match:
-                filtered.append(candidate)
-        candidates = filtered or candidates
+@app.delete("/candidates/{candidate_id}")
+async def delete_candidate(candidate_id: str, http: Request):
+    return await _offload(http, "ingest", _delete_candidate, candidate_id)
 
-    limited = candidates[: request.limit]
-    return {"candidates": limited, "total": len(candidates)}
+
+def _delete_candidate(candidate_id: str) -> dict:
+    started = time.perf_counter()
+    with _INDEX_LOCK, _index().journal.locked():
+        index = _sync_journal()
+        try:
+            mvp, graph = _with_removed(index.mvp, index.graph, candidate_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Candidate not found") from None
+        index.journal.append({"op": "delete", "id": candidate_id})
+        new_index = index.derive(mvp, graph)
+        _swap_index(new_index)
+        return _ingest_result(new_index, candidate_id, started, "removed")
+
+
+def _with_added(mvp: RecruitingMVP, graph: CompiledKG, rows: List[dict]) -> Tuple[RecruitingMVP, CompiledKG]:
+    mvp = mvp.with_candidates(pd.DataFrame(rows))
+    added = mvp.df.iloc[len(mvp.df) - len(rows) :]
+    graph = graph.with_candidates(
+        [f"candidate:{cid}" for cid in added["id"]],
+        [candidate_skill_names({"skills": skills}) for skills in added["skills"]],
+    )
+    return mvp, graph
+
+
+def _with_removed(mvp: RecruitingMVP, graph: CompiledKG, candidate_id: str) -> Tuple[RecruitingMVP, CompiledKG]:
+    return mvp.without_candidates([candidate_id]), graph.without_candidates([f"candidate:{candidate_id}"])
+
+
+def _replay(mvp: RecruitingMVP, graph: CompiledKG, entries: List[dict]) -> Tuple[RecruitingMVP, CompiledKG]:
+    """Apply journal entries in order; each run of adds is appended in one step."""
+    for op, run in itertools.groupby(entries, key=lambda entry: entry["op"]):
+        run = list(run)
+        if op == "add" and len(run) > 1:
+            try:
+                mvp, graph = _with_added(mvp, graph, [entry["row"] for entry in run])
+                continue
+            except ValueError:  # an id clash: apply one at a time to skip only that entry
+                pass
+        for entry in run:
+            try:
+                if op == "add":
+                    mvp, graph = _with_added(mvp, graph, [entry["row"]])
+                else:
+                    mvp, graph = _with_removed(mvp, graph, entry["id"])
+            except (KeyError, ValueError):
+                logger.warning("Skipping journal entry that no longer applies: %s", entry)
+    return mvp, graph
+
+
+def _sync_journal() -> SearchIndex:
+    """Catch the live index up with changes journaled by other workers; hold _INDEX_LOCK."""
+    index = _index()
+    entries = index.journal.read()
+    if entries:
+        mvp, graph = _replay(index.mvp, index.graph, entries)
+        index = index.derive(mvp, graph)
+        _swap_index(index)
+    return index
 
 
 @app.get("/candidates/high-readiness")
-def get_high_readiness_candidates() -> dict:
+async def get_high_readiness_candidates(
+    http: Request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Page size; everyone when unset"),
+    stream: bool = False,
+    fields: Optional[str] = Query(default=None, description="Comma-separated profile fields; all when unset"),
+    role: Optional[str] = Query(default=None, description="Role slug or title; defaults to the configured role"),
+):
     """Get the top 30% high-readiness candidates."""
-    # Get all candidates with comprehensive scoring
-    all_candidates = _score_candidates(DEFAULT_REQUIRED, DEFAULT_NICE, limit=1000)
-    
-    # Sort by final score and take top 30%
-    sorted_candidates = sorted(all_candidates, key=lambda x: x['score'], reverse=True)
-    top_30_percent_count = max(1, int(len(sorted_candidates) * 0.3))
-    top_candidates = sorted_candidates[:top_30_percent_count]
-    
+    key = ("high-readiness", cursor, limit, _parse_fields(fields), _slug(role) if role else None)
+    if _INDEX is not None and not stream:
+        cached = _RESULT_CACHE.peek((_INDEX.version, key))
+        if cached is not None:
+            return cached
+    if stream:
+        return await _offload(http, "search", _high_readiness, *key[1:], True)
+    return await _offload(http, "search", _cached_high_readiness, key)
+
+
+def _cached_high_readiness(key: tuple) -> dict:
+    return _RESULT_CACHE.get_or_create((_index().version, key), lambda: _high_readiness(*key[1:]))
+
+
+def _high_readiness(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+    role: Optional[str] = None,
+    stream: bool = False,
+):
+    # Score all candidates with comprehensive scoring
+    ranking = _scored_profiles([], [], role=role)
+    scope = ("high-readiness", ranking.role.slug)
+    offset = _decode_cursor(cursor, ranking.index, scope)
+
+    # Rank by final score and take top 30%
+    top_30_percent_count = max(1, int(len(ranking) * 0.3)) if len(ranking) else 0
+    # Later pages slice the ranking's shared full order instead of re-selecting the top.
+    top_positions = ranking.order()[:top_30_percent_count] if offset else ranking.page(0, top_30_percent_count)
+
     # Calculate stats
-    if top_candidates:
-        average_score = sum(c['score'] for c in top_candidates) / len(top_candidates)
+    if len(top_positions):
+        scores = np.clip(ranking.scores.final_score[top_positions], 0.0, 1.0)
+        average_score = sum(float(score) for score in scores) / len(scores)
     else:
         average_score = 0.0
-    
-    return {
-        "candidates": top_candidates,
-        "total": len(top_candidates),
-        "threshold": 0.8,  # Threshold for top 30%
-        "averageScore": average_score
-    }
+
+    end = top_30_percent_count if limit is None else min(offset + limit, top_30_percent_count)
+    return _page_response(
+        ranking,
+        top_positions[offset:end],
+        scope,
+        end,
+        top_30_percent_count,
+        stream,
+        fields,
+        threshold=0.8,  # Threshold for top 30%
+        averageScore=average_score,
+    )
+
+
+DETAIL_FIELDS = PROFILE_FIELDS + ("personality",)
 
 
 @app.get("/candidates/{candidate_id}")
-def get_candidate(candidate_id: str) -> dict:
+async def get_candidate(
+    candidate_id: str,
+    http: Request,
+    fields: Optional[str] = Query(default=None, description="Comma-separated profile fields; all when unset"),
+    role: Optional[str] = Query(default=None, description="Role slug or title; defaults to the configured role"),
+):
+    return await _offload(http, "candidates", _candidate_detail, candidate_id, _parse_fields(fields, DETAIL_FIELDS), role)
+
+
+def _candidate_detail(candidate_id: str, fields: Optional[Tuple[str, ...]] = None, role: Optional[str] = None) -> dict:
+    ranking = _scored_profiles([], [], role=role)
     try:
-        base_row = _candidate_row_by_id(candidate_id)
+        candidate = _candidate_by_id(ranking.index, candidate_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="Candidate not found") from None
 
-    candidate_profile = next(
-        (item for item in _score_candidates(DEFAULT_REQUIRED, DEFAULT_NICE, limit=len(_load_mvp().df)) if item["id"] == candidate_id),
-        None,
-    )
-    if not candidate_profile:
+    candidate_profile = ranking.get(candidate_id)
+    if candidate_profile is None:
         raise HTTPException(status_code=404, detail="Candidate not ranked")
 
-    profile = dict(candidate_profile)
-    profile.update(
+    profile = candidate_profile.to_dict(tuple(field for field in fields if field != "personality") if fields else None)
+    if fields is None or "personality" in fields:
+        profile["personality"] = candidate.personality
+    return profile
+
+
+@app.get("/roles")
+def list_roles() -> dict:
+    index = _index()
+    roles = [
         {
-            "personality": {
-                "O": float(base_row.get("O", 0.0)),
-                "C": float(base_row.get("C", 0.0)),
-                "E": float(base_row.get("E", 0.0)),
-                "A": float(base_row.get("A", 0.0)),
-                "N": float(base_row.get("N", 0.0)),
-            },
-            "yearsExperience": float(base_row.get("years_experience", 0.0)),
+            "id": role.slug,
+            "title": role.title,
+            "requiredSkills": role.required,
+            "niceToHave": role.nice_to_have,
+            "default": role is index.role,
         }
-    )
-    return profile
+        for role in index.roles.values()
+    ]
+    return {"roles": roles, "total": len(roles)}
 
 
-def _team_alternatives(required: List[str], team_size: int) -> List[dict]:
-    candidates = _score_candidates(required, DEFAULT_NICE, limit=len(_load_mvp().df))
-    top_ids = [candidate["id"] for candidate in candidates[: min(5, len(candidates))]]
-    combos = list(combinations(top_ids, min(team_size, len(top_ids))))
-    alternatives = []
-    for idx, combo in enumerate(combos[:3]):
-        alternatives.append(
-            {
-                "name": f"Option {idx + 1}",
-                "candidateIds": list(combo),
-            }
-        )
-    return alternatives
+@app.get("/roles/{role}/ranking")
+async def get_role_ranking(
+    role: str,
+    http: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=1000),
+    stream: bool = False,
+    fields: Optional[str] = Query(default=None, description="Comma-separated profile fields; all when unset"),
+):
+    """A page of the role's precomputed ranking for its configured requirements."""
+    key = ("role-ranking", _slug(role), cursor, limit, _parse_fields(fields))
+    if _INDEX is not None and not stream:
+        cached = _RESULT_CACHE.peek((_INDEX.version, key))
+        if cached is not None:
+            return cached
+    if stream:
+        return await _offload(http, "search", _role_ranking, *key[1:], True)
+    return await _offload(http, "search", _cached_role_ranking, key)
 
 
-@app.post("/team/evaluate", response_model=TeamEvaluationResponse)
-def evaluate_team(request: TeamEvaluationRequest):
-    if not request.candidateIds:
-        raise HTTPException(status_code=400, detail="candidateIds required")
+def _cached_role_ranking(key: tuple) -> dict:
+    return _RESULT_CACHE.get_or_create((_index().version, key), lambda: _role_ranking(*key[1:]))
+
+
+def _role_ranking(
+    role: str, cursor: Optional[str], limit: int, fields: Optional[Tuple[str, ...]] = None, stream: bool = False
+):
+    index = _index()
+    ranking = index.role_ranking(_resolve_role(index, role))
+    scope = ("role-ranking", ranking.role.slug)
+    offset = _decode_cursor(cursor, index, scope)
+    positions = ranking.page(offset, limit)
+    return _page_response(ranking, positions, scope, offset + limit, len(ranking), stream, fields, role=ranking.role.title)
+
+
+def _team_problem(ranking: ScoredProfiles, diversity_weight: float = 0.0) -> TeamProblem:
+    mvp = ranking.mvp
+    required = set(ranking.required)
+    cols = [mvp.skill_index[s] for s in sorted(required) if s in mvp.skill_index]
+    personality = mvp.store().personality.astype(float, copy=False) if diversity_weight else None
+    return TeamProblem(
+        scores=np.clip(ranking.scores.final_score, 0.0, 1.0),
+        skills=mvp.skill_matrix[:, cols],
+        n_required=len(required),
+        personality=personality,
+        diversity_weight=diversity_weight,
+    )
+
+
+def _team_alternatives(ranking: ScoredProfiles, team_size: int, diversity_weight: float = 0.0) -> List[dict]:
+    """Best distinct teams of ``team_size`` from the whole pool under the team score."""
+    if not len(ranking):
+        return []
+    problem = _team_problem(ranking, diversity_weight)
+    options = optimize_teams(problem, min(team_size, len(problem)), top_n=3, time_budget=TEAM_SEARCH_BUDGET)
+    ids = ranking.store.ids
+    return [
+        {
+            "name": f"Option {idx + 1}",
+            "candidateIds": [ids[pos] for pos in option.members],
+            "teamScore": max(0.0, min(1.0, option.objective)),
+            "coverage": option.coverage,
+        }
+        for idx, option in enumerate(options)
+    ]
 
-    required = request.required or DEFAULT_REQUIRED
-    profiles = _score_candidates(required, DEFAULT_NICE, limit=len(_load_mvp().df))
-    lookup = {profile["id"]: profile for profile in profiles}
 
-    selected = []
-    for candidate_id in request.candidateIds:
-        if candidate_id not in lookup:
+def _team_positions(ranking: ScoredProfiles, candidate_ids: List[str]) -> List[int]:
+    positions = []
+    for candidate_id in candidate_ids:
+        pos = ranking.index.positions.get(candidate_id)
+        if pos is None:
             raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found in rankings")
-        selected.append(lookup[candidate_id])
+        positions.append(pos)
+    return positions
+
+
+def _evaluate_positions(
+    ranking: ScoredProfiles, positions: List[int], alternatives: bool = True, diversity_weight: float = 0.0
+) -> TeamEvaluationResponse:
+    """Team score, gaps and diversity for one team; work grows with team size only."""
+    selected = [ranking.profile(pos) for pos in positions]
 
     avg_score = float(np.mean([profile["score"] for profile in selected])) if selected else 0.0
 
-    team_skills = {skill.lower() for profile in selected for skill in profile.get("canonicalSkills", [])}
-    required_set = {skill.lower() for skill in required}
+    team_skills = ranking.mvp.skill_union(positions)
+    required_set = {skill.lower() for skill in ranking.required}
     missing = sorted(required_set - team_skills)
 
     gaps = [Gap(skill=skill.title(), severity="high" if idx < 2 else "medium") for idx, skill in enumerate(missing)]
     coverage_ratio = 1.0 - (len(missing) / len(required_set)) if required_set else 1.0
     team_score = max(0.0, min(1.0, 0.7 * avg_score + 0.3 * coverage_ratio))
 
-    personality_keys = ["O", "C", "E", "A", "N"]
-    diversity = {}
-    for key in personality_keys:
-        values = [profile.get("personality", {}).get(key, 0.5) for profile in selected]
-        diversity[key] = float(np.mean(values)) if values else 0.5
-
+    # Per trait: the team mean, and its spread as the population standard deviation.
+    traits = ranking.store.personality[positions].astype(float, copy=False)
+    means = traits.mean(axis=0) if len(traits) else np.full(len(PERSONALITY_TRAITS), 0.5)
+    spreads = traits.std(axis=0) if len(traits) else np.zeros(len(PERSONALITY_TRAITS))
+    diversity = dict(zip(PERSONALITY_TRAITS, means.tolist()))
     diversity.update(
         {
+            "spread": dict(zip(PERSONALITY_TRAITS, spreads.tolist())),
             "teamSize": len(selected),
             "avgExperience": float(np.mean([profile.get("yearsExperience", 0.0) for profile in selected])) if selected else 0.0,
         }
     )
 
-    alternatives = _team_alternatives(required, max(1, len(selected)))
-
     return TeamEvaluationResponse(
         teamScore=team_score,
         gaps=gaps,
         diversityMetrics=diversity,
-        alternatives=alternatives,
+        alternatives=_team_alternatives(ranking, max(1, len(selected)), diversity_weight) if alternatives else [],
     )
+
+
+@app.post("/team/evaluate", response_model=TeamEvaluationResponse)
+async def evaluate_team(request: TeamEvaluationRequest, http: Request):
+    return await _offload(http, "team", _evaluate_team, request)
+
+
+def _evaluate_team(request: TeamEvaluationRequest) -> TeamEvaluationResponse:
+    if not request.candidateIds:
+        raise HTTPException(status_code=400, detail="candidateIds required")
+
+    ranking = _scored_profiles(request.required, [], role=request.role)
+    positions = _team_positions(ranking, request.candidateIds)
+    return _evaluate_positions(ranking, positions, diversity_weight=request.diversityWeight)
+
+
+@app.post("/team/evaluate/batch")
+async def evaluate_teams(request: TeamBatchRequest, http: Request):
+    """Evaluate many teams against one cached ranking; ``stream`` returns NDJSON lines."""
+    return await _offload(http, "team", _evaluate_teams, request)
+
+
+def _evaluate_teams(request: TeamBatchRequest):
+    if not request.teams or not all(request.teams):
+        raise HTTPException(status_code=400, detail="teams must be non-empty lists of candidate ids")
+
+    ranking = _scored_profiles(request.required, [], role=request.role)
+    # Resolve every id first so an unknown id fails the request before any output.
+    teams = [_team_positions(ranking, team) for team in request.teams]
+
+    def _results():
+        for positions in teams:
+            yield _evaluate_positions(ranking, positions, request.includeAlternatives, request.diversityWeight)
+
+    if request.stream:
+        lines = (result.model_dump_json() + "\n" for result in _results())
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    return {"results": list(_results()), "total": len(teams)}
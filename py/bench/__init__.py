@@ -0,0 +1,11 @@
+"""Reproducible benchmarks for the recruiting MVP and its API.
+
+Run from ``py/``::
+
+    python -m bench --sizes 1000 10000 --output bench-results.json
+    python -m bench --sizes 1000 10000 --baseline bench-baseline.json   # compare, exit 1 on regression
+    python -m bench --sizes 1000 10000 --save-baseline bench-baseline.json
+
+Synthetic rosters (``bench.synth``) are generated deterministically per size and seed
+and cached under ``--workdir``.
+"""
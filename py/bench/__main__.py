@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .synth import DEFAULT_SEED
+from .suite import compare, run_suite
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Time the recruiting MVP hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Roster sizes to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed rounds per case")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--only", nargs="+", help="Run only cases whose names start with these prefixes")
+    parser.add_argument("--workdir", default="bench-data", help="Generated CSVs and index snapshots")
+    parser.add_argument("--output", default="bench-results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Also write the results here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat, args.workdir, args.seed, args.only)
+    text = json.dumps(results, indent=2)
+    Path(args.output).write_text(text + "\n", encoding="utf-8")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + "\n", encoding="utf-8")
+    print(f"wrote {args.output}")
+
+    if not args.baseline:
+        return 0
+    rows = compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<40} {row['baseline'] * 1e3:12.3f} ms -> {row['current'] * 1e3:12.3f} ms  x{row['ratio']:.2f} {flag}")
+    regressions = [row["case"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond x{args.tolerance}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+"""Timed cases over the hot paths, per roster size, plus baseline comparison.
+
+Each case runs ``repeat`` rounds of ``number`` calls and keeps the mean time per
+call of every round. Comparisons use the fastest round, which is the least noisy
+estimate on a shared machine.
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from mvp.data_utils import load_candidate_dataframe
+from mvp.kg import (
+    _node_id,
+    build_kg,
+    clear_kg_cache,
+    relatedness_adamic_adar,
+    relatedness_jaccard,
+    relatedness_metapath,
+    relatedness_ppr,
+)
+from mvp.pipeline import RecruitingMVP
+from mvp.team import recommend_team
+
+from .synth import DEFAULT_SEED, write_workforce
+
+ROLE_JSON = Path(__file__).resolve().parent.parent / "mvp" / "data" / "role_requirements.json"
+RESULTS_FORMAT = 1
+# Pairs scored per relatedness round; the metrics are per (role, candidate) pair.
+RELATEDNESS_SAMPLE = 100
+
+
+@dataclass
+class Result:
+    name: str
+    rows: int
+    number: int  # calls per round
+    times: List[float]  # seconds per call, one entry per round
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.rows}"
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "min": min(self.times),
+            "median": statistics.median(self.times),
+            "max": max(self.times),
+        }
+
+
+def measure(fn: Callable[[], object], repeat: int, number: int = 1, setup: Optional[Callable[[], object]] = None) -> List[float]:
+    """Mean seconds per call for each of ``repeat`` rounds; ``setup`` runs untimed before every call."""
+    times = []
+    for _ in range(repeat):
+        total = 0.0
+        for _ in range(number):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            fn()
+            total += time.perf_counter() - started
+        times.append(total / number)
+    return times
+
+
+class _Run:
+    """Collects results for one roster size; later cases reuse what earlier ones built."""
+
+    def __init__(self, rows: int, repeat: int, workdir: Path, seed: int, only: Optional[List[str]], log: Callable[[str], None]):
+        self.rows = rows
+        self.repeat = repeat
+        self.workdir = workdir
+        self.only = only
+        self.log = log
+        self.results: List[Result] = []
+        self.candidates_csv, self.teams_csv = write_workforce(workdir / "data", rows, seed)
+        role = json.loads(ROLE_JSON.read_text(encoding="utf-8"))
+        self.role_node = _node_id("role", role["role"])
+        self.required = role["required_skills"]
+        self.nice = role["nice_to_have"]
+
+    def wanted(self, name: str) -> bool:
+        """Whether case ``name`` (or, for a prefix like ``api.``, any case in it) is selected."""
+        return not self.only or any(name.startswith(prefix) or prefix.startswith(name) for prefix in self.only)
+
+    def case(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        number: int = 1,
+        setup: Optional[Callable[[], object]] = None,
+        batch: int = 1,
+    ) -> None:
+        """Time ``fn``; ``batch`` is how many calls of the measured operation one ``fn()`` makes."""
+        if not self.wanted(name):
+            return
+        times = [seconds / batch for seconds in measure(fn, self.repeat, number, setup)]
+        result = Result(name, self.rows, number * batch, times)
+        self.results.append(result)
+        self.log(f"{result.key:<40} {min(result.times) * 1e3:12.3f} ms")
+
+
+def _pipeline_cases(run: _Run) -> None:
+    path = str(run.candidates_csv)
+    run.case("load_candidate_dataframe", lambda: load_candidate_dataframe(path))
+    built: Dict[str, RecruitingMVP] = {}
+
+    def _build() -> None:
+        built["mvp"] = RecruitingMVP(path)
+
+    run.case("RecruitingMVP.__init__", _build)
+    if not (run.wanted("search_candidates") or run.wanted("recommend_team")):
+        return
+    mvp = built.get("mvp") or RecruitingMVP(path)
+    run.case("search_candidates", lambda: mvp.search_candidates(run.required, run.nice, top_k=10), number=5)
+
+    if run.wanted("recommend_team"):
+        best = mvp.search_candidates(run.required, run.nice, top_k=1).iloc[0]
+        teams = pd.read_csv(run.teams_csv)
+        run.case("recommend_team", lambda: recommend_team(best, teams, run.required), number=20)
+
+
+def _kg_cases(run: _Run) -> None:
+    args = (str(run.candidates_csv), str(run.teams_csv), str(ROLE_JSON))
+    built: Dict[str, object] = {}
+
+    def _build() -> None:
+        built["graph"] = build_kg(*args)
+
+    run.case("build_kg", _build)
+    if not run.wanted("relatedness_"):
+        return
+    G = built.get("graph") or build_kg(*args)
+    nodes = sorted(n for n, data in G.nodes(data=True) if data.get("type") == "candidate")
+    sample = [nodes[i] for i in np.linspace(0, len(nodes) - 1, min(RELATEDNESS_SAMPLE, len(nodes))).astype(int)]
+    for metric in (relatedness_metapath, relatedness_adamic_adar, relatedness_jaccard, relatedness_ppr):
+        # Warm: the compiled graph and PPR vector are cached after the first call.
+        metric(G, run.role_node, sample[0])
+        run.case(
+            metric.__name__,
+            lambda metric=metric: [metric(G, run.role_node, node) for node in sample],
+            batch=len(sample),
+        )
+    # First PPR query after a graph change: compiles the graph and solves once.
+    run.case(
+        "relatedness_ppr.first",
+        lambda: relatedness_ppr(G, run.role_node, sample[0]),
+        setup=lambda: clear_kg_cache(G),
+    )
+
+
+def _api_cases(run: _Run) -> None:
+    if not run.wanted("api."):
+        return
+    try:
+        from fastapi.testclient import TestClient
+
+        from backend import app as api
+    except ImportError as exc:  # the API extras are optional for the library benchmarks
+        run.log(f"skipping api.* ({exc})")
+        return
+
+    # The backend may have been imported before run_suite set its environment.
+    index_dir = _index_dir(run.workdir)
+    api.INDEX_DIR = index_dir
+    api._index()  # something to serve while reload_index builds (the bundled data on first use)
+    api.CP_CUP_CSV = run.candidates_csv
+    api.TEAMS_CSV = run.teams_csv
+    client = TestClient(api.app)
+
+    def _fresh_snapshot() -> None:
+        if api.INDEX_DIR != index_dir:
+            raise RuntimeError(f"refusing to delete {api.INDEX_DIR}: not the benchmark's {index_dir}")
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+    run.case("api.build_index", lambda: api.reload_index(force=True), setup=_fresh_snapshot)
+    if len(api._index().mvp.df) != run.rows:  # only when api.build_index was filtered out
+        api.reload_index(force=True)
+
+    def _clear_caches() -> None:
+        # Cold requests: the response caches and the per-role rankings, queries and
+        # KG signals the index precomputes at load time.
+        api._RESULT_CACHE.clear()
+        api._PROFILE_STORE.clear()
+        index = api._index()
+        for cache in (index._role_rankings, index._role_queries, index._kg_signals):
+            cache.clear()
+
+    def _call(method: str, url: str, **kwargs) -> Callable[[], None]:
+        def _request() -> None:
+            response = client.request(method, url, **kwargs)
+            if response.status_code != 200:
+                raise RuntimeError(f"{method} {url} -> {response.status_code}: {response.text[:200]}")
+
+        return _request
+
+    top = client.post("/search", json={"limit": 5}).json()["candidates"]
+    team_ids = [candidate["id"] for candidate in top]
+    cases = {
+        "api.search": _call("POST", "/search", json={"limit": 20}),
+        "api.search_skills": _call(
+            "POST", "/search", json={"requiredSkills": ["python", "sql"], "niceToHave": ["cloud"], "limit": 20}
+        ),
+        "api.high_readiness": _call("GET", "/candidates/high-readiness", params={"limit": 50}),
+        "api.candidate": _call("GET", f"/candidates/{team_ids[0]}"),
+        "api.team_evaluate": _call("POST", "/team/evaluate", json={"candidateIds": team_ids}),
+    }
+    for name, fn in cases.items():
+        run.case(name, fn, number=5, setup=_clear_caches)
+
+
+def _index_dir(workdir: Path) -> Path:
+    """Where API snapshots go; always inside ``workdir``, since api.build_index deletes it."""
+    return workdir.resolve() / "index"
+
+
+def _prepare_api_env(workdir: Path) -> None:
+    # Read by the backend at import: keep its snapshots and threads out of the way.
+    # Overrides exported values so a real KG_INDEX_DIR is never wiped.
+    os.environ["KG_INDEX_DIR"] = str(_index_dir(workdir))
+    os.environ["KG_RELOAD_POLL"] = "0"
+    os.environ["KG_REFIT_INTERVAL"] = "0"
+
+
+def run_suite(
+    sizes: Iterable[int],
+    repeat: int = 3,
+    workdir: str | Path = "bench-data",
+    seed: int = DEFAULT_SEED,
+    only: Optional[List[str]] = None,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Run every case (or those whose names start with a prefix in ``only``) per size."""
+    workdir = Path(workdir)
+    _prepare_api_env(workdir)
+    results: List[Result] = []
+    started = time.perf_counter()
+    for rows in sizes:
+        run = _Run(rows, repeat, workdir, seed, only, log)
+        for cases in (_pipeline_cases, _kg_cases, _api_cases):
+            cases(run)
+        results.extend(run.results)
+    return {
+        "format": RESULTS_FORMAT,
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "seconds": time.perf_counter() - started,
+            "seed": seed,
+            "repeat": repeat,
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": {result.key: result.to_dict() for result in results},
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 1.25, floor: float = 1e-3) -> List[dict]:
+    """Per-case ratio of fastest rounds (current / baseline).
+
+    A case regresses when the ratio exceeds ``tolerance`` and it got slower by more
+    than ``floor`` seconds, so sub-millisecond jitter is not reported.
+    """
+    rows = []
+    for key, result in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if before is None:
+            continue
+        ratio = result["min"] / before["min"] if before["min"] else float("inf")
+        rows.append(
+            {
+                "case": key,
+                "baseline": before["min"],
+                "current": result["min"],
+                "ratio": ratio,
+                "regression": ratio > tolerance and result["min"] - before["min"] > floor,
+            }
+        )
+    return rows
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+"""Deterministic synthetic workforce in the ``DUMMY for CP CUP.csv`` schema.
+
+The same ``(rows, seed)`` always produces byte-identical files, so timings taken on
+different commits read the same input. Skills mix the HR export's free-text labels
+with terms the skill taxonomy recognises, and project codes are drawn from a pool
+that grows with the roster so the TF-IDF vocabulary scales the way real data does.
+"""
+
+import csv
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 7
+
+FIRST_NAMES = [
+    "Marcus", "Clara", "Leo", "Nina", "Arun", "Somchai", "Mali", "Kenji", "Priya", "Ethan",
+    "Sofia", "Thanawat", "Aisha", "Lucas", "Mei", "Omar", "Pim", "Daniel", "Hana", "Ravi",
+]
+LAST_NAMES = [
+    "Vance", "Hayes", "Chen", "Patel", "Srisuk", "Tanaka", "Nguyen", "Garcia", "Kim", "Wong",
+    "Silva", "Rahman", "Jones", "Chai", "Okafor", "Muller", "Boonmee", "Ito", "Singh", "Lee",
+]
+BUSINESS_UNITS = {
+    "Swine Business": ["Senior Farm Veterinarian", "Farm Manager", "Herd Health Specialist"],
+    "Product R&D": ["Food Scientist", "Product Developer", "Sensory Analyst"],
+    "Digital Technology": ["Data Analyst", "Data Engineer", "Machine Learning Engineer", "Cloud Engineer"],
+    "Supply Chain": ["Supply Chain Analyst", "Logistics Planner", "Demand Planner"],
+    "Aquaculture": ["Aquaculture Specialist", "Feed Nutritionist"],
+    "Marketing": ["Brand Manager", "Market Insight Analyst"],
+}
+SKILLS = [
+    "Farm Management", "Animal Health", "Food Chemistry", "R&D", "Sensory Test", "SQL", "Python",
+    "Data Analysis", "Machine Learning", "Supply Chain", "Inventory", "Logistics", "Demand Planning",
+    "Dashboard", "Cloud", "AWS", "Java", "React", "Communication", "Stakeholder Management",
+    "Precision Farming", "Aquaculture", "Feed Formulation", "Forecasting",
+]
+SUMMARIES = [
+    "Consistently delivers {adj} work on {topic} and mentors junior colleagues.",
+    "Builds {adj} dashboards that give the {unit} team clear insight into {topic}.",
+    "Prefers focused, independent work and excels at {topic} under tight deadlines.",
+    "Collaborates with stakeholders across {unit} to improve {topic}.",
+    "Known for a {adj} approach to {topic}; presents results clearly to leadership.",
+    "Led the rollout of {topic} tooling, cutting manual reporting effort.",
+]
+ADJECTIVES = ["meticulous", "creative", "reliable", "data-driven", "pragmatic", "innovative"]
+TOPICS = [
+    "demand forecasting", "feed conversion", "cold chain logistics", "herd health monitoring",
+    "product formulation", "inventory planning", "precision farming", "customer analytics",
+]
+TEAM_NAMES = ["Feed Analytics", "Cold Chain Ops", "Farm Insights", "Product Lab", "Data Platform", "Market Pulse"]
+TEAM_SKILLS = [
+    "sql", "data analysis", "communication", "supply chain", "inventory", "dashboard",
+    "python", "machine learning", "cloud", "agritech", "forecasting",
+]
+CANDIDATE_COLUMNS = [
+    "EmployeeID", "Name", "BusinessUnit", "Role", "Skills", "O_Score", "C_Score", "E_Score",
+    "A_Score", "N_Score", "PastProjects", "PerformanceReviewSummary",
+]
+
+
+def synth_candidates(rows: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """``rows`` candidates with the HR export's columns (Big-5 on the 1-5 scale)."""
+    rng = np.random.default_rng(seed)
+    units = list(BUSINESS_UNITS)
+    unit = rng.integers(len(units), size=rows)
+    role = rng.integers(1 << 16, size=rows)
+    first = rng.integers(len(FIRST_NAMES), size=rows)
+    last = rng.integers(len(LAST_NAMES), size=rows)
+    n_skills = rng.integers(2, 6, size=rows)
+    skill_picks = rng.random((rows, len(SKILLS))).argsort(axis=1)
+    big5 = rng.integers(1, 6, size=(rows, 5))
+    projects = rng.integers(max(20, rows // 20), size=(rows, 2))
+    summary = rng.integers(len(SUMMARIES), size=(rows, 2))
+    adjective = rng.integers(len(ADJECTIVES), size=rows)
+    topic = rng.integers(len(TOPICS), size=rows)
+
+    records = []
+    for i in range(rows):
+        unit_name = units[unit[i]]
+        roles = BUSINESS_UNITS[unit_name]
+        fill = {"adj": ADJECTIVES[adjective[i]], "topic": TOPICS[topic[i]], "unit": unit_name}
+        records.append(
+            [
+                f"CPF{i + 1:06d}",
+                f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}",
+                unit_name,
+                roles[role[i] % len(roles)],
+                ", ".join(SKILLS[j] for j in sorted(skill_picks[i, : n_skills[i]])),
+                *big5[i].tolist(),
+                ", ".join(f"PRJ-{p:05d}" for p in projects[i]),
+                " ".join(SUMMARIES[s].format(**fill) for s in summary[i]),
+            ]
+        )
+    return pd.DataFrame(records, columns=CANDIDATE_COLUMNS)
+
+
+def synth_teams(n_teams: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Teams in the ``sample_teams.csv`` schema (Big-5 on the 0-1 scale)."""
+    rng = np.random.default_rng(seed + 1)
+    picks = rng.random((n_teams, len(TEAM_SKILLS))).argsort(axis=1)[:, :3]
+    big5 = np.round(rng.uniform(0.3, 0.85, size=(n_teams, 5)), 2)
+    return pd.DataFrame(
+        {
+            "team_id": [f"T{k + 1:04d}" for k in range(n_teams)],
+            "team_name": [f"{TEAM_NAMES[k % len(TEAM_NAMES)]} {k // len(TEAM_NAMES) + 1}" for k in range(n_teams)],
+            "team_skills": ["|".join(TEAM_SKILLS[j] for j in sorted(row)) for row in picks],
+            **{trait: big5[:, t] for t, trait in enumerate("OCEAN")},
+        }
+    )
+
+
+def write_candidates_csv(frame: pd.DataFrame, path: Path) -> None:
+    """Write like the HR export: a separator-only first line and an unnamed index column."""
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow([""] * (len(frame.columns) + 1))
+        writer.writerow(["", *frame.columns])
+        writer.writerows(["", *row] for row in frame.itertuples(index=False))
+
+
+def write_workforce(directory: str | Path, rows: int, seed: int = DEFAULT_SEED) -> Tuple[Path, Path]:
+    """Candidates and matching teams CSVs for ``rows`` candidates, generated once per (rows, seed)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    candidates = directory / f"candidates_{rows}_s{seed}.csv"
+    teams = directory / f"teams_{rows}_s{seed}.csv"
+    if not candidates.exists():
+        partial = candidates.with_suffix(".tmp")
+        write_candidates_csv(synth_candidates(rows, seed), partial)
+        partial.replace(candidates)
+    if not teams.exists():
+        synth_teams(max(10, rows // 100), seed).to_csv(teams, index=False)
+    return candidates, teams
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+"""Small in-process caches shared by the pipeline and the API layer."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class _Entry(NamedTuple):
+    value: object
+    expires: float  # monotonic deadline, inf without a TTL
+    cost: float  # seconds the factory took, credited to savedSeconds on each hit
+
+
+class _Flight:
+    """A factory call in progress that concurrent callers of the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: object = None
+        self.error: Optional[BaseException] = None
+        self.cost = 0.0
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe LRU mapping with optional TTL, single-flight builds and counters."""
+
+    def __init__(self, maxsize: int = 32, ttl: Optional[float] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self.saved_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        # Caller holds the lock. Counts the hit; misses are counted by callers.
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        self.saved_seconds += entry.cost
+        return entry
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            return entry.value
+
+    def peek(self, key: Hashable) -> V | None:
+        """Like ``get``, but a miss is not counted (for a fast path before ``get_or_create``)."""
+        with self._lock:
+            entry = self._lookup(key)
+            return None if entry is None else entry.value
+
+    def put(self, key: Hashable, value: V, cost: float = 0.0) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._data[key] = _Entry(value, expires, cost)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """Return the cached value, building it with ``factory`` on a miss.
+
+        The factory runs outside the lock so slow builds for different keys do not
+        serialise each other, and at most once per key at a time: concurrent misses
+        on the same key wait for the first caller's result (or its exception).
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry.value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                self.saved_seconds += flight.cost
+            return flight.value
+
+        started = time.perf_counter()
+        try:
+            flight.value = factory()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.cost = time.perf_counter() - started
+            self.put(key, flight.value, flight.cost)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        return flight.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "savedSeconds": self.saved_seconds,
+            }
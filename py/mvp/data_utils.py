@@ -5,36 +5,62 @@ from __future__ import annotations
 import io
 import re
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
 
 CANONICAL_COLUMNS = ["id", "name", "years_experience", "resume_text", "skills", "O", "C", "E", "A", "N"]
+PERSONALITY_TRAITS = ["O", "C", "E", "A", "N"]
+# Bumped whenever the rules below change what a given file loads as (part of index keys).
+LOADER_VERSION = 2
+
+# Source columns read as text whatever they look like, so a chunk of numeric-looking
+# ids parses the same as the whole file.
+_TEXT_SOURCE_COLUMNS = ["EmployeeID", "employee_id", "id", "Name", "name", "Skills", "Skill", "skills"]
+
+
+def _header_offset(path: Path) -> Optional[int]:
+    """Lines before the header: blank ones and separator-only ones such as ``,,,,``.
+
+    None when the file has no header at all.
+    """
+    with open(path, encoding="utf-8", newline="") as fh:
+        for offset, line in enumerate(fh):
+            if line.replace(",", "").strip():
+                return offset
+    return None
+
+
+def _read_options(path: Path) -> Optional[dict]:
+    skip = _header_offset(path)
+    if skip is None:
+        return None
+    return {"skiprows": skip, "dtype": {column: str for column in _TEXT_SOURCE_COLUMNS}}
 
 
 def _read_csv_resilient(path: Path) -> pd.DataFrame:
     """Read a CSV file while tolerating leading blank rows or stray commas."""
 
+    options = _read_options(path)
+    if options is None:
+        return pd.DataFrame()
     try:
-        df = pd.read_csv(path)
+        return pd.read_csv(path, **options)
     except pd.errors.ParserError:
-        df = None
-
-    if df is not None and not df.empty:
-        # If at least one non-empty column exists we can return immediately.
-        col_names = [str(col) for col in df.columns]
-        if any(name.strip() for name in col_names):
-            return df
+        pass
 
-    # Fallback: strip blank/whitespace-only lines then re-parse.
+    # Fallback: strip blank/whitespace-only lines, then the separator-only lines still
+    # ahead of the header (``skiprows`` counted the blank ones too), and re-parse.
     text = Path(path).read_text(encoding="utf-8")
     cleaned_lines = [line for line in text.splitlines() if line.strip()]
-    if not cleaned_lines:
+    header = next((i for i, line in enumerate(cleaned_lines) if line.replace(",", "").strip()), len(cleaned_lines))
+    if header == len(cleaned_lines):
         return pd.DataFrame()
 
-    buffer = io.StringIO("\n".join(cleaned_lines))
-    return pd.read_csv(buffer)
+    buffer = io.StringIO("\n".join(cleaned_lines[header:]))
+    return pd.read_csv(buffer, dtype=options["dtype"])
 
 
 def _estimate_years_experience(role: str) -> float:
@@ -57,29 +83,84 @@ def _normalise_skill_string(raw: str) -> str:
     return "; ".join(tokens)
 
 
-def _normalise_personality(value: object) -> float:
-    try:
-        numeric = float(value)
-    except (TypeError, ValueError):
-        return 0.5
-    return numeric / 5.0 if numeric > 1 else numeric
+def _normalise_personality(values: pd.Series) -> pd.Series:
+    # 1-5 scale scores become 0-1; missing or unparseable values default to 0.5.
+    numeric = pd.to_numeric(values, errors="coerce").astype(float)
+    return numeric.where(~(numeric > 1), numeric / 5.0).fillna(0.5)
+
 
+def _text(series: pd.Series) -> pd.Series:
+    return series.astype(object).fillna("").astype(str).str.strip()
 
-def load_candidate_dataframe(resumes_csv: str | Path) -> pd.DataFrame:
+
+def load_candidate_dataframe(
+    resumes_csv: str | Path, chunksize: Optional[int] = None, compact: bool = False
+) -> pd.DataFrame:
     """Load a CSV of candidates and map it to the canonical columns used by the MVP.
 
     The helper tolerates legacy columns such as ``EmployeeID`` and personality scores
     stored on a 1-5 scale. Missing columns are filled with sensible defaults so the
     downstream ranking pipeline can operate without additional wrangling.
+
+    With ``chunksize`` the file is read and normalised ``chunksize`` rows at a time
+    (see ``iter_candidate_chunks``), so only one raw chunk is held at once.
+    """
+
+    if chunksize:
+        chunks = list(iter_candidate_chunks(resumes_csv, chunksize, compact))
+        if not chunks:
+            return pd.DataFrame(columns=CANONICAL_COLUMNS)
+        return pd.concat(chunks, ignore_index=True)
+    path = Path(resumes_csv)
+    return normalise_candidate_frame(_read_csv_resilient(path), compact)
+
+
+def iter_candidate_chunks(
+    resumes_csv: str | Path, chunksize: int = 50_000, compact: bool = False
+) -> Iterator[pd.DataFrame]:
+    """Yield normalised frames of up to ``chunksize`` candidates while streaming the CSV.
+
+    Skill strings are interned across chunks, so repeated skill lists share one
+    object. ``compact`` stores years of experience and the Big-5 scores as float32.
     """
 
     path = Path(resumes_csv)
-    df = _read_csv_resilient(path).copy()
-    if df.empty:
+    options = _read_options(path)
+    if options is None:
+        return
+    interned: Dict[str, str] = {}
+    consumed = 0  # raw rows already yielded
+    try:
+        reader = pd.read_csv(path, chunksize=chunksize, **options)
+        for chunk in reader:
+            frame = normalise_candidate_frame(chunk, compact, interned)
+            consumed += len(chunk)
+            if len(frame):
+                yield frame
+    except pd.errors.ParserError:
+        # Irregular rows: fall back to the forgiving whole-file read and carry on
+        # after the rows already yielded, so none comes out twice.
+        raw = _read_csv_resilient(path).iloc[consumed:]
+        frame = normalise_candidate_frame(raw, compact, interned)
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start : start + chunksize].reset_index(drop=True)
+
+
+def normalise_candidate_frame(
+    raw: pd.DataFrame, compact: bool = False, interned: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """Apply the ``load_candidate_dataframe`` column rules to an in-memory frame.
+
+    ``interned`` maps skill strings to one shared copy (pass the same dict for every
+    chunk of a file); ``compact`` stores the numeric columns as float32.
+    """
+
+    if raw.empty:
         return pd.DataFrame(columns=CANONICAL_COLUMNS)
 
-    # Drop synthetic index columns that appear as "Unnamed: 0" etc.
-    df = df.loc[:, [col for col in df.columns if not str(col).startswith("Unnamed")]]
+    # Drop synthetic index columns that appear as "Unnamed: 0" etc. (selecting copies,
+    # so the caller's frame is never modified).
+    df = raw.loc[:, [col for col in raw.columns if not str(col).startswith("Unnamed")]]
     df = df.dropna(how="all")
 
     rename_map = {
@@ -108,19 +189,20 @@ def load_candidate_dataframe(resumes_csv: str | Path) -> pd.DataFrame:
     if present_map:
         df = df.rename(columns=present_map)
 
-    # Ensure canonical columns exist.
-    for column in CANONICAL_COLUMNS:
+    # Ensure canonical columns (and the text fields the resume is built from) exist.
+    for column in CANONICAL_COLUMNS + ["role", "business_unit", "past_projects", "summary"]:
         if column not in df.columns:
             df[column] = None
 
-    df["id"] = df["id"].fillna("").astype(str).str.strip()
-    df["name"] = df["name"].fillna("").astype(str).str.strip()
-    df["role"] = df["role"].fillna("").astype(str).str.strip()
-    df["business_unit"] = df["business_unit"].fillna("").astype(str).str.strip()
-    df["past_projects"] = df["past_projects"].fillna("").astype(str).str.strip()
-    df["summary"] = df["summary"].fillna("").astype(str).str.strip()
+    for column in ("id", "name", "role", "business_unit", "past_projects", "summary"):
+        df[column] = _text(df[column])
+
+    interned = {} if interned is None else interned
+    def _skills(raw: str) -> str:
+        value = _normalise_skill_string(raw)
+        return interned.setdefault(value, value)
 
-    df["skills"] = df["skills"].fillna("").astype(str).map(_normalise_skill_string)
+    df["skills"] = df["skills"].astype(object).fillna("").astype(str).map(_skills)
 
     if df["years_experience"].isna().all():
         df["years_experience"] = df["role"].map(_estimate_years_experience)
@@ -148,8 +230,12 @@ def load_candidate_dataframe(resumes_csv: str | Path) -> pd.DataFrame:
     else:
         df["resume_text"] = resume_parts.str.replace("\n", " ")
 
-    for trait in ["O", "C", "E", "A", "N"]:
-        df[trait] = df[trait].apply(_normalise_personality).fillna(0.5)
+    for trait in PERSONALITY_TRAITS:
+        df[trait] = _normalise_personality(df[trait])
+
+    if compact:
+        numeric = ["years_experience", *PERSONALITY_TRAITS]
+        df[numeric] = df[numeric].astype(np.float32)
 
     df = df.dropna(subset=["id", "name"]).reset_index(drop=True)
-    return df[CANONICAL_COLUMNS].copy()
+    return df[CANONICAL_COLUMNS]
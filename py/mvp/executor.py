@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+"""Bounded execution for CPU-heavy work with admission control.
+
+A ``WorkPool`` owns one thread pool (NumPy/SciPy release the GIL for the heavy
+parts, and threads share the memory-mapped index a process pool would have to
+copy). Callers submit through named ``Lane``s. Each lane caps how many of its jobs
+run at once and how many may wait; a submit beyond that raises ``Overloaded`` with
+a retry hint instead of queueing without bound. Queued jobs can be cancelled
+through their future; jobs already running finish and their results are dropped.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Tuple
+
+
+class Overloaded(Exception):
+    """A lane is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"{lane} lane is saturated")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Lane:
+    """Per-endpoint concurrency limit plus a bounded wait queue over a shared pool."""
+
+    def __init__(self, pool: ThreadPoolExecutor, name: str, concurrency: int, queue: int):
+        if concurrency < 1 or queue < 0:
+            raise ValueError("concurrency must be >= 1 and queue >= 0")
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._pending: Deque[Tuple[Future, Callable[..., Any], tuple, dict]] = deque()
+        self._running = 0
+        self._avg_seconds = 0.0  # moving average of run time, for Retry-After
+        self.admitted = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.completed = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._running + len(self._pending) >= self.concurrency + self.queue:
+                self.rejected += 1
+                raise Overloaded(self.name, self._retry_after())
+            self.admitted += 1
+            self._pending.append((future, fn, args, kwargs))
+        self._dispatch()
+        return future
+
+    def _retry_after(self) -> int:
+        # Time for the work ahead of a new arrival to drain, at least one second.
+        backlog = self._running + len(self._pending)
+        return max(1, math.ceil(self._avg_seconds * backlog / self.concurrency))
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            while self._running < self.concurrency and self._pending:
+                future, fn, args, kwargs = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    self.cancelled += 1
+                    continue
+                self._running += 1
+                self._pool.submit(self._run, future, fn, args, kwargs)
+
+    def _run(self, future: Future, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        started = time.perf_counter()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                self._avg_seconds = elapsed if self.completed == 1 else 0.8 * self._avg_seconds + 0.2 * elapsed
+            self._dispatch()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "queue": self.queue,
+                "running": self._running,
+                "waiting": len(self._pending),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+                "completed": self.completed,
+                "avgSeconds": self._avg_seconds,
+            }
+
+
+class WorkPool:
+    def __init__(self, workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="work")
+        self.workers = workers
+        self.lanes: Dict[str, Lane] = {}
+
+    def lane(self, name: str, concurrency: int, queue: int) -> Lane:
+        lane = self.lanes[name] = Lane(self._pool, name, concurrency, queue)
+        return lane
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "lanes": {name: lane.stats() for name, lane in self.lanes.items()}}
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
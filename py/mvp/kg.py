@@ -6,14 +6,23 @@ Knowledge Graph (KG) relatedness for Recruiting MVP
   (1) Meta-path counts (Role -> Skill <- Candidate)
   (2) Personalized PageRank (PPR) starting from Role node
   (3) Adamic/Adar & Jaccard on skill neighborhoods
-Requires: networkx
+- Compile the graph into typed sparse matrices so each metric scores one role
+  against every candidate with a single sparse matrix-vector product
+Requires: networkx, scipy
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, List, Tuple, Iterable
+import ast
 import json
+import time
+import weakref
+import numpy as np
 import pandas as pd
 import networkx as nx
+import scipy.sparse as sp
 from .data_utils import load_candidate_dataframe
+from .shards import is_sharded_source, load_candidate_shards
 
 # ------------------------------
 # Graph schema
@@ -37,90 +46,517 @@ class KGConfig:
 def _node_id(prefix: str, key: str) -> str:
     return f"{prefix}:{key}"
 
-def build_kg(resumes_csv: str, teams_csv: str, role_requirements_json: str, cfg: KGConfig | None = None) -> nx.Graph:
-    cfg = cfg or KGConfig()
-    G = nx.Graph()
+def candidate_skill_names(row) -> list[str]:
+    """Skill names a candidate row links to in the KG (see build_kg)."""
+    if "canonical_skills" in row and isinstance(row["canonical_skills"], (list, set)):
+        return list(row["canonical_skills"])
+    raw = (row.get("skills") or "")
+    if isinstance(raw, str):
+        return [s.strip() for s in raw.replace(",", ";").split(";") if s.strip()]
+    return []
 
-    # Load data
-    resumes = load_candidate_dataframe(resumes_csv)
-    teams = pd.read_csv(teams_csv)
-    role = json.load(open(role_requirements_json))
-
-    # --- Role node ---
-    role_node = _node_id("role", role["role"])
-    G.add_node(role_node, type="role", name=role["role"])
-
-    # --- Skills from role ---
-    for s in role.get("required_skills", []):
-        sk = _node_id("skill", s)
-        G.add_node(sk, type="skill", name=s)
-        G.add_edge(role_node, sk, type="REQUIRES", weight=cfg.weight_requires, required=True)
-
-    for s in role.get("nice_to_have", []):
-        sk = _node_id("skill", s)
-        if not G.has_node(sk):
-            G.add_node(sk, type="skill", name=s)
-        G.add_edge(role_node, sk, type="REQUIRES", weight=cfg.weight_requires * 0.6, required=False)
-
-    # --- Teams ---
-    for _, t in teams.iterrows():
-        tnode = _node_id("team", t["team_id"])
-        G.add_node(tnode, type="team", name=t["team_name"], O=t["O"], C=t["C"], E=t["E"], A=t["A"], N=t["N"])
-        team_skills = (t["team_skills"] or "").split("|") if isinstance(t["team_skills"], str) else (t["team_skills"] or [])
-        for s in team_skills:
-            s = s.strip()
-            if not s:
-                continue
-            sk = _node_id("skill", s)
-            if not G.has_node(sk):
-                G.add_node(sk, type="skill", name=s)
-            G.add_edge(tnode, sk, type="HAS_SKILL", weight=cfg.weight_has_skill)
-
-    # --- Candidates ---
-    # Expect a column "canonical_skills" but if not present, try to parse "skills" (semicolon sep)
-    def _skills_from_row(row) -> list[str]:
-        if "canonical_skills" in row and isinstance(row["canonical_skills"], (list, set)):
-            return list(row["canonical_skills"])
-        raw = (row.get("skills") or "")
-        if isinstance(raw, str):
-            return [s.strip() for s in raw.replace(",", ";").split(";") if s.strip()]
-        return []
+def load_roles(source: str | Path | Iterable[str | Path]) -> List[dict]:
+    """Role requirement dicts from a JSON file, a directory of them, or a list of paths.
 
-    if "canonical_skills" in resumes.columns and resumes["canonical_skills"].dtype == object:
-        # canonical_skills may be serialized strings if saved earlier; try to eval safely
-        import ast
-        def _safe_parse(v):
-            if isinstance(v, (list, set)): return list(v)
-            try:
-                x = ast.literal_eval(v)
-                if isinstance(x, (list, set)): return list(x)
-            except Exception:
-                pass
-            # fallback: try to split by separators
-            if isinstance(v, str):
-                return [s.strip() for s in v.replace(",", ";").split(";") if s.strip()]
-            return []
-        resumes["__skills"] = resumes["canonical_skills"].map(_safe_parse)
+    Directory entries are read in file-name order; two files naming the same role
+    raise ValueError.
+    """
+    if isinstance(source, (str, Path)):
+        source = Path(source)
+        paths = sorted(source.glob("*.json")) if source.is_dir() else [source]
     else:
-        resumes["__skills"] = resumes.apply(_skills_from_row, axis=1)
-
-    for _, r in resumes.iterrows():
-        cnode = _node_id("candidate", r["id"])
-        G.add_node(cnode, type="candidate", name=r["name"], years=float(r.get("years_experience", 0)))
-        for s in r["__skills"]:
-            sk = _node_id("skill", s)
-            if not G.has_node(sk):
-                G.add_node(sk, type="skill", name=s)
-            G.add_edge(cnode, sk, type="HAS_SKILL", weight=cfg.weight_has_skill)
-
-        # Optional link to team if column exists (not in sample)
-        if "team_id" in r and isinstance(r["team_id"], str) and r["team_id"]:
-            tnode = _node_id("team", r["team_id"])
-            if G.has_node(tnode):
-                G.add_edge(cnode, tnode, type="CANDIDATE_OF", weight=cfg.weight_candidate_of)
+        paths = [Path(p) for p in source]
+    roles, seen = [], set()
+    for path in paths:
+        role = json.loads(path.read_text())
+        if role["role"] in seen:
+            raise ValueError(f"Role {role['role']!r} is defined more than once ({path})")
+        seen.add(role["role"])
+        roles.append(role)
+    return roles
+
+def _parse_skill_list(v) -> list:
+    # canonical_skills may be serialized strings if saved earlier; try to eval safely
+    if isinstance(v, (list, set)):
+        return list(v)
+    try:
+        x = ast.literal_eval(v)
+        if isinstance(x, (list, set)):
+            return list(x)
+    except Exception:
+        pass
+    # fallback: try to split by separators
+    if isinstance(v, str):
+        return [s.strip() for s in v.replace(",", ";").split(";") if s.strip()]
+    return []
+
+def _candidate_skills(resumes: pd.DataFrame, skills_column: str | None) -> pd.Series:
+    """Candidate skill names exploded to one per row, indexed by the candidate's row position.
+
+    Uses ``canonical_skills`` when the frame has it (object dtype) unless ``skills_column``
+    says otherwise; the ``skills`` string column is split like candidate_skill_names.
+    """
+    column = skills_column or (
+        "canonical_skills"
+        if "canonical_skills" in resumes.columns and resumes["canonical_skills"].dtype == object
+        else "skills"
+    )
+    if column not in resumes.columns:
+        return pd.Series([], dtype=object)
+    values = resumes[column].reset_index(drop=True)
+    if column == "canonical_skills":
+        return values.map(_parse_skill_list).explode().dropna()
+    # Non-string cells become NaN under .str and drop out, like candidate_skill_names.
+    names = values.str.replace(",", ";", regex=False).str.split(";").explode().dropna().str.strip()
+    return names[names != ""]
+
+def _team_skills(value) -> list:
+    if isinstance(value, str):
+        return value.split("|")
+    return list(value) if isinstance(value, (list, tuple, set)) else []
+
+def _timed(timings: Dict[str, float] | None, stage: str, started: float) -> float:
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + (now - started)
+    return now
+
+def _unique_pairs(rows: np.ndarray, cols: np.ndarray, n_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    # A repeated (node, node) pair is one edge, as in nx.Graph.
+    n_cols = max(1, n_cols)
+    return np.divmod(np.unique(rows.astype(np.int64) * n_cols + cols), n_cols)
+
+@dataclass
+class _KGTables:
+    """Interned node ids per type plus (row, col, weight) arrays per typed edge block."""
+    names: Dict[str, List[str]]
+    edges: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]
+    role_required: np.ndarray  # per role_skill edge: the REQUIRES edge's ``required`` flag
+    roles: List[dict]
+    teams: pd.DataFrame  # one row per team node in first-seen order, last occurrence's values (as with add_node)
+    candidates: pd.DataFrame  # one row per candidate node, likewise
+
+def _kg_tables(resumes: str | Path | pd.DataFrame, teams_csv: str | Path | pd.DataFrame,
+               role_requirements_json: str | Path | Iterable[str | Path], cfg: KGConfig,
+               timings: Dict[str, float] | None, skills_column: str | None) -> _KGTables:
+    t = time.perf_counter()
+    if not isinstance(resumes, pd.DataFrame):
+        resumes = (
+            load_candidate_shards(resumes, matcher=None).df
+            if is_sharded_source(resumes)
+            else load_candidate_dataframe(resumes)
+        )
+    teams = teams_csv if isinstance(teams_csv, pd.DataFrame) else pd.read_csv(teams_csv)
+    roles = load_roles(role_requirements_json)
+    t = _timed(timings, "load", t)
+
+    # --- Roles: REQUIRES edges to their skills (a skill listed twice keeps its nice-to-have weight) ---
+    role_edges: List[Tuple[int, str, float, bool]] = []
+    for r, role in enumerate(roles):
+        weights: Dict[str, Tuple[float, bool]] = {}
+        for s in role.get("required_skills", []):
+            weights[s] = (cfg.weight_requires, True)
+        for s in role.get("nice_to_have", []):
+            weights[s] = (cfg.weight_requires * 0.6, False)
+        role_edges.extend((r, s, w, req) for s, (w, req) in weights.items())
+    role_skill = pd.Series([s for _, s, _, _ in role_edges], dtype=object)
+    t = _timed(timings, "roles", t)
+
+    # --- Teams: HAS_SKILL edges from "|"-separated team_skills ---
+    teams = teams.reset_index(drop=True)
+    team_nodes = "team:" + teams["team_id"].astype(str)
+    team_codes, team_names = pd.factorize(team_nodes)
+    team_skill = teams["team_skills"].map(_team_skills).explode().dropna().astype(str).str.strip()
+    team_skill = team_skill[team_skill != ""]
+    team_rows = team_codes[team_skill.index.to_numpy()]
+    t = _timed(timings, "teams", t)
 
+    # --- Candidates: HAS_SKILL edges from the exploded skill column ---
+    resumes = resumes.reset_index(drop=True)
+    cand_codes, cand_names = pd.factorize("candidate:" + resumes["id"].astype(str))
+    cand_skill = _candidate_skills(resumes, skills_column)
+    cand_rows = cand_codes[cand_skill.index.to_numpy(dtype=np.int64)]
+    t = _timed(timings, "candidates", t)
+
+    # Skill nodes get interned ids in first-seen order: role, then team, then candidate skills.
+    role_skill, team_skill, cand_skill = (
+        ("skill:" + names.astype(str)).to_numpy(dtype=object) for names in (role_skill, team_skill, cand_skill)
+    )
+    skill_names = pd.unique(np.concatenate([role_skill, team_skill, cand_skill]))
+    skill_index = pd.Index(skill_names)
+    ns = len(skill_names)
+
+    edges = {
+        "role_skill": (
+            np.array([r for r, _, _, _ in role_edges], dtype=np.int64),
+            skill_index.get_indexer(role_skill),
+            np.array([w for _, _, w, _ in role_edges], dtype=float),
+        ),
+    }
+    for block, rows, names in (("team_skill", team_rows, team_skill), ("cand_skill", cand_rows, cand_skill)):
+        rows, cols = _unique_pairs(rows, skill_index.get_indexer(names), ns)
+        edges[block] = (rows, cols, np.full(len(rows), float(cfg.weight_has_skill)))
+
+    # Optional link to team if column exists (not in sample)
+    rows = cols = np.zeros(0, dtype=np.int64)
+    if "team_id" in resumes.columns:
+        team_id = resumes["team_id"]
+        linked = team_id.map(lambda v: isinstance(v, str) and bool(v)).to_numpy(dtype=bool)
+        cols = pd.Index(team_names).get_indexer(("team:" + team_id[linked].astype(str)).to_numpy(dtype=object))
+        rows, cols = _unique_pairs(cand_codes[linked][cols >= 0], cols[cols >= 0], len(team_names))
+    edges["cand_team"] = (rows, cols, np.full(len(rows), float(cfg.weight_candidate_of)))
+    t = _timed(timings, "intern", t)
+
+    return _KGTables(
+        names={
+            "role": [_node_id("role", role["role"]) for role in roles],
+            "skill": list(skill_names),
+            "team": list(team_names),
+            "candidate": list(cand_names),
+        },
+        edges=edges,
+        role_required=np.array([req for _, _, _, req in role_edges], dtype=bool),
+        roles=roles,
+        teams=_last_values(teams.assign(_node=team_nodes), team_codes),
+        candidates=_last_values(resumes.assign(_node=cand_names[cand_codes]), cand_codes),
+    )
+
+def _last_values(frame: pd.DataFrame, codes: np.ndarray) -> pd.DataFrame:
+    # add_node on an existing node updates its attributes but keeps its position.
+    last = frame.drop_duplicates("_node", keep="last")
+    return last.iloc[np.argsort(codes[last.index.to_numpy()], kind="stable")]
+
+def build_kg(resumes_csv: str | Path | pd.DataFrame, teams_csv: str | Path | pd.DataFrame,
+             role_requirements_json: str | Path | Iterable[str | Path], cfg: KGConfig | None = None,
+             timings: Dict[str, float] | None = None, skills_column: str | None = None) -> nx.Graph:
+    """
+    Build the KG as a networkx graph. ``resumes_csv`` may be an already-loaded candidate
+    frame or a directory/glob of CSV shards (see load_candidate_shards), and
+    ``role_requirements_json`` one role file or many (see load_roles).
+    Nodes and edges are added in bulk from interned tables; seconds per stage are
+    added to ``timings`` when given. build_compiled_kg skips networkx altogether.
+    """
+    cfg = cfg or KGConfig()
+    tables = _kg_tables(resumes_csv, teams_csv, role_requirements_json, cfg, timings, skills_column)
+    t = time.perf_counter()
+    names = tables.names
+    G = nx.Graph()
+    G.add_nodes_from((node, {"type": "role", "name": role["role"]}) for node, role in zip(names["role"], tables.roles))
+    G.add_nodes_from((node, {"type": "skill", "name": node[len("skill:"):]}) for node in names["skill"])
+    teams = tables.teams
+    G.add_nodes_from(
+        (node, {"type": "team", "name": name, "O": o, "C": c, "E": e, "A": a, "N": n})
+        for node, name, o, c, e, a, n in zip(
+            teams["_node"], teams["team_name"], teams["O"], teams["C"], teams["E"], teams["A"], teams["N"]
+        )
+    )
+    cands = tables.candidates
+    years = cands["years_experience"].astype(float) if "years_experience" in cands.columns else [0.0] * len(cands)
+    G.add_nodes_from(
+        (node, {"type": "candidate", "name": name, "years": year})
+        for node, name, year in zip(cands["_node"], cands["name"], years)
+    )
+
+    def _add(block: str, src: List[str], dst: List[str], edge_type: str) -> None:
+        rows, cols, vals = tables.edges[block]
+        G.add_edges_from(
+            (src[r], dst[c], {"type": edge_type, "weight": w})
+            for r, c, w in zip(rows.tolist(), cols.tolist(), vals.tolist())
+        )
+
+    _add("role_skill", names["role"], names["skill"], "REQUIRES")
+    rows, cols, _ = tables.edges["role_skill"]
+    for r, c, required in zip(rows.tolist(), cols.tolist(), tables.role_required.tolist()):
+        G.edges[names["role"][r], names["skill"][c]]["required"] = required
+    _add("team_skill", names["team"], names["skill"], "HAS_SKILL")
+    _add("cand_skill", names["candidate"], names["skill"], "HAS_SKILL")
+    _add("cand_team", names["candidate"], names["team"], "CANDIDATE_OF")
+    _timed(timings, "graph", t)
     return G
 
+def build_compiled_kg(resumes_csv: str | Path | pd.DataFrame, teams_csv: str | Path | pd.DataFrame,
+                      role_requirements_json: str | Path | Iterable[str | Path], cfg: KGConfig | None = None,
+                      timings: Dict[str, float] | None = None, skills_column: str | None = None) -> "CompiledKG":
+    """Same as ``CompiledKG.from_graph(build_kg(...))``, assembled straight from the tables."""
+    tables = _kg_tables(resumes_csv, teams_csv, role_requirements_json, cfg or KGConfig(), timings, skills_column)
+    t = time.perf_counter()
+    names = tables.names
+    nr, ns, nt, nc = (len(names[kind]) for kind in NODE_TYPES)
+    shapes = {"role_skill": (nr, ns), "team_skill": (nt, ns), "cand_skill": (nc, ns), "cand_team": (nc, nt)}
+    blocks = {
+        block: sp.csr_matrix((vals, (rows, cols)), shape=shapes[block], dtype=np.float64)
+        for block, (rows, cols, vals) in tables.edges.items()
+    }
+    kg = CompiledKG(roles=names["role"], skills=names["skill"], teams=names["team"], candidates=names["candidate"],
+                    **blocks)
+    _timed(timings, "compile", t)
+    return kg
+
+# ------------------------------
+# Compiled (sparse) graph
+# ------------------------------
+# Global node ids are laid out in type blocks: roles, skills, teams, candidates.
+# Each typed edge set is a CSR matrix over the per-type ids, weights as stored on
+# the networkx edges. Structural metrics (metapath, Jaccard, Adamic/Adar) ignore
+# weights exactly like their networkx counterparts; PPR uses them.
+NODE_TYPES = ("role", "skill", "team", "candidate")
+_EDGE_BLOCKS = {
+    ("role", "skill"): "role_skill",
+    ("team", "skill"): "team_skill",
+    ("candidate", "skill"): "cand_skill",
+    ("candidate", "team"): "cand_team",
+}
+
+def _binary(m: sp.csr_matrix) -> sp.csr_matrix:
+    if np.all(m.data == 1.0):
+        return m  # already structural; keeps memory-mapped arrays shared
+    out = m.copy()
+    out.data = np.ones_like(out.data)
+    return out
+
+@dataclass
+class CompiledKG:
+    roles: List[str]
+    skills: List[str]
+    teams: List[str]
+    candidates: List[str]
+    role_skill: sp.csr_matrix   # (roles x skills)
+    team_skill: sp.csr_matrix   # (teams x skills)
+    cand_skill: sp.csr_matrix   # (candidates x skills)
+    cand_team: sp.csr_matrix    # (candidates x teams)
+    degree: np.ndarray = field(init=False)  # unweighted degree per global node id
+    offsets: np.ndarray = field(init=False, repr=False)  # first global id of each node type
+    index: Dict[str, int] = field(init=False, repr=False)
+    _cand_skill_bin: sp.csr_matrix = field(init=False, repr=False)
+    _cache: Dict[tuple, np.ndarray] = field(init=False, default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self.offsets = np.cumsum([0, len(self.roles), len(self.skills), len(self.teams)])
+        self.index = {}
+        for offset, names in zip(self.offsets, (self.roles, self.skills, self.teams, self.candidates)):
+            self.index.update((n, int(offset) + i) for i, n in enumerate(names))
+        ns, nt = len(self.skills), len(self.teams)
+        self.degree = np.concatenate([
+            np.diff(self.role_skill.indptr),
+            np.bincount(self.role_skill.indices, minlength=ns)
+            + np.bincount(self.team_skill.indices, minlength=ns)
+            + np.bincount(self.cand_skill.indices, minlength=ns),
+            np.diff(self.team_skill.indptr) + np.bincount(self.cand_team.indices, minlength=nt),
+            np.diff(self.cand_skill.indptr) + np.diff(self.cand_team.indptr),
+        ]).astype(np.int64)
+        self._cand_skill_bin = _binary(self.cand_skill)
+
+    @classmethod
+    def from_graph(cls, G: nx.Graph) -> "CompiledKG":
+        """Compile a graph produced by build_kg. Node order within a type follows G."""
+        names: Dict[str, List[str]] = {t: [] for t in NODE_TYPES}
+        local: Dict[str, Tuple[str, int]] = {}
+        for n, d in G.nodes(data=True):
+            t = d.get("type")
+            if t not in names:
+                raise ValueError(f"Unsupported node type {t!r} for {n!r}")
+            local[n] = (t, len(names[t]))
+            names[t].append(n)
+
+        coo: Dict[str, Tuple[list, list, list]] = {b: ([], [], []) for b in _EDGE_BLOCKS.values()}
+        for u, v, w in G.edges(data="weight", default=1.0):
+            (tu, iu), (tv, iv) = local[u], local[v]
+            block = _EDGE_BLOCKS.get((tu, tv))
+            if block is None:
+                block = _EDGE_BLOCKS.get((tv, tu))
+                if block is None:
+                    raise ValueError(f"Unsupported edge {u!r} -- {v!r}")
+                iu, iv = iv, iu
+            rows, cols, vals = coo[block]
+            rows.append(iu); cols.append(iv); vals.append(float(w))
+
+        def _csr(block: str, n_rows: int, n_cols: int) -> sp.csr_matrix:
+            rows, cols, vals = coo[block]
+            return sp.csr_matrix((vals, (rows, cols)), shape=(n_rows, n_cols), dtype=np.float64)
+
+        nr, ns, nt, nc = (len(names[t]) for t in NODE_TYPES)
+        return cls(
+            roles=names["role"], skills=names["skill"], teams=names["team"], candidates=names["candidate"],
+            role_skill=_csr("role_skill", nr, ns),
+            team_skill=_csr("team_skill", nt, ns),
+            cand_skill=_csr("cand_skill", nc, ns),
+            cand_team=_csr("cand_team", nc, nt),
+        )
+
+    def with_candidates(self, candidate_nodes: List[str], skill_names: List[List[str]],
+                        weight: float = 1.0) -> "CompiledKG":
+        """
+        Return a copy with new candidate nodes wired to their skills (HAS_SKILL edges of
+        ``weight``). Unknown skills become new skill nodes. Caches start empty, so PPR is
+        re-solved on next use.
+        """
+        clash = [n for n in candidate_nodes if n in self.index] + [
+            n for i, n in enumerate(candidate_nodes) if n in candidate_nodes[:i]
+        ]
+        if clash:
+            raise ValueError(f"Candidate nodes already in graph: {clash}")
+        skills = list(self.skills)
+        local = {n: i for i, n in enumerate(skills)}
+        rows, cols = [], []
+        for r, names in enumerate(skill_names):
+            for col in dict.fromkeys(_node_id("skill", s) for s in names):
+                if col not in local:
+                    local[col] = len(skills)
+                    skills.append(col)
+                rows.append(r)
+                cols.append(local[col])
+        ns = len(skills)
+
+        def _widen(m: sp.csr_matrix) -> sp.csr_matrix:
+            return sp.csr_matrix((m.data, m.indices, m.indptr), shape=(m.shape[0], ns))
+
+        added = sp.csr_matrix((np.full(len(rows), float(weight)), (rows, cols)), shape=(len(candidate_nodes), ns))
+        return CompiledKG(
+            roles=self.roles, skills=skills, teams=self.teams, candidates=self.candidates + list(candidate_nodes),
+            role_skill=_widen(self.role_skill),
+            team_skill=_widen(self.team_skill),
+            cand_skill=sp.vstack([_widen(self.cand_skill), added], format="csr"),
+            cand_team=sp.vstack([self.cand_team, sp.csr_matrix((len(candidate_nodes), len(self.teams)))], format="csr"),
+        )
+
+    def without_candidates(self, candidate_nodes: Iterable[str]) -> "CompiledKG":
+        """Return a copy without the given candidate nodes (their skill nodes stay)."""
+        drop = set(candidate_nodes)
+        keep = np.array([i for i, n in enumerate(self.candidates) if n not in drop], dtype=np.int64)
+        return CompiledKG(
+            roles=self.roles, skills=self.skills, teams=self.teams,
+            candidates=[self.candidates[i] for i in keep],
+            role_skill=self.role_skill, team_skill=self.team_skill,
+            cand_skill=self.cand_skill[keep], cand_team=self.cand_team[keep],
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.offsets[-1]) + len(self.candidates)
+
+    def candidate_rows(self, candidate_nodes: Iterable[str]) -> np.ndarray:
+        """Map candidate node ids to rows of the score vectors (-1 when absent)."""
+        base = int(self.offsets[3])
+        return np.array([self.index.get(n, base - 1) - base for n in candidate_nodes], dtype=np.int64)
+
+    def _role_row(self, role_node: str) -> int | None:
+        gid = self.index.get(role_node)
+        return gid if gid is not None and gid < self.offsets[1] else None
+
+    def _role_skills(self, role_node: str) -> np.ndarray:
+        r = self._role_row(role_node)
+        if r is None:
+            return np.zeros(0, dtype=np.int32)
+        return self.role_skill.indices[self.role_skill.indptr[r]:self.role_skill.indptr[r + 1]]
+
+    def _shared_skills(self, role_node: str, skill_weights: np.ndarray | None = None) -> np.ndarray:
+        vec = np.zeros(len(self.skills))
+        idx = self._role_skills(role_node)
+        vec[idx] = 1.0 if skill_weights is None else skill_weights[idx]
+        return self._cand_skill_bin @ vec
+
+    def metapath(self, role_node: str) -> np.ndarray:
+        """Vector form of relatedness_metapath for every candidate."""
+        n_req = len(self._role_skills(role_node))
+        if not n_req:
+            return np.zeros(len(self.candidates))
+        return self._shared_skills(role_node) / float(n_req)
+
+    def jaccard(self, role_node: str) -> np.ndarray:
+        """Vector form of relatedness_jaccard for every candidate."""
+        r = self._role_row(role_node)
+        if r is None:
+            return np.zeros(len(self.candidates))
+        inter = self._shared_skills(role_node)
+        union = self.degree[r] + self.degree[self.offsets[3]:] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+    def adamic_adar(self, role_node: str) -> np.ndarray:
+        """Vector form of relatedness_adamic_adar for every candidate."""
+        deg = self.degree[self.offsets[1]:self.offsets[2]].astype(float)
+        weights = np.zeros_like(deg)
+        np.divide(1.0, np.log(deg, where=deg > 1, out=np.ones_like(deg)), out=weights, where=deg > 1)
+        return self._shared_skills(role_node, weights)
+
+    def adjacency(self) -> sp.csr_matrix:
+        """Full symmetric weighted adjacency over global node ids."""
+        adj = self._cache.get(("adjacency",))
+        if adj is None:
+            o = self.offsets
+            rows, cols, vals = [], [], []
+            for m, ro, co in ((self.role_skill, o[0], o[1]), (self.team_skill, o[2], o[1]),
+                              (self.cand_skill, o[3], o[1]), (self.cand_team, o[3], o[2])):
+                c = m.tocoo()
+                rows += [c.row + ro, c.col + co]
+                cols += [c.col + co, c.row + ro]
+                vals += [c.data, c.data]
+            adj = sp.csr_matrix(
+                (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                shape=(self.n_nodes, self.n_nodes),
+            )
+            self._cache[("adjacency",)] = adj
+        return adj
+
+    def pagerank(self, role_node: str, alpha: float = 0.15, max_iter: int = 100, tol: float = 1.0e-06) -> np.ndarray:
+        """
+        Personalized PageRank over all nodes, restarting at role_node with probability alpha.
+        Same power iteration as nx.pagerank (dangling mass follows the personalization).
+        Solved once per (role_node, alpha).
+        """
+        key = ("ppr", role_node, float(alpha))
+        x = self._cache.get(key)
+        if x is not None:
+            return x
+        gid = self.index.get(role_node)
+        N = self.n_nodes
+        if gid is None:
+            return np.zeros(N)
+        damping = 1.0 - alpha
+        A = self.adjacency()
+        S = np.asarray(A.sum(axis=1)).ravel()
+        inv = np.zeros_like(S)
+        np.divide(1.0, S, out=inv, where=S != 0)
+        A = sp.diags(inv, format="csr") @ A
+        p = np.zeros(N)
+        p[gid] = 1.0
+        is_dangling = np.where(S == 0)[0]
+        x = np.repeat(1.0 / N, N)
+        for _ in range(max_iter):
+            xlast = x
+            x = damping * (A.T @ x + x[is_dangling].sum() * p) + (1 - damping) * p
+            if np.absolute(x - xlast).sum() < N * tol:
+                self._cache[key] = x
+                return x
+        raise nx.PowerIterationFailedConvergence(max_iter)
+
+    def attach_precomputed(self, adjacency: sp.csr_matrix | None = None,
+                           pagerank: Dict[Tuple[str, float], np.ndarray] | None = None) -> None:
+        """Reuse an adjacency matrix and PPR vectors computed elsewhere (e.g. mapped from a snapshot)."""
+        if adjacency is not None:
+            self._cache[("adjacency",)] = adjacency
+        for (role_node, alpha), x in (pagerank or {}).items():
+            self._cache[("ppr", role_node, float(alpha))] = x
+
+    def ppr(self, role_node: str, alpha: float = 0.15) -> np.ndarray:
+        """PPR mass landing on every candidate."""
+        return self.pagerank(role_node, alpha)[self.offsets[3]:]
+
+# Compiled views keyed by graph. Entries (and the PPR vectors cached on them)
+# disappear with the graph object, so rebuilding the KG never serves stale scores.
+_COMPILED: "weakref.WeakKeyDictionary[nx.Graph, CompiledKG]" = weakref.WeakKeyDictionary()
+
+def compile_kg(G: nx.Graph) -> CompiledKG:
+    """Return the cached CompiledKG for G, compiling it on first use."""
+    ckg = _COMPILED.get(G)
+    if ckg is None:
+        ckg = CompiledKG.from_graph(G)
+        _COMPILED[G] = ckg
+    return ckg
+
+def clear_kg_cache(G: nx.Graph) -> None:
+    """Drop the compiled view and PPR vectors for G (call after mutating the graph in place)."""
+    _COMPILED.pop(G, None)
+
 # ------------------------------
 # Relatedness metrics
 # ------------------------------
@@ -155,6 +591,24 @@ def relatedness_jaccard(G: nx.Graph, role_node: str, candidate_node: str) -> flo
         return float(score or 0.0)
     return 0.0
 
+def personalized_pagerank(G: nx.Graph, role_node: str, alpha: float = 0.15) -> Dict[str, float]:
+    """
+    Personalized PageRank vector for every node, restarting at role_node.
+    Solved once per (graph, role_node, alpha) and cached until the graph is dropped.
+    """
+    if role_node not in G:
+        return {}
+    ckg = compile_kg(G)
+    x = ckg.pagerank(role_node, alpha)
+    return {n: float(x[i]) for n, i in ckg.index.items()}
+
+def ppr_candidate_scores(G: nx.Graph, role_node: str, alpha: float = 0.15) -> Dict[str, float]:
+    """PPR mass for every candidate node, from a single solve."""
+    if role_node not in G:
+        return {}
+    ckg = compile_kg(G)
+    return dict(zip(ckg.candidates, ckg.ppr(role_node, alpha).tolist()))
+
 def relatedness_ppr(G: nx.Graph, role_node: str, candidate_node: str, alpha: float = 0.15) -> float:
     """
     Personalized PageRank (random walk with restart) starting at role_node.
@@ -162,8 +616,8 @@ def relatedness_ppr(G: nx.Graph, role_node: str, candidate_node: str, alpha: flo
     """
     if role_node not in G or candidate_node not in G:
         return 0.0
-    ppr = nx.pagerank(G, alpha=1 - alpha, personalization={role_node: 1.0})
-    return float(ppr.get(candidate_node, 0.0))
+    ckg = compile_kg(G)
+    return float(ckg.pagerank(role_node, alpha)[ckg.index[candidate_node]])
 
 def rank_candidates_by_kg(G: nx.Graph, role_node: str, top_k: int = 5,
                           w_meta: float = 0.5, w_ppr: float = 0.4, w_jaccard: float = 0.1) -> list[tuple[str, float, dict]]:
@@ -171,13 +625,15 @@ def rank_candidates_by_kg(G: nx.Graph, role_node: str, top_k: int = 5,
     Blend multiple KG signals into a final score.
     Returns: list of (candidate_node, score, breakdown)
     """
-    candidates = [n for n, d in G.nodes(data=True) if d.get("type") == "candidate"]
-    scores = []
-    for c in candidates:
-        s_meta = relatedness_metapath(G, role_node, c)
-        s_ppr = relatedness_ppr(G, role_node, c)
-        s_jac = relatedness_jaccard(G, role_node, c)
-        final = w_meta*s_meta + w_ppr*s_ppr + w_jaccard*s_jac
-        scores.append((c, final, {"meta": s_meta, "ppr": s_ppr, "jaccard": s_jac}))
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores[:top_k]
+    ckg = compile_kg(G)
+    if not ckg.candidates:
+        return []
+    meta = ckg.metapath(role_node)
+    ppr = ckg.ppr(role_node)
+    jac = ckg.jaccard(role_node)
+    final = w_meta*meta + w_ppr*ppr + w_jaccard*jac
+    order = np.argsort(-final, kind="stable")[:top_k]
+    return [
+        (ckg.candidates[i], float(final[i]), {"meta": float(meta[i]), "ppr": float(ppr[i]), "jaccard": float(jac[i])})
+        for i in order
+    ]
@@ -1,96 +1,470 @@
 from __future__ import annotations
+import copy
 import json
 from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from .data_utils import load_candidate_dataframe
-from .skills import extract_skills
+from .data_utils import CANONICAL_COLUMNS, PERSONALITY_TRAITS, iter_candidate_chunks, load_candidate_dataframe, normalise_candidate_frame
+from .retrieval import Retriever, TermIndex
+from .shards import extract_frame, is_sharded_source, load_candidate_shards
+from .skills import DEFAULT_MATCHER, SkillMatcher
+
+class CandidateStore:
+    """Columnar, position-addressed view of a candidate frame.
+
+    ``positions`` maps each id to its first row, years of experience and the Big-5
+    scores (rows x O,C,E,A,N) are NumPy arrays, and other columns are taken as arrays
+    on first use, so reading one candidate is a few array reads instead of a row
+    lookup in pandas.
+    """
+
+    __slots__ = ("ids", "positions", "years", "personality", "_df", "_columns")
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._columns: Dict[str, np.ndarray] = {}
+        self.ids = self.column("id")
+        n = len(self.ids)
+        # Filled back to front so a repeated id keeps its first row.
+        self.positions: Dict[str, int] = dict(zip(self.ids[::-1].tolist(), range(n - 1, -1, -1)))
+        self.years = self._floats(["years_experience"])[:, 0]
+        self.personality = self._floats(PERSONALITY_TRAITS)
+
+    def _floats(self, columns: List[str]) -> np.ndarray:
+        # float32 stays float32 (compact loads); anything else becomes float64.
+        frame = self._df.reindex(columns=columns, fill_value=0.5 if columns == PERSONALITY_TRAITS else 0.0)
+        compact = all(dtype == np.float32 for dtype in frame.dtypes)
+        return np.ascontiguousarray(frame.to_numpy(dtype=np.float32 if compact else np.float64))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """Values of column ``name`` by row position (None when the frame lacks it)."""
+        values = self._columns.get(name)
+        if values is None and name in self._df.columns:
+            values = self._columns.setdefault(name, self._df[name].to_numpy(dtype=object))
+        return values
+
+    def position(self, candidate_id: str) -> Optional[int]:
+        return self.positions.get(candidate_id)
+
+    def record(self, pos: int) -> "Candidate":
+        return Candidate(self, pos)
+
+    def get(self, candidate_id: str) -> Optional["Candidate"]:
+        pos = self.positions.get(candidate_id)
+        return None if pos is None else Candidate(self, pos)
+
 
-@dataclass
 class Candidate:
-    id: str
-    name: str
-    text: str
-    skills: List[str]
-    years_experience: float
-    personality: Dict[str, float]  # Big5: O,C,E,A,N
+    """One candidate of a CandidateStore, read by row position without copying the row."""
+
+    __slots__ = ("store", "pos")
+
+    def __init__(self, store: CandidateStore, pos: int):
+        self.store = store
+        self.pos = pos
+
+    def _get(self, column: str, default: Any = None) -> Any:
+        values = self.store.column(column)
+        return default if values is None else values[self.pos]
+
+    @property
+    def id(self) -> str:
+        return self.store.ids[self.pos]
+
+    @property
+    def name(self) -> str:
+        return self._get("name", self.id)
+
+    @property
+    def text(self) -> str:
+        return str(self._get("resume_text", ""))
+
+    @property
+    def skills(self) -> List[str]:
+        """Canonical skills, sorted."""
+        skills = self._get("canonical_skills")
+        return sorted(skills) if isinstance(skills, (set, list, tuple)) else []
+
+    @property
+    def years_experience(self) -> float:
+        return float(self.store.years[self.pos])
+
+    @property
+    def personality(self) -> Dict[str, float]:  # Big5: O,C,E,A,N
+        return dict(zip(PERSONALITY_TRAITS, self.store.personality[self.pos].tolist()))
+
+OUTPUT_COLUMNS = [
+    "id",
+    "name",
+    "final_score",
+    "sem_score",
+    "coverage_required",
+    "coverage_nice",
+    "years_experience",
+    "O",
+    "C",
+    "E",
+    "A",
+    "N",
+    "canonical_skills",
+    "resume_text",
+]
+
+@dataclass
+class CandidateScores:
+    """Per-candidate score components, aligned with the rows of RecruitingMVP.df."""
+    sem_score: np.ndarray
+    coverage_required: np.ndarray
+    coverage_nice: np.ndarray
+    exp_score: np.ndarray
+    final_score: np.ndarray
+    # Rows actually scored when stage two ran on a shortlist (None: every row).
+    candidates: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.final_score) if self.candidates is None else len(self.candidates)
+
+    def top(self, k: Optional[int] = None) -> np.ndarray:
+        """Row positions of the k best candidates, best first (ties keep row order)."""
+        if self.candidates is None:
+            return top_positions(self.final_score, k)
+        return self.candidates[top_positions(self.final_score[self.candidates], k)]
+
+@dataclass
+class RoleQuery:
+    """A skill query prepared against one index: TF-IDF vector plus skill-column masks.
+
+    Build with ``RecruitingMVP.role_query`` and pass to ``score`` to skip re-vectorising
+    a query that is scored repeatedly (e.g. a configured role). Only valid for the
+    vectorizer and skill vocabulary it was built with.
+    """
+    required: List[str]
+    nice_to_have: List[str]
+    vector: sp.csr_matrix  # (1 x vocabulary)
+    required_mask: np.ndarray  # bool over skill_vocab
+    nice_mask: np.ndarray
+    # Distinct skills asked for, including ones outside the vocabulary (coverage denominators).
+    n_required: int
+    n_nice: int
+
+def top_positions(score: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Indices of the k largest values in descending order, via partial selection."""
+    n = len(score)
+    if k is None or k >= n:
+        return np.argsort(-score, kind="stable")
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    part = np.argpartition(-score, k - 1)[:k]
+    cutoff = score[part].min()
+    above = np.flatnonzero(score > cutoff)
+    ties = np.flatnonzero(score == cutoff)[: k - len(above)]
+    idx = np.concatenate([above, ties])
+    return idx[np.argsort(-score[idx], kind="stable")]
 
 class RecruitingMVP:
-    def __init__(self, resumes_csv: str):
-        self.df = load_candidate_dataframe(resumes_csv)
-        self.df = self.df.fillna({"resume_text": "", "skills": ""})
+    def __init__(
+        self,
+        resumes_csv: str,
+        skill_matcher: SkillMatcher | None = None,
+        chunksize: int | None = None,
+        compact: bool = False,
+        workers: int | None = None,
+    ):
+        """Load and index ``resumes_csv``.
+
+        With ``chunksize`` the CSV is streamed (see iter_candidate_chunks) and each
+        chunk's documents, canonical skills and skill-matrix rows are built as it
+        arrives; only the TF-IDF fit needs every document at once.
+
+        ``resumes_csv`` may also be a directory, glob pattern or list of CSV files:
+        they are loaded as shards by ``workers`` processes (see load_candidate_shards)
+        and ``ingest_report`` holds the throughput summary.
+        """
+        self.skill_matcher = skill_matcher or DEFAULT_MATCHER
+        # Candidate x canonical-skill membership, so coverage is a column reduction
+        # and team skill unions are a bitwise OR instead of per-row set algebra.
+        self.skill_vocab: List[str] = list(self.skill_matcher.canonical)
+        self.skill_index: Dict[str, int] = {s: i for i, s in enumerate(self.skill_vocab)}
+
+        self.ingest_report: Optional[Dict[str, Any]] = None
+        if is_sharded_source(resumes_csv):
+            sharded = load_candidate_shards(resumes_csv, self.skill_matcher, workers, chunksize, compact)
+            self.ingest_report = sharded.report()
+            parts = [(sharded.df, sharded.skill_matrix)]
+        else:
+            if chunksize:
+                chunks = iter_candidate_chunks(resumes_csv, chunksize, compact)
+            else:
+                chunks = [load_candidate_dataframe(resumes_csv, compact=compact)]
+            # Canonical skills from the documents (resume text + provided skills)
+            parts = (extract_frame(chunk, self.skill_matcher) for chunk in chunks)
+        frames: List[pd.DataFrame] = []
+        documents: List[str] = []
+        matrices: List[np.ndarray] = []
+        for chunk, matrix in parts:
+            documents.extend(self._documents(chunk).tolist())
+            matrices.append(matrix)
+            frames.append(chunk)
+        if len(frames) == 1:
+            self.df = frames[0]
+        elif frames:
+            self.df = pd.concat(frames, ignore_index=True)
+        else:
+            self.df = pd.DataFrame(columns=[*CANONICAL_COLUMNS, "canonical_skills"])
+        self.skill_matrix = (
+            np.concatenate(matrices) if matrices else np.zeros((0, len(self.skill_vocab)), dtype=bool)
+        )
 
-        # Build documents (resume text + provided skills)
-        corpus = (self.df["resume_text"].astype(str) + " " + self.df["skills"].astype(str)).tolist()
         self.vectorizer = TfidfVectorizer(min_df=1, max_df=0.9, ngram_range=(1,2))
-        self.doc_matrix = self.vectorizer.fit_transform(corpus)
-        # Extract canonical skills
-        combined_text = self.df["resume_text"].astype(str) + " " + self.df["skills"].astype(str)
-        self.df["canonical_skills"] = combined_text.map(extract_skills)
+        self.doc_matrix = self.vectorizer.fit_transform(documents)
+        self.docs_since_fit = 0
+        # Skill / name-token postings for boolean pre-filters
+        self.terms = TermIndex.build(self.skill_matrix, self.skill_index, self.df["name"])
         # Personality vector
         self.personality_cols = ["O","C","E","A","N"]
         for col in self.personality_cols:
             if col not in self.df.columns:
                 self.df[col] = 0.5
 
+    @classmethod
+    def from_index(
+        cls,
+        df: pd.DataFrame,
+        vectorizer: TfidfVectorizer,
+        doc_matrix,
+        skill_matrix: np.ndarray,
+        skill_matcher: SkillMatcher | None = None,
+    ) -> "RecruitingMVP":
+        """Assemble an MVP from prebuilt parts (e.g. a snapshot) without refitting."""
+        self = cls.__new__(cls)
+        self.skill_matcher = skill_matcher or DEFAULT_MATCHER
+        self.df = df
+        self.vectorizer = vectorizer
+        self.doc_matrix = doc_matrix
+        self.docs_since_fit = 0
+        self.skill_vocab = list(self.skill_matcher.canonical)
+        self.skill_index = {s: i for i, s in enumerate(self.skill_vocab)}
+        self.skill_matrix = skill_matrix
+        self.df["canonical_skills"] = [
+            {self.skill_vocab[i] for i in np.flatnonzero(row)} for row in skill_matrix
+        ]
+        self.terms = TermIndex.build(skill_matrix, self.skill_index, df["name"])
+        self.personality_cols = ["O","C","E","A","N"]
+        self.ingest_report = None
+        return self
+
+    @staticmethod
+    def _documents(df: pd.DataFrame) -> pd.Series:
+        return df["resume_text"].astype(str) + " " + df["skills"].astype(str)
+
+    def _replace(self, **changes: Any) -> "RecruitingMVP":
+        # Shallow copy: unchanged parts (vectorizer, matcher, ...) are shared;
+        # lazily derived indexes are dropped so they are rebuilt for the new rows.
+        new = copy.copy(self)
+        new.__dict__.pop("_retriever", None)
+        new.__dict__.pop("_exp_score", None)
+        if "df" in changes:
+            new.__dict__.pop("_store", None)
+        new.__dict__.update(changes)
+        return new
+
+    def retriever(self) -> Retriever:
+        """Stage-one candidate generator (SVD/IVF + skill postings), built on first use."""
+        retriever = self.__dict__.get("_retriever")
+        if retriever is None:
+            retriever = self.__dict__.setdefault("_retriever", Retriever(self))
+        return retriever
+
+    def store(self) -> CandidateStore:
+        """Columnar candidate store over ``df`` (id -> row index, numeric arrays), built on first use."""
+        store = self.__dict__.get("_store")
+        if store is None:
+            store = self.__dict__.setdefault("_store", CandidateStore(self.df))
+        return store
+
+    def exp_score(self) -> np.ndarray:
+        """Min-max scaled years of experience over the whole population."""
+        exp = self.__dict__.get("_exp_score")
+        if exp is None:
+            years = self.store().years.astype(float)
+            if years.size > 0 and years.max() > years.min():
+                exp = (years - years.min()) / (years.max() - years.min())
+            else:
+                exp = np.zeros_like(years)
+            self._exp_score = exp
+        return exp
+
+    def with_candidates(self, rows: pd.DataFrame) -> "RecruitingMVP":
+        """
+        Return a copy of the index with ``rows`` appended (any schema accepted by
+        load_candidate_dataframe). New documents are transformed with the current
+        vocabulary, so nothing is refitted; call ``refit`` to absorb vocabulary drift.
+        """
+        new_rows = normalise_candidate_frame(rows).fillna({"resume_text": "", "skills": ""})
+        ids = new_rows["id"]
+        positions = self.store().positions
+        clash = set(ids[ids.duplicated()]) | {cid for cid in ids if cid in positions}
+        if clash:
+            raise ValueError(f"Candidate ids already indexed: {sorted(clash)}")
+        text = self._documents(new_rows)
+        new_rows["canonical_skills"] = self.skill_matcher.extract_batch(text)
+        new_docs = self.vectorizer.transform(text.tolist())
+        new_skills = self._build_skill_matrix(new_rows["canonical_skills"])
+        new = self._replace(
+            df=pd.concat([self.df, new_rows[self.df.columns]], ignore_index=True),
+            doc_matrix=sp.vstack([self.doc_matrix, new_docs], format="csr"),
+            skill_matrix=np.vstack([self.skill_matrix, new_skills]),
+            terms=self.terms.append(new_skills, new_rows["name"]),
+            docs_since_fit=self.docs_since_fit + len(new_rows),
+        )
+        return new._carry_retriever(self, lambda semantic: semantic.append(new_docs))
+
+    def without_candidates(self, ids: List[str]) -> "RecruitingMVP":
+        """Return a copy of the index without the given candidate ids (KeyError if none match)."""
+        drop = self.df["id"].isin(set(ids)).to_numpy()
+        if not drop.any():
+            raise KeyError(ids)
+        keep = np.flatnonzero(~drop)
+        new = self._replace(
+            df=self.df.iloc[keep].reset_index(drop=True),
+            doc_matrix=self.doc_matrix[keep],
+            skill_matrix=self.skill_matrix[keep],
+            terms=self.terms.take(keep),
+        )
+        return new._carry_retriever(self, lambda semantic: semantic.take(keep))
+
+    def _carry_retriever(self, old: "RecruitingMVP", update) -> "RecruitingMVP":
+        # Keep a built semantic index across row edits (same vocabulary) instead of refitting SVD.
+        retriever = old.__dict__.get("_retriever")
+        if retriever is not None and retriever.semantic is not None:
+            self._retriever = Retriever(self, update(retriever.semantic))
+        return self
+
+    def refit(self) -> "RecruitingMVP":
+        """Return a copy with the TF-IDF vocabulary and idf refitted on the current rows."""
+        vectorizer = TfidfVectorizer(
+            min_df=self.vectorizer.min_df, max_df=self.vectorizer.max_df, ngram_range=self.vectorizer.ngram_range
+        )
+        doc_matrix = vectorizer.fit_transform(self._documents(self.df).tolist())
+        return self._replace(vectorizer=vectorizer, doc_matrix=doc_matrix, docs_since_fit=0)
+
+    def _build_skill_matrix(self, skill_sets: pd.Series) -> np.ndarray:
+        return self.skill_matcher.membership(skill_sets)
+
+    def _skill_mask(self, skills: List[str]) -> Tuple[np.ndarray, int]:
+        wanted = set(skills)
+        mask = np.zeros(len(self.skill_vocab), dtype=bool)
+        mask[[self.skill_index[s] for s in wanted if s in self.skill_index]] = True
+        return mask, len(wanted)
+
+    def _coverage(self, mask: np.ndarray, n_wanted: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        matrix = self.skill_matrix if rows is None else self.skill_matrix[rows]
+        hits = matrix[:, mask].sum(axis=1, dtype=np.int64)
+        return hits / float(max(1, n_wanted))
+
+    def skill_coverage(self, skills: List[str], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Fraction of ``skills`` each candidate (or each of ``rows``) has; unknown skills count as missing."""
+        return self._coverage(*self._skill_mask(skills), rows)
+
+    def skill_union(self, positions: List[int] | np.ndarray) -> set:
+        """Canonical skills held by at least one of the given candidates."""
+        mask = np.logical_or.reduce(self.skill_matrix[np.asarray(positions, dtype=np.int64)], axis=0)
+        return {self.skill_vocab[i] for i in np.flatnonzero(mask)}
+
     def _role_query_text(self, required: List[str], nice_to_have: List[str]) -> str:
         return " ".join(required) + " " + " ".join(nice_to_have)
 
-    def search_candidates(self, required: List[str], nice_to_have: List[str], top_k: int = 5) -> pd.DataFrame:
-        """Blend semantic similarity and skill coverage into a single score."""
-        query = self._role_query_text(required, nice_to_have)
-        qv = self.vectorizer.transform([query])
-        sem = cosine_similarity(qv, self.doc_matrix)[0]  # shape (n_candidates,)
+    def role_query(self, required: List[str], nice_to_have: List[str]) -> RoleQuery:
+        """Vectorise a skill query once for repeated ``score`` calls."""
+        required_mask, n_required = self._skill_mask(required)
+        nice_mask, n_nice = self._skill_mask(nice_to_have)
+        return RoleQuery(
+            required=list(required),
+            nice_to_have=list(nice_to_have),
+            vector=self.vectorizer.transform([self._role_query_text(required, nice_to_have)]),
+            required_mask=required_mask,
+            nice_mask=nice_mask,
+            n_required=n_required,
+            n_nice=n_nice,
+        )
+
+    def score(
+        self,
+        required: List[str],
+        nice_to_have: List[str],
+        candidates: Optional[np.ndarray] = None,
+        query: Optional[RoleQuery] = None,
+    ) -> CandidateScores:
+        """Score every candidate with NumPy arrays only (no frame copies).
+
+        With ``candidates`` (e.g. ``retriever().shortlist(...)``) only those rows are
+        scored; the arrays stay row-aligned, with zeros and a ``-inf`` final score elsewhere.
+        ``query`` is a prepared ``role_query(required, nice_to_have)``.
+        """
+        if query is None:
+            query = self.role_query(required, nice_to_have)
+        docs = self.doc_matrix if candidates is None else self.doc_matrix[candidates]
+        sem = cosine_similarity(query.vector, docs)[0] if docs.shape[0] else np.zeros(0)  # shape (n_candidates,)
 
         # Skill coverage
-        req_set = set(required)
-        nice_set = set(nice_to_have)
-        cov_req, cov_nice = [], []
-        for skills in self.df["canonical_skills"]:
-            s = set(skills) if isinstance(skills, (set, list)) else set()
-            cov_req.append(len(s & req_set) / max(1, len(req_set)))
-            cov_nice.append(len(s & nice_set) / max(1, len(nice_set)) if nice_set else 0.0)
-        cov_req = np.array(cov_req)
-        cov_nice = np.array(cov_nice)
+        cov_req = self._coverage(query.required_mask, query.n_required, candidates)
+        cov_nice = (
+            self._coverage(query.nice_mask, query.n_nice, candidates) if query.nice_to_have else np.zeros(len(cov_req))
+        )
 
         # Years experience (min-max scaled)
-        years = self.df["years_experience"].to_numpy(dtype=float)
-        if years.size > 0 and years.max() > years.min():
-            yrs = (years - years.min()) / (years.max() - years.min())
-        else:
-            yrs = np.zeros_like(years)
+        yrs = self.exp_score()
+        if candidates is not None:
+            yrs = yrs[candidates]
 
         # Final score (tunable weights)
         score = 0.55*sem + 0.25*cov_req + 0.10*cov_nice + 0.10*yrs
+        if candidates is None:
+            return CandidateScores(sem, cov_req, cov_nice, yrs, score)
+
+        def _spread(values: np.ndarray, fill: float = 0.0) -> np.ndarray:
+            full = np.full(len(self.df), fill)
+            full[candidates] = values
+            return full
 
-        out = self.df.copy()
-        out["sem_score"] = sem
-        out["coverage_required"] = cov_req
-        out["coverage_nice"] = cov_nice
-        out["exp_score"] = yrs
-        out["final_score"] = score
-        out = out.sort_values("final_score", ascending=False).reset_index(drop=True)
+        return CandidateScores(
+            _spread(sem), _spread(cov_req), _spread(cov_nice), _spread(yrs), _spread(score, -np.inf), candidates
+        )
+
+    def rows_for(self, positions: np.ndarray, scores: CandidateScores) -> pd.DataFrame:
+        """Materialise output rows (OUTPUT_COLUMNS) for the given row positions only."""
+        out = self.df.iloc[positions].reset_index(drop=True)
+        out["sem_score"] = scores.sem_score[positions]
+        out["coverage_required"] = scores.coverage_required[positions]
+        out["coverage_nice"] = scores.coverage_nice[positions]
+        out["exp_score"] = scores.exp_score[positions]
+        out["final_score"] = scores.final_score[positions]
         out["canonical_skills"] = out["canonical_skills"].apply(
             lambda value: sorted(value) if isinstance(value, (set, list, tuple)) else []
         )
         out["resume_text"] = out["resume_text"].astype(str)
-        return out[[
-            "id",
-            "name",
-            "final_score",
-            "sem_score",
-            "coverage_required",
-            "coverage_nice",
-            "years_experience",
-            "O",
-            "C",
-            "E",
-            "A",
-            "N",
-            "canonical_skills",
-            "resume_text",
-        ]].head(top_k)
+        return out[OUTPUT_COLUMNS]
+
+    def search_candidates(self, required: List[str], nice_to_have: List[str], top_k: Optional[int] = 5) -> pd.DataFrame:
+        """Blend semantic similarity and skill coverage into a single score.
+
+        Only the ``top_k`` winners are selected (partial sort) and materialised;
+        ``top_k=None`` ranks everyone.
+        """
+        scores = self.score(required, nice_to_have)
+        return self.rows_for(scores.top(top_k), scores)
 
+    def search_candidates_approx(
+        self, required: List[str], nice_to_have: List[str], top_k: Optional[int] = 5, shortlist_size: int = 300
+    ) -> pd.DataFrame:
+        """``search_candidates`` with the blended score applied to a retrieved shortlist only."""
+        candidates = self.retriever().shortlist(required, nice_to_have, shortlist_size)
+        scores = self.score(required, nice_to_have, candidates)
+        return self.rows_for(scores.top(top_k), scores)
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+"""Candidate generation for two-stage search.
+
+Stage one shortlists a few hundred rows from two sources: a dense embedding of the
+TF-IDF vectors (truncated SVD, searched with an IVF index on large corpora and
+blocked brute force otherwise) and exact skill postings from the candidate x skill
+matrix. Stage two is ``RecruitingMVP.score(..., candidates=shortlist)``, the usual
+blended score restricted to those rows.
+
+``TermIndex`` is the exact inverted index (canonical skill / name token -> rows)
+behind both the skill postings and the boolean must-have / any-of / exclude
+filters applied before scoring.
+
+Run ``python -m mvp.retrieval <resumes.csv>`` for a recall@k report against the
+exact path.
+"""
+
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pipeline import RecruitingMVP
+
+# Below this many rows an IVF index buys nothing over one blocked scan.
+IVF_MIN_ROWS = 20_000
+
+
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+
+def blocked_top_k(embeddings: np.ndarray, q: np.ndarray, k: int, rows: Optional[np.ndarray] = None, block: int = 8192) -> np.ndarray:
+    """Positions of the ``k`` highest dot products with ``q``, scanning ``block`` rows at a time."""
+    rows = np.arange(len(embeddings)) if rows is None else rows
+    best_pos = np.zeros(0, dtype=np.int64)
+    best_val = np.zeros(0, dtype=embeddings.dtype)
+    for start in range(0, len(rows), block):
+        chunk = rows[start : start + block]
+        vals = embeddings[chunk] @ q
+        pos = np.concatenate([best_pos, chunk])
+        vals = np.concatenate([best_val, vals])
+        if len(vals) > k:
+            keep = np.argpartition(-vals, k - 1)[:k]
+            pos, vals = pos[keep], vals[keep]
+        best_pos, best_val = pos, vals
+    return best_pos[np.argsort(-best_val, kind="stable")]
+
+
+@dataclass
+class SemanticIndex:
+    """Unit-norm SVD embeddings of the doc matrix, optionally bucketed by k-means (IVF)."""
+
+    projection: np.ndarray  # (terms, components): TF-IDF term -> embedding direction
+    embeddings: np.ndarray
+    centroids: Optional[np.ndarray] = None
+    lists: Optional[List[np.ndarray]] = None
+
+    @classmethod
+    def build(cls, doc_matrix: sp.spmatrix, n_components: int = 128, seed: int = 0) -> Optional["SemanticIndex"]:
+        n_rows, n_terms = doc_matrix.shape
+        n_components = min(n_components, n_rows - 1, n_terms - 1)
+        if n_components < 1:
+            return None
+        svd = TruncatedSVD(n_components=n_components, random_state=seed)
+        embeddings = _unit_rows(svd.fit_transform(doc_matrix)).astype(np.float32)
+        index = cls(np.ascontiguousarray(svd.components_.T, dtype=np.float32), embeddings)
+        if n_rows >= IVF_MIN_ROWS:
+            n_lists = int(np.sqrt(n_rows))
+            kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=seed, n_init=1, batch_size=4096)
+            labels = kmeans.fit_predict(embeddings)
+            index.centroids = _unit_rows(kmeans.cluster_centers_).astype(np.float32)
+            order = np.argsort(labels, kind="stable")
+            bounds = np.searchsorted(labels[order], np.arange(n_lists + 1))
+            index.lists = [order[bounds[i] : bounds[i + 1]] for i in range(n_lists)]
+        return index
+
+    def append(self, doc_rows: sp.spmatrix) -> "SemanticIndex":
+        """Copy with new documents projected into the existing space (no refit)."""
+        added = _unit_rows(np.asarray(sp.csr_matrix(doc_rows) @ self.projection, dtype=np.float32))
+        grown = SemanticIndex(self.projection, np.vstack([self.embeddings, added]), self.centroids, self.lists)
+        if self.centroids is not None:
+            labels = np.argmax(added @ self.centroids.T, axis=1)
+            rows = np.arange(len(self.embeddings), len(grown.embeddings))
+            grown.lists = [
+                np.concatenate([members, rows[labels == i]]) if (labels == i).any() else members
+                for i, members in enumerate(self.lists)
+            ]
+        return grown
+
+    def take(self, keep: np.ndarray) -> "SemanticIndex":
+        """Copy restricted to rows ``keep`` (renumbered in order)."""
+        kept = SemanticIndex(self.projection, self.embeddings[keep], self.centroids)
+        if self.lists is not None:
+            renumber = np.full(len(self.embeddings), -1, dtype=np.int64)
+            renumber[keep] = np.arange(len(keep))
+            kept.lists = [r[r >= 0] for r in (renumber[members] for members in self.lists)]
+        return kept
+
+    def embed(self, query_vector: sp.spmatrix) -> np.ndarray:
+        # Only the query's non-zero terms contribute, so gather those rows of the projection.
+        row = sp.csr_matrix(query_vector)
+        q = row.data.astype(np.float32) @ self.projection[row.indices]
+        norm = np.linalg.norm(q)
+        return q / norm if norm > 0 else q
+
+    def search(self, q: np.ndarray, k: int, nprobe: int = 16) -> np.ndarray:
+        """Approximate top-``k`` rows for the embedded query ``q``."""
+        if self.centroids is None:
+            return blocked_top_k(self.embeddings, q, k)
+        probes = np.argsort(-(self.centroids @ q))[:nprobe]
+        rows = np.concatenate([self.lists[i] for i in probes])
+        return blocked_top_k(self.embeddings, q, k, rows=rows)
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+def name_tokens(name: object) -> List[str]:
+    return _TOKEN.findall(str(name).lower()) if isinstance(name, str) else []
+
+
+class TermIndex:
+    """Inverted index from canonical skills and name tokens to row positions.
+
+    Both halves are CSC matrices (rows x terms), so a term's postings are one slice
+    and row edits are a vstack / row take.
+    """
+
+    def __init__(self, skills: sp.csc_matrix, skill_index: Dict[str, int], names: sp.csc_matrix, tokens: Dict[str, int]):
+        self.skills = skills
+        self.skill_index = skill_index
+        self.names = names
+        self.tokens = tokens
+
+    @classmethod
+    def build(cls, skill_matrix: np.ndarray, skill_index: Dict[str, int], names: Iterable[object]) -> "TermIndex":
+        tokens: Dict[str, int] = {}
+        return cls(
+            sp.csc_matrix(skill_matrix, dtype=np.int8),
+            skill_index,
+            cls._token_matrix([name_tokens(n) for n in names], tokens),
+            tokens,
+        )
+
+    @staticmethod
+    def _token_matrix(rows: List[List[str]], tokens: Dict[str, int]) -> sp.csc_matrix:
+        """Rows x tokens membership; new tokens are added to ``tokens`` in place."""
+        cols = [tokens.setdefault(tok, len(tokens)) for toks in rows for tok in dict.fromkeys(toks)]
+        indptr = np.cumsum([0] + [len(dict.fromkeys(toks)) for toks in rows])
+        data = np.ones(len(cols), dtype=np.int8)
+        return sp.csr_matrix((data, cols, indptr), shape=(len(rows), len(tokens))).tocsc()
+
+    def __len__(self) -> int:
+        return self.skills.shape[0]
+
+    @staticmethod
+    def _column(m: sp.csc_matrix, col: int) -> np.ndarray:
+        return m.indices[m.indptr[col] : m.indptr[col + 1]]
+
+    def skill_postings(self, skill: str) -> np.ndarray:
+        col = self.skill_index.get(skill)
+        return np.zeros(0, dtype=np.int32) if col is None else self._column(self.skills, col)
+
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted rows matching ``term``: a canonical skill, or else every token of a name."""
+        term = term.strip().lower()
+        if term in self.skill_index:
+            return np.sort(self.skill_postings(term))
+        rows: Optional[np.ndarray] = None
+        for tok in sorted(set(name_tokens(term)), key=lambda t: self._size(t)):
+            col = self.tokens.get(tok)
+            hits = np.zeros(0, dtype=np.int32) if col is None else np.sort(self._column(self.names, col))
+            rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+            if not len(rows):
+                break
+        return np.zeros(0, dtype=np.int32) if rows is None else rows
+
+    def matching(self, text: str) -> np.ndarray:
+        """Sorted rows whose canonical skills or name contain ``text``.
+
+        A skill matches when ``text`` is a substring of it; a name matches when every
+        token of ``text`` is a substring of one of its tokens. Only the skill and
+        token vocabularies are scanned, never the rows. Blank text matches nothing.
+        """
+        text = text.strip().lower()
+        empty = np.zeros(0, dtype=np.int32)
+        if not text:
+            return empty
+        hits = [self.skill_postings(skill) for skill in self.skill_index if text in skill]
+        rows: Optional[np.ndarray] = None
+        for part in set(name_tokens(text)):
+            cols = [col for tok, col in self.tokens.items() if part in tok]
+            found = np.unique(self.names[:, cols].indices) if cols else empty
+            rows = found if rows is None else np.intersect1d(rows, found, assume_unique=True)
+            if not len(rows):
+                break
+        if rows is not None:
+            hits.append(rows)
+        return np.unique(np.concatenate(hits)) if hits else empty
+
+    def _size(self, tok: str) -> int:
+        col = self.tokens.get(tok)
+        return 0 if col is None else int(self.names.indptr[col + 1] - self.names.indptr[col])
+
+    def select(
+        self, must_have: Iterable[str] = (), any_of: Iterable[str] = (), exclude: Iterable[str] = ()
+    ) -> Optional[np.ndarray]:
+        """Sorted rows passing the filters, or None when no filter is given.
+
+        Must-have lists are intersected smallest first, so a narrow filter costs
+        about the size of its postings rather than the roster.
+        """
+        must_have, any_of, exclude = [t for t in must_have if t], [t for t in any_of if t], [t for t in exclude if t]
+        if not (must_have or any_of or exclude):
+            return None
+        rows: Optional[np.ndarray] = None
+        for hits in sorted((self.postings(t) for t in must_have), key=len):
+            rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+            if not len(rows):
+                return rows
+        if any_of:
+            union = np.unique(np.concatenate([self.postings(t) for t in any_of]))
+            rows = union if rows is None else np.intersect1d(rows, union, assume_unique=True)
+        if rows is None:
+            rows = np.arange(len(self))
+        if exclude and len(rows):
+            rows = np.setdiff1d(rows, np.concatenate([self.postings(t) for t in exclude]), assume_unique=True)
+        return rows
+
+    def append(self, skill_rows: np.ndarray, names: Iterable[object]) -> "TermIndex":
+        tokens = dict(self.tokens)
+        added = self._token_matrix([name_tokens(n) for n in names], tokens)
+        old = self.names.tocsr()
+        old.resize((old.shape[0], len(tokens)))
+        return TermIndex(
+            sp.vstack([self.skills, sp.csc_matrix(skill_rows, dtype=np.int8)], format="csc"),
+            self.skill_index,
+            sp.vstack([old, added.tocsr()], format="csc"),
+            tokens,
+        )
+
+    def take(self, keep: np.ndarray) -> "TermIndex":
+        return TermIndex(self.skills[keep], self.skill_index, self.names[keep], self.tokens)
+
+
+class Retriever:
+    """Shortlists candidates for a role query; built lazily by ``RecruitingMVP.retriever``."""
+
+    def __init__(self, mvp: "RecruitingMVP", semantic: Optional[SemanticIndex] = None, n_components: int = 128):
+        self.mvp = mvp
+        self.semantic = semantic if semantic is not None else SemanticIndex.build(mvp.doc_matrix, n_components)
+
+    def skill_hits(self, skills: Iterable[str], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows (among ``rows`` when given) holding any of ``skills``, one entry per (row, skill) match."""
+        parts = [self.mvp.terms.skill_postings(s) for s in set(skills)]
+        hits = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+        return hits if rows is None else hits[np.isin(hits, rows)]
+
+    def shortlist(
+        self,
+        required: List[str],
+        nice_to_have: List[str],
+        k: int = 300,
+        nprobe: int = 16,
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Sorted row positions: ``k`` semantic neighbours plus up to ``k`` best skill matches.
+
+        ``rows`` (sorted positions, e.g. the rows passing boolean filters) restricts
+        the shortlist to those rows; their semantic neighbours come from a scan of
+        just those rows rather than the IVF lists.
+        """
+        pool = len(self.mvp.df) if rows is None else len(rows)
+        if pool <= 2 * k or self.semantic is None:
+            return np.arange(pool) if rows is None else rows
+        q = self.semantic.embed(self.mvp.vectorizer.transform([self.mvp._role_query_text(required, nice_to_have)]))
+        if rows is None:
+            semantic = self.semantic.search(q, k, nprobe)
+        else:
+            semantic = blocked_top_k(self.semantic.embeddings, q, k, rows=rows)
+
+        req_hits, nice_hits = self.skill_hits(required, rows), self.skill_hits(nice_to_have, rows)
+        if len(req_hits) or len(nice_hits):
+            matched, inverse = np.unique(np.concatenate([req_hits, nice_hits]), return_inverse=True)
+            # Same weights the blended score gives required / nice coverage.
+            weight = np.concatenate(
+                [
+                    np.full(len(req_hits), 0.25 / max(1, len(set(required)))),
+                    np.full(len(nice_hits), 0.10 / max(1, len(set(nice_to_have)))),
+                ]
+            )
+            gain = np.bincount(inverse, weights=weight, minlength=len(matched))
+            if len(matched) > k:
+                # Break the many coverage ties with the approximate semantic score.
+                gain += 0.55 * (self.semantic.embeddings[matched] @ q)
+                matched = matched[np.argpartition(-gain, k - 1)[:k]]
+            semantic = np.concatenate([semantic, matched])
+        return np.unique(semantic)
+
+
+def recall_report(
+    mvp: "RecruitingMVP",
+    queries: List[Dict[str, List[str]]],
+    k: int = 10,
+    shortlist_size: int = 300,
+) -> dict:
+    """recall@k of the two-stage path against exact scoring, with per-query latency."""
+    retriever = mvp.retriever()
+    recalls, exact_ms, approx_ms = [], [], []
+    for query in queries:
+        required, nice = query.get("required", []), query.get("nice_to_have", [])
+        t0 = time.perf_counter()
+        exact_scores = mvp.score(required, nice)
+        exact = exact_scores.top(k)
+        t1 = time.perf_counter()
+        approx = mvp.score(required, nice, candidates=retriever.shortlist(required, nice, shortlist_size)).top(k)
+        t2 = time.perf_counter()
+        # Rows tied with the exact k-th score are equally correct answers.
+        if len(exact):
+            hits = exact_scores.final_score[approx] >= exact_scores.final_score[exact[-1]]
+            recalls.append(int(hits.sum()) / len(exact))
+        exact_ms.append((t1 - t0) * 1000.0)
+        approx_ms.append((t2 - t1) * 1000.0)
+    return {
+        "rows": len(mvp.df),
+        "queries": len(queries),
+        "k": k,
+        "shortlistSize": shortlist_size,
+        "recallAtK": float(np.mean(recalls)) if recalls else 1.0,
+        "minRecallAtK": float(np.min(recalls)) if recalls else 1.0,
+        "exactMsMean": float(np.mean(exact_ms)) if exact_ms else 0.0,
+        "approxMsMean": float(np.mean(approx_ms)) if approx_ms else 0.0,
+    }
+
+
+def sample_queries(mvp: "RecruitingMVP", n: int = 50, seed: int = 0) -> List[Dict[str, List[str]]]:
+    """Role-like queries drawn from skills that actually occur in the corpus."""
+    rng = np.random.default_rng(seed)
+    counts = mvp.skill_matrix.sum(axis=0)
+    present = [mvp.skill_vocab[i] for i in np.flatnonzero(counts)]
+    if not present:
+        return []
+    queries = []
+    for _ in range(n):
+        picks = list(rng.choice(present, size=min(len(present), int(rng.integers(2, 6))), replace=False))
+        split = max(1, len(picks) - 2)
+        queries.append({"required": picks[:split], "nice_to_have": picks[split:]})
+    return queries
+
+
+if __name__ == "__main__":
+    from .pipeline import RecruitingMVP
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m mvp.retrieval <resumes.csv> [k] [shortlist_size]")
+    mvp = RecruitingMVP(sys.argv[1])
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    print(json.dumps(recall_report(mvp, sample_queries(mvp), k=k, shortlist_size=size), indent=2))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+"""Parallel ingestion of candidate exports split across several CSV files.
+
+HR data arrives as one export per business unit. ``load_candidate_shards`` takes a
+directory, a glob pattern or a list of files and hands each file (a shard) to a
+process pool, where it is normalised with the ``load_candidate_dataframe`` rules and
+its canonical skills and skill-membership rows are extracted. The parent only
+concatenates the shards and resolves employee ids that appear in more than one of
+them: the shard that sorts last wins, as a later export supersedes an earlier one.
+Ids repeated inside a single file are kept, as with a single-file load.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_utils import CANONICAL_COLUMNS, iter_candidate_chunks, load_candidate_dataframe
+from .skills import DEFAULT_MATCHER, SkillMatcher
+
+_GLOB_CHARS = frozenset("*?[")
+
+Source = str | Path | Iterable[str | Path]
+
+
+def is_sharded_source(source: Source) -> bool:
+    """True for a directory, a glob pattern or a list of files (not one plain file)."""
+    if isinstance(source, (str, Path)):
+        return Path(source).is_dir() or bool(_GLOB_CHARS & set(str(source)))
+    return True
+
+
+def candidate_sources(source: Source) -> List[Path]:
+    """The CSV files behind ``source``: a file, every ``*.csv`` in a directory
+    (sorted by name), the sorted matches of a glob pattern, or a list of those."""
+    if not isinstance(source, (str, Path)):
+        return [path for item in source for path in candidate_sources(item)]
+    path = Path(source)
+    if path.is_dir():
+        return sorted(path.glob("*.csv"))
+    if _GLOB_CHARS & set(str(source)):
+        return [Path(match) for match in sorted(glob.glob(str(source)))]
+    return [path]
+
+
+def extract_frame(frame: pd.DataFrame, matcher: SkillMatcher) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Add ``canonical_skills`` to a normalised frame; returns it with its membership rows."""
+    frame = frame.fillna({"resume_text": "", "skills": ""})
+    documents = frame["resume_text"].astype(str) + " " + frame["skills"].astype(str)
+    frame["canonical_skills"] = matcher.extract_batch(documents)
+    return frame, matcher.membership(frame["canonical_skills"])
+
+
+@dataclass
+class Shard:
+    """One normalised file, as returned by a worker."""
+
+    path: str
+    frame: pd.DataFrame
+    skill_matrix: Optional[np.ndarray]
+    seconds: float
+    cpu_seconds: float
+    pid: int
+
+
+def _load_shard(
+    path: str, matcher: Optional[SkillMatcher], chunksize: Optional[int], compact: bool
+) -> Shard:
+    started, cpu_started = time.perf_counter(), time.process_time()
+    if chunksize:
+        chunks = list(iter_candidate_chunks(path, chunksize, compact))
+        frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=CANONICAL_COLUMNS)
+    else:
+        frame = load_candidate_dataframe(path, compact=compact)
+    skill_matrix = None
+    if matcher is not None:
+        frame, skill_matrix = extract_frame(frame, matcher)
+    seconds, cpu_seconds = time.perf_counter() - started, time.process_time() - cpu_started
+    return Shard(path, frame, skill_matrix, seconds, cpu_seconds, os.getpid())
+
+
+@dataclass
+class ShardedCandidates:
+    """Merged shards plus what it took to load them."""
+
+    df: pd.DataFrame
+    skill_matrix: Optional[np.ndarray]  # None when skills were not extracted
+    shards: List[dict]  # per file: path, rows, duplicatesDropped, seconds, cpuSeconds, pid
+    workers: int
+    seconds: float  # wall clock, pool start-up included
+
+    def report(self) -> Dict[str, object]:
+        """Throughput summary; ``rowsPerCoreSecond`` divides by the CPU time spent in shards."""
+        busy = sum(shard["cpuSeconds"] for shard in self.shards)
+        rows = len(self.df)
+        return {
+            "files": len(self.shards),
+            "rows": rows,
+            "duplicatesDropped": sum(shard["duplicatesDropped"] for shard in self.shards),
+            "workers": self.workers,
+            "seconds": self.seconds,
+            "rowsPerSecond": rows / self.seconds if self.seconds else 0.0,
+            "rowsPerCoreSecond": rows / busy if busy else 0.0,
+            "parallelism": busy / self.seconds if self.seconds else 0.0,
+            "shards": self.shards,
+        }
+
+
+def load_candidate_shards(
+    source: Source,
+    matcher: Optional[SkillMatcher] = DEFAULT_MATCHER,
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    compact: bool = False,
+) -> ShardedCandidates:
+    """Normalise every file of ``source`` in parallel and merge them into one frame.
+
+    ``matcher=None`` skips skill extraction (e.g. for the KG, which links the raw
+    ``skills`` column). ``workers`` defaults to the CPU count and is capped at the
+    number of files; with one worker the shards load in this process. ``chunksize``
+    and ``compact`` are passed on to the loader.
+    """
+    started = time.perf_counter()
+    paths = [str(path) for path in candidate_sources(source)]
+    if not paths:
+        raise ValueError(f"No candidate CSV files found for {source!r}")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    args = ([matcher] * len(paths), [chunksize] * len(paths), [compact] * len(paths))
+    if workers == 1:
+        shards = list(map(_load_shard, paths, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(_load_shard, paths, *args))
+
+    frames = [shard.frame for shard in shards]
+    owner = np.repeat(np.arange(len(shards)), [len(frame) for frame in frames])
+    df = pd.concat(frames, ignore_index=True)
+    # An id present in several shards keeps only the rows of the last one. Rows
+    # without an id are not duplicates of each other and are always kept.
+    ids = df["id"]
+    has_id = (ids.notna() & (ids != "")).to_numpy()
+    latest = pd.Series(owner).groupby(ids.to_numpy()).transform("max").to_numpy()
+    keep = ~has_id | (owner == latest)
+    dropped = np.bincount(owner[~keep], minlength=len(shards))
+    skill_matrix = None
+    if matcher is not None:
+        skill_matrix = np.concatenate([shard.skill_matrix for shard in shards])[keep]
+    if not keep.all():
+        df = df[keep].reset_index(drop=True)
+
+    report = [
+        {
+            "path": shard.path,
+            "rows": len(shard.frame) - int(dropped[i]),
+            "duplicatesDropped": int(dropped[i]),
+            "seconds": shard.seconds,
+            "cpuSeconds": shard.cpu_seconds,
+            "pid": shard.pid,
+        }
+        for i, shard in enumerate(shards)
+    ]
+    return ShardedCandidates(df, skill_matrix, report, workers, time.perf_counter() - started)
@@ -1,6 +1,11 @@
 from __future__ import annotations
+import csv
+import json
 import re
-from typing import List, Set, Dict
+from pathlib import Path
+from typing import Iterable, List, Set, Dict, Tuple
+import numpy as np
+import pandas as pd
 
 # Tiny taxonomy: canonical_skill -> synonyms/keywords
 SKILL_TAXONOMY: Dict[str, List[str]] = {
@@ -21,13 +26,127 @@ CANONICAL = list(SKILL_TAXONOMY.keys())
 def normalize_text(s: str) -> str:
     return re.sub(r"[^a-z0-9+.\- ]", " ", s.lower())
 
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation for ``terms`` factored into a prefix trie (longest match first)."""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def _render(node: dict) -> str:
+        branches = [re.escape(ch) + _render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return _render(trie)
+
+class SkillMatcher:
+    """
+    Find every canonical skill of a taxonomy in one regex pass over the text.
+
+    Same results as searching each synonym between word boundaries in the
+    normalised text. The compiled pattern reports the longest synonym starting at
+    each word boundary; shorter synonyms that are prefixes of it (and map to other
+    skills) are confirmed individually at that position.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        _check_synonyms(taxonomy)
+        self.taxonomy = {canon: list(words) for canon, words in taxonomy.items()}
+        self.canonical: List[str] = list(self.taxonomy)
+        self.canonical_index: Dict[str, int] = {canon: i for i, canon in enumerate(self.canonical)}
+        self._term_canons: Dict[str, Tuple[str, ...]] = {}
+        for canon, words in self.taxonomy.items():
+            for w in words:
+                if canon not in self._term_canons.get(w, ()):
+                    self._term_canons[w] = self._term_canons.get(w, ()) + (canon,)
+        terms = sorted(self._term_canons)
+        self._pattern = re.compile(r"\b(?=(" + _trie_pattern(terms) + r")\b)") if terms else None
+        self._shadows: Dict[str, List[Tuple[re.Pattern, Tuple[str, ...]]]] = {}
+        for term in terms:
+            shorter = [
+                (re.compile(re.escape(u) + r"\b"), self._term_canons[u])
+                for u in terms
+                if len(u) < len(term) and term.startswith(u)
+                and not set(self._term_canons[u]) <= set(self._term_canons[term])
+            ]
+            if shorter:
+                self._shadows[term] = shorter
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "SkillMatcher":
+        return cls(load_taxonomy(path))
+
+    def extract(self, text: str) -> Set[str]:
+        """Return the set of canonical skills mentioned in the text."""
+        found: Set[str] = set()
+        if self._pattern is None:
+            return found
+        t = normalize_text(text or "")
+        for m in self._pattern.finditer(t):
+            term = m.group(1)
+            found.update(self._term_canons[term])
+            for shadow, canons in self._shadows.get(term, ()):
+                if not found.issuperset(canons) and shadow.match(t, m.start()):
+                    found.update(canons)
+        return found
+
+    def extract_batch(self, texts: pd.Series) -> pd.Series:
+        """Vector of skill sets for a whole Series, keeping its index."""
+        return pd.Series([self.extract(t) for t in texts.astype(str)], index=texts.index, dtype=object)
+
+    def membership(self, skill_sets: Iterable[object]) -> np.ndarray:
+        """Boolean rows x ``canonical`` matrix for skill sets (non-collections give empty rows)."""
+        skill_sets = list(skill_sets)
+        matrix = np.zeros((len(skill_sets), len(self.canonical)), dtype=bool)
+        for row, skills in enumerate(skill_sets):
+            if isinstance(skills, (set, list, tuple)):
+                cols = [self.canonical_index[s] for s in skills if s in self.canonical_index]
+                matrix[row, cols] = True
+        return matrix
+
+def _check_synonyms(taxonomy: Dict[str, List[str]]) -> None:
+    # An empty synonym would match at every word boundary, i.e. nearly every text.
+    empty = sorted(canon for canon, words in taxonomy.items() if any(not str(w).strip() for w in words))
+    if empty:
+        raise ValueError(f"Empty synonyms for skills: {empty}")
+
+def load_taxonomy(path: str | Path) -> Dict[str, List[str]]:
+    """
+    Load a taxonomy from JSON (``{"skill": ["synonym", ...]}``) or from a CSV with
+    ``skill`` and ``synonym`` columns (one row per synonym, file order kept). A CSV
+    row with an empty synonym only declares the skill; an empty synonym in JSON is
+    a ValueError.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        taxonomy: Dict[str, List[str]] = {}
+        with path.open(newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                canon = (row.get("skill") or "").strip()
+                synonym = (row.get("synonym") or "").strip()
+                if canon:
+                    words = taxonomy.setdefault(canon, [])
+                    if synonym:
+                        words.append(synonym)
+        return taxonomy
+    data = json.loads(path.read_text(encoding="utf-8"))
+    taxonomy = {str(canon): [str(w) for w in words] for canon, words in data.items()}
+    _check_synonyms(taxonomy)
+    return taxonomy
+
+DEFAULT_MATCHER = SkillMatcher(SKILL_TAXONOMY)
+
 def extract_skills(text: str) -> Set[str]:
     """Return a set of canonical skills mentioned in the text via keyword match."""
-    t = normalize_text(text or "")
-    found = set()
-    for canon, words in SKILL_TAXONOMY.items():
-        for w in words:
-            if re.search(rf"\b{re.escape(w)}\b", t):
-                found.add(canon)
-                break
-    return found
+    return DEFAULT_MATCHER.extract(text)
+
+def extract_skills_batch(texts: pd.Series, matcher: SkillMatcher | None = None) -> pd.Series:
+    """Extract canonical skills for every text of a Series in one call."""
+    return (matcher or DEFAULT_MATCHER).extract_batch(texts)
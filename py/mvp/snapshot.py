@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+"""On-disk index snapshots so API workers can start without refitting anything.
+
+A snapshot is a directory of ``.npy`` arrays plus a ``manifest.json``. It holds the
+normalised candidate columns, the TF-IDF vocabulary and idf weights, the sparse doc
+matrix, the candidate x skill matrix, the compiled knowledge graph (with its adjacency and the PPR vector of
+every role). Directories are named after a content hash of the input files, so a
+changed CSV simply maps to a new snapshot.
+
+Arrays are memory-mapped read-only on load, so every uvicorn worker attached to the
+same snapshot shares one copy of them through the page cache instead of holding a
+private copy; ``memory_report`` shows which arrays are mapped in a given process.
+
+Candidates added or deleted after the build go to a ``Journal`` kept next to the
+arrays, so the changes outlive the process and every worker replays the same ones.
+"""
+
+import hashlib
+import json
+import mmap as _mmap
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .kg import CompiledKG
+from .pipeline import RecruitingMVP
+from .skills import SkillMatcher
+
+try:  # POSIX only; elsewhere concurrent cold starts just build in parallel.
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+SNAPSHOT_FORMAT = 2
+PPR_ALPHA = 0.15
+MANIFEST = "manifest.json"
+JOURNAL = "journal.jsonl"
+
+_STRING_COLUMNS = ["id", "name", "resume_text", "skills"]
+_NUMERIC_COLUMNS = ["years_experience", "O", "C", "E", "A", "N"]
+_KG_MATRICES = ["role_skill", "team_skill", "cand_skill", "cand_team"]
+_KG_NODES = ["roles", "skills", "teams", "candidates"]
+
+
+def content_hash(paths: Iterable[str | Path], *extra: str) -> str:
+    """SHA-256 over the snapshot format, the input files' bytes and any extra tags."""
+    digest = hashlib.sha256(f"snapshot-format:{SNAPSHOT_FORMAT}".encode())
+    for path in paths:
+        path = Path(path)
+        digest.update(path.name.encode())
+        with path.open("rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(block)
+    for tag in extra:
+        digest.update(tag.encode())
+    return digest.hexdigest()[:32]
+
+
+# ------------------------------
+# Array helpers
+# ------------------------------
+def _save_strings(directory: Path, name: str, values: Iterable[str]) -> None:
+    encoded = [str(v).encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    (directory / f"{name}.bin").write_bytes(b"".join(encoded))
+    np.save(directory / f"{name}.offsets.npy", offsets)
+
+
+def _load_strings(directory: Path, name: str) -> List[str]:
+    blob = (directory / f"{name}.bin").read_bytes()
+    offsets = np.load(directory / f"{name}.offsets.npy")
+    return [blob[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _save_csr(directory: Path, name: str, matrix: sp.spmatrix) -> List[int]:
+    matrix = sp.csr_matrix(matrix)
+    np.save(directory / f"{name}.data.npy", matrix.data)
+    np.save(directory / f"{name}.indices.npy", matrix.indices)
+    np.save(directory / f"{name}.indptr.npy", matrix.indptr)
+    return list(matrix.shape)
+
+
+def _load_csr(directory: Path, name: str, shape: List[int], mmap_mode: str | None) -> sp.csr_matrix:
+    parts = [np.load(directory / f"{name}.{p}.npy", mmap_mode=mmap_mode) for p in ("data", "indices", "indptr")]
+    return sp.csr_matrix(tuple(parts), shape=tuple(shape), copy=False)
+
+
+# ------------------------------
+# Write / read
+# ------------------------------
+def write_snapshot(directory: str | Path, mvp: RecruitingMVP, kg: CompiledKG, key: str) -> Path:
+    """Serialise an index into ``directory`` (created; must not exist yet)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True)
+    df = mvp.df
+
+    for column in _STRING_COLUMNS:
+        _save_strings(directory, f"col.{column}", df[column].astype(str))
+    for column in _NUMERIC_COLUMNS:
+        # float32 columns (compact loads) stay float32.
+        dtype = np.float32 if df[column].dtype == np.float32 else np.float64
+        np.save(directory / f"col.{column}.npy", df[column].to_numpy(dtype=dtype))
+
+    vocab = mvp.vectorizer.vocabulary_
+    terms = [""] * len(vocab)
+    for term, idx in vocab.items():
+        terms[idx] = term
+    _save_strings(directory, "tfidf.terms", terms)
+    np.save(directory / "tfidf.idf.npy", mvp.vectorizer.idf_)
+    shapes: Dict[str, List[int]] = {"doc_matrix": _save_csr(directory, "doc_matrix", mvp.doc_matrix)}
+    np.save(directory / "skill_matrix.npy", mvp.skill_matrix)
+
+    for name in _KG_NODES:
+        _save_strings(directory, f"kg.{name}", getattr(kg, name))
+    for name in _KG_MATRICES:
+        shapes[f"kg.{name}"] = _save_csr(directory, f"kg.{name}", getattr(kg, name))
+    shapes["kg.adjacency"] = _save_csr(directory, "kg.adjacency", kg.adjacency())
+    for i, role in enumerate(kg.roles):
+        np.save(directory / f"kg.ppr.{i}.npy", kg.pagerank(role, PPR_ALPHA))
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "key": key,
+        "created": time.time(),
+        "rows": len(df),
+        "ppr_alpha": PPR_ALPHA,
+        "shapes": shapes,
+        "vectorizer": {
+            "min_df": mvp.vectorizer.min_df,
+            "max_df": mvp.vectorizer.max_df,
+            "ngram_range": list(mvp.vectorizer.ngram_range),
+        },
+        "taxonomy": mvp.skill_matcher.taxonomy,
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest))
+    return directory
+
+
+def read_snapshot(directory: str | Path, mmap: bool = True) -> Tuple[RecruitingMVP, CompiledKG]:
+    """Rebuild the MVP and compiled KG from a snapshot, memory-mapping the arrays."""
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST).read_text())
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r} in {directory}")
+    mmap_mode = "r" if mmap else None
+    shapes = manifest["shapes"]
+
+    # Numeric columns stay views of the mapped arrays (copy=False); the string
+    # columns are decoded into this process's memory.
+    data = {column: _load_strings(directory, f"col.{column}") for column in _STRING_COLUMNS}
+    for column in _NUMERIC_COLUMNS:
+        data[column] = np.load(directory / f"col.{column}.npy", mmap_mode=mmap_mode)
+    df = pd.DataFrame(data, copy=False)
+
+    params = manifest["vectorizer"]
+    vectorizer = TfidfVectorizer(min_df=params["min_df"], max_df=params["max_df"], ngram_range=tuple(params["ngram_range"]))
+    vectorizer.vocabulary_ = {term: i for i, term in enumerate(_load_strings(directory, "tfidf.terms"))}
+    vectorizer.idf_ = np.load(directory / "tfidf.idf.npy")
+
+    mvp = RecruitingMVP.from_index(
+        df,
+        vectorizer=vectorizer,
+        doc_matrix=_load_csr(directory, "doc_matrix", shapes["doc_matrix"], mmap_mode),
+        skill_matrix=np.load(directory / "skill_matrix.npy", mmap_mode=mmap_mode),
+        skill_matcher=SkillMatcher(manifest["taxonomy"]),
+    )
+    kg = CompiledKG(
+        **{name: _load_strings(directory, f"kg.{name}") for name in _KG_NODES},
+        **{name: _load_csr(directory, f"kg.{name}", shapes[f"kg.{name}"], mmap_mode) for name in _KG_MATRICES},
+    )
+    kg.attach_precomputed(
+        adjacency=_load_csr(directory, "kg.adjacency", shapes["kg.adjacency"], mmap_mode),
+        pagerank={
+            (role, manifest["ppr_alpha"]): np.load(directory / f"kg.ppr.{i}.npy", mmap_mode=mmap_mode)
+            for i, role in enumerate(kg.roles)
+        },
+    )
+    return mvp, kg
+
+
+def load_or_build(
+    root: str | Path,
+    key: str,
+    build: Callable[[], Tuple[RecruitingMVP, CompiledKG]],
+    keep: int = 2,
+) -> Tuple[RecruitingMVP, CompiledKG]:
+    """Load the snapshot for ``key`` under ``root``, building and writing it first if missing.
+
+    Writes go to a private temp directory renamed into place, so concurrent workers
+    racing on a cold start never observe a half-written snapshot. Older snapshots
+    beyond ``keep`` are pruned.
+    """
+    root = Path(root)
+    target = root / key
+    if not (target / MANIFEST).exists():
+        root.mkdir(parents=True, exist_ok=True)
+        with _build_lock(root):
+            # Re-check: the worker holding the lock before us may have built it.
+            if not (target / MANIFEST).exists():
+                mvp, kg = build()
+                tmp = root / f".{key}.tmp-{os.getpid()}"
+                shutil.rmtree(tmp, ignore_errors=True)
+                write_snapshot(tmp, mvp, kg, key)
+                try:
+                    os.rename(tmp, target)
+                except OSError:
+                    # Another process published the same snapshot first.
+                    shutil.rmtree(tmp, ignore_errors=True)
+                _prune(root, keep)
+    return read_snapshot(target)
+
+
+class Journal:
+    """Append-only log of candidate changes made on top of one snapshot.
+
+    Entries are JSON lines appended under an exclusive file lock, so workers sharing
+    the snapshot see the same changes in the same order. ``offset`` is how far this
+    process has read; ``read`` returns only what was appended since.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.path = Path(directory) / JOURNAL
+        self.offset = 0
+
+    def read(self) -> List[dict]:
+        """Entries appended since the last read (a line still being written is left for later)."""
+        try:
+            with self.path.open("rb") as fh:
+                fh.seek(self.offset)
+                data = fh.read()
+        except FileNotFoundError:
+            return []
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+
+    def append(self, entry: dict) -> None:
+        """Write one entry; call while holding ``locked()`` after reading up to the end."""
+        line = json.dumps(entry).encode("utf-8") + b"\n"
+        with self.path.open("ab") as fh:
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.offset += len(line)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Exclusive access across processes, for a read-validate-append sequence."""
+        with _file_lock(self.path.with_suffix(".lock")):
+            yield
+
+
+@contextmanager
+def _build_lock(root: Path) -> Iterator[None]:
+    """Serialise snapshot builds across processes sharing ``root``."""
+    with _file_lock(root / ".build.lock"):
+        yield
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(path, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _prune(root: Path, keep: int) -> None:
+    snapshots = sorted(
+        (p for p in root.iterdir() if p.is_dir() and (p / MANIFEST).exists()),
+        key=lambda p: (p / MANIFEST).stat().st_mtime,
+        reverse=True,
+    )
+    for stale in snapshots[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+# ------------------------------
+# Footprint report
+# ------------------------------
+def _is_mapped(array: object) -> bool:
+    while array is not None:
+        if isinstance(array, (np.memmap, _mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def _array_entry(arrays: Dict[str, np.ndarray]) -> Dict[str, object]:
+    total = sum(int(a.nbytes) for a in arrays.values())
+    mapped = sum(int(a.nbytes) for a in arrays.values() if _is_mapped(a))
+    return {"bytes": total, "sharedBytes": mapped, "privateBytes": total - mapped}
+
+
+def _frame_entry(df: pd.DataFrame) -> Dict[str, object]:
+    """Bytes of the candidate frame; only numeric columns can be views of mapped arrays."""
+    usage = df.memory_usage(index=False, deep=True)
+    total = int(usage.sum())
+    mapped = sum(
+        int(usage[column])
+        for column in df.columns
+        if df[column].dtype.kind in "biuf" and _is_mapped(df[column].to_numpy())
+    )
+    return {"bytes": total, "sharedBytes": mapped, "privateBytes": total - mapped}
+
+
+def _csr_arrays(matrix: sp.spmatrix) -> Dict[str, np.ndarray]:
+    return {"data": matrix.data, "indices": matrix.indices, "indptr": matrix.indptr}
+
+
+def _process_memory() -> Dict[str, int]:
+    """Resident memory split by backing (Linux /proc; empty elsewhere)."""
+    fields = {"VmRSS": "rss", "RssAnon": "rssAnon", "RssFile": "rssFile", "RssShmem": "rssShmem"}
+    out: Dict[str, int] = {}
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    out[fields[name]] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return out
+
+
+def memory_report(mvp: RecruitingMVP, kg: CompiledKG) -> Dict[str, object]:
+    """Per-process view of where the index lives: shared (mapped) vs private bytes."""
+    store = mvp.store()
+    arrays = {
+        # Strings (ids, names, resumes, skills) are decoded per process, so most of
+        # the frame is private; its numeric columns map the snapshot.
+        "frame": _frame_entry(mvp.df),
+        "candidateStore": _array_entry({"years": store.years, "personality": store.personality}),
+        "docMatrix": _array_entry(_csr_arrays(mvp.doc_matrix)),
+        "skillMatrix": _array_entry({"matrix": mvp.skill_matrix}),
+        "kgEdges": _array_entry({
+            f"{name}.{part}": arr
+            for name in _KG_MATRICES
+            for part, arr in _csr_arrays(getattr(kg, name)).items()
+        }),
+        "kgAdjacency": _array_entry(_csr_arrays(kg.adjacency())),
+        "pprVectors": _array_entry({f"{role}": kg.pagerank(role, PPR_ALPHA) for role in kg.roles}),
+    }
+    shared = sum(entry["sharedBytes"] for entry in arrays.values())
+    private = sum(entry["privateBytes"] for entry in arrays.values())
+    return {
+        "pid": os.getpid(),
+        "process": _process_memory(),
+        "arrays": arrays,
+        "sharedBytes": shared,
+        "privateBytes": private,
+        "vocabularyTerms": len(mvp.vectorizer.vocabulary_),
+        "rows": len(mvp.df),
+    }
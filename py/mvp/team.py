@@ -1,9 +1,12 @@
 from __future__ import annotations
+import heapq
+import time
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from itertools import combinations
+from math import comb
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import numpy as np
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
 
 BIG5 = ["O","C","E","A","N"]
 
@@ -23,6 +26,116 @@ def jaccard(a: set, b: set) -> float:
         return 1.0
     return len(a & b) / max(1, len(a | b))
 
+def _team_skill_set(raw) -> set:
+    if isinstance(raw, str):
+        return set(raw.split("|"))
+    if isinstance(raw, (list, tuple, set, frozenset, np.ndarray)):
+        return set(raw)
+    return set()
+
+
+@dataclass
+class Placement:
+    """Candidate x team placement scores; every matrix is (candidates, teams)."""
+
+    team_ids: np.ndarray
+    team_names: np.ndarray
+    coverage: np.ndarray
+    personality: np.ndarray
+    diversity: np.ndarray
+    final: np.ndarray
+
+    def top(self, n: int) -> np.ndarray:
+        """Team columns of the ``n`` best placements per candidate, best first."""
+        n = min(n, self.final.shape[1])
+        if n <= 0:
+            return np.empty((self.final.shape[0], 0), dtype=np.int64)
+        cols = np.argpartition(-self.final, n - 1, axis=1)[:, :n] if n < self.final.shape[1] else np.tile(
+            np.arange(self.final.shape[1]), (self.final.shape[0], 1)
+        )
+        picked = np.take_along_axis(self.final, cols, axis=1)
+        # Order by score, then by team column so ties are deterministic.
+        order = np.lexsort((cols, -picked), axis=1)
+        return np.take_along_axis(cols, order, axis=1)
+
+    def rows(self, m: int, cols: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        cols = range(self.final.shape[1]) if cols is None else cols
+        return [
+            {
+                "team_id": self.team_ids[t],
+                "team_name": self.team_names[t],
+                "coverage_gaps": round(float(self.coverage[m, t]), 3),
+                "personality_fit": round(float(self.personality[m, t]), 3),
+                "diversity_bonus": round(float(self.diversity[m, t]), 3),
+                "final_score": round(float(self.final[m, t]), 3),
+            }
+            for t in cols
+        ]
+
+
+class TeamIndex:
+    """Teams parsed once into skill bitsets and unit Big-5 vectors for batch placement."""
+
+    def __init__(self, teams_df: pd.DataFrame):
+        self.team_ids = teams_df["team_id"].to_numpy()
+        self.team_names = teams_df["team_name"].to_numpy()
+        skill_sets = [_team_skill_set(raw) for raw in teams_df["team_skills"]]
+        self.vocab: List[str] = sorted(set().union(*skill_sets)) if skill_sets else []
+        self.skill_index = {s: i for i, s in enumerate(self.vocab)}
+        self.skills = np.zeros((len(skill_sets), len(self.vocab)), dtype=bool)
+        for row, skills in enumerate(skill_sets):
+            self.skills[row, [self.skill_index[s] for s in skills]] = True
+        self.big5 = _unit_rows(teams_df[BIG5].to_numpy(dtype=float))
+
+    def __len__(self) -> int:
+        return len(self.team_ids)
+
+    def place(self, candidate_skills: List[Iterable[str]], big5: np.ndarray, required_skills: List[str]) -> Placement:
+        """Score every candidate against every team (see ``recommend_team``)."""
+        req = set(required_skills)
+        # Required skills no team has still count as gaps, so give them columns too.
+        vocab = self.vocab + sorted(req - set(self.skill_index))
+        index = {s: i for i, s in enumerate(vocab)}
+        teams = np.zeros((len(self), len(vocab)), dtype=np.float64)
+        teams[:, : len(self.vocab)] = self.skills
+        req_mask = np.zeros(len(vocab), dtype=np.float64)
+        req_mask[[index[s] for s in req]] = 1.0
+
+        cands = np.zeros((len(candidate_skills), len(vocab)), dtype=np.float64)
+        for row, skills in enumerate(candidate_skills):
+            cols = [index[s] for s in set(skills or []) if s in index]
+            cands[row, cols] = 1.0
+
+        gaps = req_mask * (1.0 - teams)  # (T, V): required skills each team lacks
+        n_gaps = gaps.sum(axis=1)
+        coverage = np.where(n_gaps > 0, (cands @ gaps.T) / np.maximum(n_gaps, 1.0), 1.0)
+        personality = _unit_rows(np.asarray(big5, dtype=float).reshape(-1, len(BIG5))) @ self.big5.T
+        diversity = 1.0 - (cands @ teams.T) / max(1, len(req))
+        final = 0.55 * coverage + 0.35 * personality + 0.10 * diversity
+        return Placement(self.team_ids, self.team_names, coverage, personality, diversity, final)
+
+
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.sqrt(np.einsum("ij,ij->i", m, m))[:, None]
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+
+def place_candidates(candidates_df: pd.DataFrame, teams: pd.DataFrame | TeamIndex, required_skills: List[str]) -> Placement:
+    """M x T placement scores for every candidate row (needs ``canonical_skills`` and Big-5 columns)."""
+    index = teams if isinstance(teams, TeamIndex) else TeamIndex(teams)
+    return index.place(list(candidates_df["canonical_skills"]), candidates_df[BIG5].to_numpy(dtype=float), required_skills)
+
+
+def top_placements(placement: Placement, n: int = 3, candidate_ids: Optional[Iterable[Any]] = None) -> pd.DataFrame:
+    """Long table of each candidate's ``n`` best teams, ranked from 1."""
+    ids = list(candidate_ids) if candidate_ids is not None else list(range(placement.final.shape[0]))
+    rows = []
+    for m, cols in enumerate(placement.top(n)):
+        for rank, row in enumerate(placement.rows(m, cols), start=1):
+            rows.append({"candidate_id": ids[m], "rank": rank, **row})
+    return pd.DataFrame(rows)
+
+
 def recommend_team(candidate_row: pd.Series, teams_df: pd.DataFrame, required_skills: List[str]) -> pd.DataFrame:
     """
     Score each team on:
@@ -30,33 +143,227 @@ def recommend_team(candidate_row: pd.Series, teams_df: pd.DataFrame, required_sk
     - Personality fit: cosine similarity between candidate Big5 and team centroid
     - Balance factor: prefer teams not already saturated with candidate's dominant skills
     """
-    cand_skills = set(candidate_row["canonical_skills"] or [])
-    req = set(required_skills)
-    cand_vec = candidate_row[["O","C","E","A","N"]].to_numpy(dtype=float).reshape(1,-1)
-
-    rows = []
-    for _, t in teams_df.iterrows():
-        team_skill_set = set((t["team_skills"] or "").split("|")) if isinstance(t["team_skills"], str) else set(t["team_skills"] or [])
-        # Team gaps relative to required skills
-        team_gaps = req - team_skill_set
-        coverage = len(cand_skills & team_gaps) / max(1,len(team_gaps)) if team_gaps else 1.0
-
-        team_vec = t[["O","C","E","A","N"]].to_numpy(dtype=float).reshape(1,-1)
-        personality = float(cosine_similarity(cand_vec, team_vec)[0,0])
-
-        # Diversity bonus: avoid too-high overlap with team's existing skills
-        overlap = len(cand_skills & team_skill_set) / max(1,len(req))
-        diversity = 1.0 - overlap  # prefer bringing new skills
-
-        score = 0.55*coverage + 0.35*personality + 0.10*diversity
-
-        rows.append({
-            "team_id": t["team_id"],
-            "team_name": t["team_name"],
-            "coverage_gaps": round(coverage,3),
-            "personality_fit": round(personality,3),
-            "diversity_bonus": round(diversity,3),
-            "final_score": round(score,3)
-        })
-    out = pd.DataFrame(rows).sort_values("final_score", ascending=False).reset_index(drop=True)
+    placement = TeamIndex(teams_df).place(
+        [candidate_row["canonical_skills"] or []], candidate_row[BIG5].to_numpy(dtype=float), required_skills
+    )
+    out = pd.DataFrame(placement.rows(0)).sort_values("final_score", ascending=False).reset_index(drop=True)
     return out
+
+
+# ---------------------------------------------------------------------------
+# Team formation: pick k candidates maximising
+#   0.7 * mean(score) + 0.3 * required-skill coverage [+ w * personality diversity]
+# (the same team score /team/evaluate reports when w == 0).
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TeamOption:
+    members: Tuple[int, ...]
+    objective: float
+    avg_score: float
+    coverage: float
+    diversity: float
+
+
+@dataclass
+class TeamProblem:
+    """Candidate pool for team formation; rows of every array are candidates.
+
+    ``skills`` holds one boolean column per required skill known to the index,
+    ``n_required`` counts all required skills (unknown ones can never be covered).
+    """
+
+    scores: np.ndarray
+    skills: np.ndarray
+    n_required: int
+    personality: Optional[np.ndarray] = None
+    diversity_weight: float = 0.0
+
+    def __post_init__(self):
+        self.scores = np.asarray(self.scores, dtype=np.float64)
+        self.skills = np.asarray(self.skills, dtype=bool).reshape(len(self.scores), -1)
+        if self.personality is None or not self.diversity_weight:
+            self.personality = None
+            self._scale = None
+        else:
+            self.personality = np.asarray(self.personality, dtype=np.float64)
+            # Largest possible std per trait is half its range over the pool.
+            spread = np.ptp(self.personality, axis=0) / 2.0
+            self._scale = np.where(spread > 0, spread, 1.0)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def evaluate(self, members: Iterable[int]) -> TeamOption:
+        state = _Partial.empty(self)
+        for pos in members:
+            state = state.add(self, int(pos))
+        return state.option(self)
+
+    def _objectives(self, state: "_Partial") -> np.ndarray:
+        """Objective of ``state`` plus each candidate, for every candidate at once."""
+        size = len(state.members) + 1
+        avg = (state.score_sum + self.scores) / size
+        if self.n_required:
+            # Only skills with a column can be covered; the rest count as gaps.
+            uncovered = state.counts == 0
+            covered = int((~uncovered).sum()) + self.skills[:, uncovered].sum(axis=1)
+            coverage = covered / self.n_required
+        else:
+            coverage = 1.0
+        objective = 0.7 * avg + 0.3 * coverage
+        if self.personality is not None:
+            mean = (state.p_sum + self.personality) / size
+            var = (state.p_sq + self.personality**2) / size - mean**2
+            diversity = (np.sqrt(np.maximum(var, 0.0)) / self._scale).mean(axis=1)
+            objective = objective + self.diversity_weight * diversity
+        objective = np.asarray(objective, dtype=np.float64)
+        if state.members:
+            objective[list(state.members)] = -np.inf
+        return objective
+
+
+@dataclass(frozen=True)
+class _Partial:
+    """Running sums for a partial team so adding a member is O(skills + traits)."""
+
+    members: Tuple[int, ...]
+    score_sum: float
+    counts: np.ndarray
+    p_sum: np.ndarray
+    p_sq: np.ndarray
+
+    @classmethod
+    def empty(cls, problem: TeamProblem) -> "_Partial":
+        traits = 0 if problem.personality is None else problem.personality.shape[1]
+        return cls((), 0.0, np.zeros(problem.skills.shape[1], dtype=np.int64), np.zeros(traits), np.zeros(traits))
+
+    def add(self, problem: TeamProblem, pos: int) -> "_Partial":
+        p = problem.personality
+        return _Partial(
+            self.members + (pos,),
+            self.score_sum + float(problem.scores[pos]),
+            self.counts + problem.skills[pos],
+            self.p_sum if p is None else self.p_sum + p[pos],
+            self.p_sq if p is None else self.p_sq + p[pos] ** 2,
+        )
+
+    def remove(self, problem: TeamProblem, pos: int) -> "_Partial":
+        p = problem.personality
+        return _Partial(
+            tuple(m for m in self.members if m != pos),
+            self.score_sum - float(problem.scores[pos]),
+            self.counts - problem.skills[pos],
+            self.p_sum if p is None else self.p_sum - p[pos],
+            self.p_sq if p is None else self.p_sq - p[pos] ** 2,
+        )
+
+    def option(self, problem: TeamProblem) -> TeamOption:
+        size = max(1, len(self.members))
+        avg = self.score_sum / size if self.members else 0.0
+        coverage = float((self.counts > 0).sum()) / problem.n_required if problem.n_required else 1.0
+        diversity = 0.0
+        if problem.personality is not None and self.members:
+            var = self.p_sq / size - (self.p_sum / size) ** 2
+            diversity = float((np.sqrt(np.maximum(var, 0.0)) / problem._scale).mean())
+        objective = 0.7 * avg + 0.3 * coverage + problem.diversity_weight * diversity
+        return TeamOption(tuple(sorted(self.members)), objective, avg, coverage, diversity)
+
+
+def _best(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest finite values, best first (ties by index)."""
+    finite = np.flatnonzero(np.isfinite(values))
+    if len(finite) > k:
+        finite = finite[np.argpartition(-values[finite], k - 1, kind="introselect")[:k]]
+    return finite[np.lexsort((finite, -values[finite]))]
+
+
+def shortlist(problem: TeamProblem, k: int, pool_size: int = 256) -> np.ndarray:
+    """Candidates worth searching: the best scores plus the best holders of each skill."""
+    keep = set(_best(problem.scores, pool_size).tolist())
+    for col in range(problem.skills.shape[1]):
+        holders = np.flatnonzero(problem.skills[:, col])
+        keep.update(holders[_best(problem.scores[holders], k)].tolist())
+    return np.array(sorted(keep), dtype=np.int64)
+
+
+def _subproblem(problem: TeamProblem, rows: np.ndarray) -> TeamProblem:
+    sub = TeamProblem(problem.scores[rows], problem.skills[rows], problem.n_required)
+    if problem.personality is not None:
+        sub.personality = problem.personality[rows]
+        sub.diversity_weight = problem.diversity_weight
+        sub._scale = problem._scale  # keep the full pool's normalisation
+    return sub
+
+
+def optimize_teams(
+    problem: TeamProblem,
+    k: int,
+    top_n: int = 3,
+    beam_width: int = 8,
+    time_budget: float = 0.2,
+    pool_size: int = 256,
+) -> List[TeamOption]:
+    """Best ``top_n`` distinct teams of size ``k`` via beam search plus swap local search.
+
+    The search runs on a shortlist of the pool. Once ``time_budget`` seconds have
+    passed the beam narrows to greedy and local search stops, so the answer comes
+    back in bounded time whatever the pool size.
+    """
+    if not 1 <= k <= len(problem):
+        raise ValueError(f"team size {k} must be between 1 and the pool size {len(problem)}")
+    deadline = time.perf_counter() + time_budget
+    rows = shortlist(problem, k, pool_size)
+    sub = _subproblem(problem, rows)
+
+    beam = [_Partial.empty(sub)]
+    for _ in range(k):
+        width = beam_width if time.perf_counter() < deadline else 1
+        children: Dict[frozenset, Tuple[float, _Partial]] = {}
+        for state in beam:
+            objectives = sub._objectives(state)
+            for pos in _best(objectives, width):
+                key = frozenset(state.members + (int(pos),))
+                if key not in children:
+                    children[key] = (float(objectives[pos]), state.add(sub, int(pos)))
+        ranked = sorted(children.values(), key=lambda item: (-item[0], sorted(item[1].members)))
+        beam = [state for _, state in ranked[: max(width, top_n)]]
+
+    results: Dict[Tuple[int, ...], TeamOption] = {}
+    for state in beam:
+        # Keep the beam team as well as its local optimum: swaps from different
+        # starts often converge, and the runners-up are still distinct answers.
+        for option in (state.option(sub), _local_search(sub, state, deadline).option(sub)):
+            results.setdefault(option.members, option)
+
+    options = sorted(results.values(), key=lambda o: (-o.objective, o.members))[:top_n]
+    return [
+        TeamOption(tuple(int(rows[m]) for m in o.members), o.objective, o.avg_score, o.coverage, o.diversity)
+        for o in options
+    ]
+
+
+def _local_search(problem: TeamProblem, state: _Partial, deadline: float) -> _Partial:
+    """Best-improvement single swaps until no swap helps or time runs out."""
+    current = state.option(problem).objective
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for member in state.members:
+            reduced = state.remove(problem, member)
+            objectives = problem._objectives(reduced)
+            objectives[member] = -np.inf
+            best = int(np.argmax(objectives))
+            if objectives[best] > current + 1e-12:
+                state, current, improved = reduced.add(problem, best), float(objectives[best]), True
+                break
+    return state
+
+
+def brute_force_teams(problem: TeamProblem, k: int, top_n: int = 3, max_combinations: int = 1_000_000) -> List[TeamOption]:
+    """Exact top ``top_n`` teams by enumeration; only for small pools."""
+    total = comb(len(problem), k)
+    if total > max_combinations:
+        raise ValueError(f"{total} combinations exceed max_combinations={max_combinations}")
+    options = (problem.evaluate(members) for members in combinations(range(len(problem)), k))
+    return heapq.nsmallest(top_n, options, key=lambda o: (-o.objective, o.members))
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Tests import the packages the way the scripts in py/ do.
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Read by backend.app at import: a private snapshot directory and no background threads.
+os.environ["KG_INDEX_DIR"] = tempfile.mkdtemp(prefix="kg-index-")
+os.environ["KG_RELOAD_POLL"] = "0"
+os.environ["KG_REFIT_INTERVAL"] = "0"
@@ -0,0 +1,228 @@
+"""API behaviour that spans processes or requests."""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import app as api  # noqa: E402
+from mvp.executor import WorkPool  # noqa: E402
+from mvp.snapshot import Journal  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    api.reload_index(force=True)
+    yield TestClient(api.app)
+    # Leave the shared snapshot as the data files define it.
+    api._index().journal.path.unlink(missing_ok=True)
+    api.reload_index(force=True)
+
+
+def test_ingest_is_journaled_and_replayed(client):
+    assert client.post("/candidates", json={"id": "T-1", "name": "Tess One", "skills": ["python", "sql"]}).status_code == 201
+    assert client.post("/candidates", json={"id": "T-2", "name": "Tess Two", "skills": ["java"]}).status_code == 201
+    assert client.delete("/candidates/T-2").status_code == 200
+    rows = len(api._index().mvp.df)
+
+    # A fresh load (a restart, or another worker attaching) replays the journal.
+    api.reload_index(force=True)
+    assert len(api._index().mvp.df) == rows
+    assert client.get("/candidates/T-1").status_code == 200
+    assert client.get("/candidates/T-2").status_code == 404
+
+
+def test_ingest_catches_up_with_other_workers(client):
+    index = api._index()
+    other = Journal(index.journal.path.parent)
+    other.offset = index.journal.path.stat().st_size if index.journal.path.exists() else 0
+    with other.locked():
+        other.append({"op": "add", "row": {"id": "W-1", "name": "From Elsewhere", "skills": "sql"}})
+
+    # The clash is detected against the other worker's entry, not only local rows.
+    assert client.post("/candidates", json={"id": "W-1", "name": "Again"}).status_code == 409
+    assert client.get("/candidates/W-1").json()["name"] == "From Elsewhere"
+
+
+def test_journal_leaves_partial_lines_for_later(tmp_path):
+    journal = Journal(tmp_path)
+    journal.path.write_bytes(b'{"op": "delete", "id": "a"}\n{"op": "del')
+    assert journal.read() == [{"op": "delete", "id": "a"}]
+    with journal.path.open("ab") as fh:
+        fh.write(b'ete", "id": "b"}\n')
+    assert journal.read() == [{"op": "delete", "id": "b"}]
+    assert journal.read() == []
+
+
+def test_version_is_never_reused_across_reloads(client):
+    page = client.post("/search", json={"limit": 5}).json()
+    before = api._index().version
+    api.reload_index(force=True)
+    assert api._index().version != before
+    # A cursor from the replaced index is stale even though the snapshot key is the same.
+    assert client.post("/search", json={"limit": 5, "cursor": page["nextCursor"]}).status_code == 410
+
+
+def test_team_personality_reflects_members(client):
+    store = api._index().mvp.store()
+    by_openness = np.argsort(store.personality[:, 0], kind="stable")
+    low, high = [[str(store.ids[pos]) for pos in by_openness[sl]] for sl in (slice(0, 3), slice(-3, None))]
+
+    response = client.post("/team/evaluate/batch", json={"teams": [low, high]})
+    assert response.status_code == 200
+    metrics = [result["diversityMetrics"] for result in response.json()["results"]]
+    for ids, metric in zip((low, high), metrics):
+        traits = np.array([[client.get(f"/candidates/{cid}").json()["personality"][t] for t in "OCEAN"] for cid in ids])
+        assert [metric[t] for t in "OCEAN"] == pytest.approx(traits.mean(axis=0).tolist(), abs=1e-12)
+        assert [metric["spread"][t] for t in "OCEAN"] == pytest.approx(traits.std(axis=0).tolist(), abs=1e-12)
+    assert metrics[0]["O"] < metrics[1]["O"]
+
+
+def test_query_matches_names_and_skills_without_fallback(client):
+    store = api._index().mvp.store()
+    ranked = [c["id"] for c in client.post("/search", json={"limit": 100}).json()["candidates"]]
+
+    def expected(text):
+        return [
+            cid
+            for cid in ranked
+            if text in store.get(cid).name.lower() or any(text in skill for skill in store.get(cid).skills)
+        ]
+
+    first = store.get(ranked[0]).name.split()[0].lower()
+    for text in (first, first[1:4], "sql", "analy"):
+        body = client.post("/search", json={"limit": 100, "query": text}).json()
+        assert [c["id"] for c in body["candidates"]] == expected(text), text
+        assert body["total"] == len(expected(text))
+
+    body = client.post("/search", json={"limit": 10, "query": "zzzz-no-such-term"}).json()
+    assert body["candidates"] == [] and body["total"] == 0
+
+
+def test_blank_query_is_no_filter(client):
+    assert len(api._index().mvp.terms.matching("   ")) == 0
+    unfiltered = client.post("/search", json={"limit": 10}).json()
+    for text in ("", "   ", "\t"):
+        body = client.post("/search", json={"limit": 10, "query": text}).json()
+        assert body["candidates"] == unfiltered["candidates"] and body["total"] == unfiltered["total"]
+
+
+def _walk(client, body):
+    ids, cursor = [], None
+    while True:
+        page = client.post("/search", json={**body, "cursor": cursor}).json()
+        ids += [c["id"] for c in page["candidates"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            return ids, page["total"]
+
+
+def _walk_get(client, url, limit):
+    ids, params = [], {"limit": limit}
+    while True:
+        page = client.get(url, params=params).json()
+        ids += [c["id"] for c in page["candidates"]]
+        if page["nextCursor"] is None:
+            return ids, page["total"]
+        params["cursor"] = page["nextCursor"]
+
+
+def test_approx_search_scores_every_filtered_row(client, monkeypatch):
+    index = api._index()
+    terms, store = index.mvp.terms, index.mvp.store()
+    skill = max(index.mvp.skill_index, key=lambda s: len(terms.skill_postings(s)))
+    matching = {str(store.ids[pos]) for pos in terms.postings(skill)}
+    # More matches than the shortlist, on a roster large enough to be shortlisted.
+    monkeypatch.setattr(api, "SHORTLIST_SIZE", (len(matching) + 1) // 2)
+    assert api.SHORTLIST_SIZE < len(matching) and len(store.ids) > 2 * api.SHORTLIST_SIZE
+
+    approx, total = _walk(client, {"mustHave": [skill], "mode": "approx", "limit": 7})
+    exact, _ = _walk(client, {"mustHave": [skill], "mode": "exact", "limit": 7})
+    assert sorted(approx) == sorted(matching) and total == len(matching)
+    assert approx == exact
+
+
+def test_full_lane_answers_503_with_retry_after(client, monkeypatch):
+    pool = WorkPool(2)
+    monkeypatch.setitem(api._WORK.lanes, "search", pool.lane("search", 1, 0))
+    release = threading.Event()
+    blocker = api._WORK.lanes["search"].submit(release.wait)
+    try:
+        busy = client.post("/search", json={"limit": 5})
+        assert busy.status_code == 503
+        assert int(busy.headers["Retry-After"]) >= 1
+        # Other lanes are untouched by the saturated one.
+        cid = api._index().mvp.store().ids[0]
+        assert client.get(f"/candidates/{cid}").status_code == 200
+
+        release.set()
+        blocker.result(timeout=5)
+        assert client.post("/search", json={"limit": 5}).status_code == 200
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_cursor_pages_cover_the_unpaged_ranking(client):
+    for body in ({}, {"mustHave": ["sql"]}, {"query": "a"}):
+        unpaged = client.post("/search", json={**body, "limit": 100}).json()
+        assert unpaged["nextCursor"] is None
+        ids, total = _walk(client, {**body, "limit": 7})
+        assert len(ids) == len(set(ids)), body
+        assert ids == [c["id"] for c in unpaged["candidates"]], body
+        assert total == unpaged["total"] == len(ids), body
+
+    unpaged = client.get("/candidates/high-readiness").json()
+    ids, total = _walk_get(client, "/candidates/high-readiness", 4)
+    assert ids == [c["id"] for c in unpaged["candidates"]] and len(set(ids)) == len(ids)
+    assert total == unpaged["total"] == len(ids)
+
+
+def test_sparse_fieldsets(client):
+    body = client.post("/search", json={"limit": 3, "fields": ["score", "name"]}).json()
+    assert body["candidates"] and all(list(c) == ["id", "score", "name"] for c in body["candidates"])
+    full = client.post("/search", json={"limit": 3}).json()["candidates"]
+    assert [{k: c[k] for k in ("id", "score", "name")} for c in full] == body["candidates"]
+
+    bad = client.post("/search", json={"limit": 3, "fields": ["score", "salary"]})
+    assert bad.status_code == 400 and "salary" in bad.json()["detail"]
+    assert client.get("/roles/" + api._index().role.slug + "/ranking", params={"fields": "nope"}).status_code == 400
+
+    cid = full[0]["id"]
+    detail = client.get(f"/candidates/{cid}", params={"fields": "personality,title"}).json()
+    assert set(detail) == {"id", "personality", "title"} and set(detail["personality"]) == set("OCEAN")
+    assert set(client.get(f"/candidates/{cid}").json()) == set(api.DETAIL_FIELDS)
+    # "personality" is a detail field only, not part of a search row.
+    assert client.post("/search", json={"fields": ["personality"]}).status_code == 400
+
+
+def test_roles_listing_and_ranking(client, monkeypatch, tmp_path):
+    (tmp_path / "analyst.json").write_text(
+        json.dumps({"role": "Data Analyst", "required_skills": ["sql", "excel"], "nice_to_have": ["python"]})
+    )
+    monkeypatch.setattr(api, "ROLES_DIR", tmp_path)
+    api.reload_index(force=True)
+
+    listing = client.get("/roles").json()
+    assert listing["total"] == len(listing["roles"]) == 2
+    default, analyst = listing["roles"]
+    assert default["default"] and not analyst["default"]
+    assert (analyst["id"], analyst["requiredSkills"]) == ("data-analyst", ["sql", "excel"])
+
+    unpaged = client.get("/roles/data-analyst/ranking", params={"limit": 100}).json()
+    assert unpaged["role"] == "Data Analyst" and unpaged["nextCursor"] is None
+    # The title resolves to the same role as its slug.
+    assert client.get("/roles/Data Analyst/ranking", params={"limit": 100}).json()["candidates"] == unpaged["candidates"]
+    assert unpaged["candidates"] != client.get(f"/roles/{default['id']}/ranking", params={"limit": 100}).json()["candidates"]
+
+    ids, total = _walk_get(client, "/roles/data-analyst/ranking", 6)
+    assert ids == [c["id"] for c in unpaged["candidates"]] and len(set(ids)) == len(ids) == total == unpaged["total"]
+
+    missing = client.get("/roles/no-such-role/ranking")
+    assert missing.status_code == 404 and "no-such-role" in missing.json()["detail"]
+    assert client.post("/search", json={"role": "no-such-role"}).status_code == 404
@@ -0,0 +1,113 @@
+"""LRUCache: TTL expiry, LRU eviction and single-flight builds on a fake clock."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mvp import cache
+from mvp.cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the module's clock with one that only moves when a test advances it."""
+    now = SimpleNamespace(t=1000.0)
+    fake = SimpleNamespace(monotonic=lambda: now.t, perf_counter=time.perf_counter)
+    monkeypatch.setattr(cache, "time", fake)
+    return now
+
+
+def test_ttl_expiry(clock):
+    lru = LRUCache(maxsize=4, ttl=10)
+    lru.put("a", 1)
+    clock.t += 9.9
+    assert lru.get("a") == 1
+    clock.t += 0.1
+    assert lru.get("a") is None and len(lru) == 0
+    stats = lru.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_lru_eviction_keeps_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # "b" is now least recently used
+    lru.put("c", 3)
+    assert lru.peek("b") is None
+    assert (lru.peek("a"), lru.peek("c")) == (1, 3)
+    assert lru.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_rebuilt(clock):
+    lru = LRUCache(maxsize=4, ttl=5)
+    builds = []
+
+    def factory():
+        builds.append(clock.t)
+        return len(builds)
+
+    assert lru.get_or_create("k", factory) == 1
+    clock.t += 4
+    assert lru.get_or_create("k", factory) == 1
+    clock.t += 1
+    assert lru.get_or_create("k", factory) == 2
+    assert builds == [1000.0, 1005.0]
+    assert lru.stats()["expirations"] == 1
+
+
+def _race(lru, factory, callers=8):
+    """Run ``callers`` concurrent get_or_create calls on one key; return (results, errors)."""
+    results, errors = [], []
+    start = threading.Barrier(callers)
+
+    def call():
+        start.wait()
+        try:
+            results.append(lru.get_or_create("k", factory))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    assert not any(t.is_alive() for t in threads)
+    return results, errors
+
+
+def test_single_flight_runs_factory_once():
+    lru = LRUCache(maxsize=4)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "built"
+
+    results, errors = _race(lru, slow)
+    assert errors == [] and results == ["built"] * 8
+    assert len(calls) == 1
+    stats = lru.stats()
+    assert stats["misses"] == 1 and stats["hits"] + stats["coalesced"] == 7
+
+
+def test_factory_error_reaches_every_waiter():
+    lru = LRUCache(maxsize=4)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.2)
+        raise RuntimeError("boom")
+
+    results, errors = _race(lru, failing)
+    assert results == [] and len(errors) == 8
+    assert all(isinstance(e, RuntimeError) and str(e) == "boom" for e in errors)
+    assert len(calls) == 1 and len(lru) == 0
+
+    # A failed build is not cached; the next caller builds again.
+    assert lru.get_or_create("k", lambda: "ok") == "ok"
@@ -0,0 +1,66 @@
+"""Candidate CSV loading: header detection, the parser fallback and chunked reads."""
+
+import pandas as pd
+import pytest
+
+from mvp import data_utils
+from mvp.data_utils import CANONICAL_COLUMNS, iter_candidate_chunks, load_candidate_dataframe
+
+HEADER = ",EmployeeID,Name,BusinessUnit,Role,Skills,O_Score,C_Score,E_Score,A_Score,N_Score"
+
+
+def _write(path, rows: int, leading: str = "\n,,,,,,,,,,,\n\n,,,,\n") -> str:
+    lines = [f"{i},E{i:03d},Person {i},Unit {i % 3},Analyst,\"SQL, Python\",{1 + i % 5},3,3,3,3" for i in range(rows)]
+    path.write_text(leading + HEADER + "\n" + "\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _fail_path_reads(monkeypatch, after_chunks=None):
+    """Make pd.read_csv on a file path raise ParserError, as irregular rows would.
+
+    With ``after_chunks`` a chunked read yields that many chunks first.
+    """
+    real = pd.read_csv
+
+    def read_csv(source, *args, **kwargs):
+        if not isinstance(source, (str, bytes)) and not hasattr(source, "__fspath__"):
+            return real(source, *args, **kwargs)
+        if after_chunks is None or not kwargs.get("chunksize"):
+            raise pd.errors.ParserError("Error tokenizing data")
+
+        def chunks():
+            for i, chunk in enumerate(real(source, *args, **kwargs)):
+                if i == after_chunks:
+                    raise pd.errors.ParserError("Error tokenizing data")
+                yield chunk
+
+        return chunks()
+
+    monkeypatch.setattr(data_utils.pd, "read_csv", read_csv)
+
+
+def test_leading_blank_and_separator_lines_are_skipped(tmp_path):
+    df = load_candidate_dataframe(_write(tmp_path / "c.csv", 4))
+    assert list(df.columns) == CANONICAL_COLUMNS
+    assert df["id"].tolist() == ["E000", "E001", "E002", "E003"]
+
+
+def test_fallback_reads_the_same_rows(tmp_path, monkeypatch):
+    path = _write(tmp_path / "c.csv", 4)
+    expected = load_candidate_dataframe(path)
+    _fail_path_reads(monkeypatch)
+    pd.testing.assert_frame_equal(load_candidate_dataframe(path), expected)
+
+
+def test_chunked_fallback_does_not_repeat_rows(tmp_path, monkeypatch):
+    path = _write(tmp_path / "c.csv", 10)
+    expected = load_candidate_dataframe(path)
+    _fail_path_reads(monkeypatch, after_chunks=2)
+    chunks = list(iter_candidate_chunks(path, chunksize=3))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_chunked_load_matches_whole_file(tmp_path, chunksize):
+    path = _write(tmp_path / "c.csv", 7)
+    pd.testing.assert_frame_equal(load_candidate_dataframe(path, chunksize=chunksize), load_candidate_dataframe(path))
@@ -0,0 +1,47 @@
+"""Lane admission control: bounded queues, retry hints and cancelling queued work."""
+
+import threading
+
+import pytest
+
+from mvp.executor import Overloaded, WorkPool
+
+
+@pytest.fixture
+def pool():
+    work = WorkPool(4)
+    yield work
+    work.shutdown()
+
+
+def test_full_lane_rejects_while_other_lanes_accept(pool):
+    busy, idle = pool.lane("busy", 1, 1), pool.lane("idle", 1, 1)
+    release = threading.Event()
+    running, queued = busy.submit(release.wait), busy.submit(lambda: "queued")
+
+    with pytest.raises(Overloaded) as exc:
+        busy.submit(lambda: "rejected")
+    assert exc.value.lane == "busy" and exc.value.retry_after >= 1
+    assert idle.submit(lambda: "other").result(timeout=5) == "other"
+
+    release.set()
+    assert running.result(timeout=5) is True and queued.result(timeout=5) == "queued"
+    assert busy.submit(lambda: "again").result(timeout=5) == "again"
+    stats = busy.stats()
+    assert (stats["admitted"], stats["rejected"], stats["completed"]) == (3, 1, 3)
+
+
+def test_cancelled_queued_work_never_runs(pool):
+    lane = pool.lane("search", 1, 2)
+    release, ran = threading.Event(), []
+    running = lane.submit(release.wait)
+    queued = lane.submit(ran.append, "queued")
+    kept = lane.submit(ran.append, "kept")
+
+    assert queued.cancel()
+    assert not running.cancel()  # already running; it finishes
+    release.set()
+    kept.result(timeout=5)
+    assert running.result(timeout=5) is True
+    assert ran == ["kept"] and queued.cancelled()
+    assert lane.stats()["cancelled"] == 1
@@ -0,0 +1,186 @@
+"""CompiledKG against the networkx definitions of each relatedness metric."""
+
+import json
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from mvp.kg import KGConfig, CompiledKG, _node_id, build_compiled_kg, build_kg, rank_candidates_by_kg
+
+DATA = "mvp/data"
+TOL = 1e-12
+
+
+def _sample_graph() -> nx.Graph:
+    from conftest import ROOT
+
+    data = ROOT / DATA
+    return build_kg(str(data / "sample_resumes.csv"), str(data / "sample_teams.csv"), str(data / "role_requirements.json"))
+
+
+def _random_graph(seed: int = 3) -> nx.Graph:
+    """Typed graph with weighted edges, team links, duplicate-free skills and isolated candidates."""
+    rng = np.random.default_rng(seed)
+    G = nx.Graph()
+    skills = [_node_id("skill", f"s{i}") for i in range(25)]
+    teams = [_node_id("team", f"t{i}") for i in range(6)]
+    roles = [_node_id("role", f"r{i}") for i in range(3)]
+    candidates = [_node_id("candidate", f"c{i}") for i in range(80)]
+    for kind, nodes in (("role", roles), ("skill", skills), ("team", teams), ("candidate", candidates)):
+        G.add_nodes_from((n, {"type": kind}) for n in nodes)
+    for role in roles:
+        for s in rng.choice(skills, size=rng.integers(2, 7), replace=False):
+            G.add_edge(role, s, type="REQUIRES", weight=float(rng.uniform(0.3, 2.0)))
+    for team in teams:
+        for s in rng.choice(skills, size=rng.integers(1, 5), replace=False):
+            G.add_edge(team, s, type="HAS_SKILL", weight=float(rng.uniform(0.3, 2.0)))
+    for i, cand in enumerate(candidates):
+        if i % 17 == 0:
+            continue  # no edges at all: a dangling node for PageRank
+        for s in rng.choice(skills, size=rng.integers(0, 6), replace=False):
+            G.add_edge(cand, s, type="HAS_SKILL", weight=float(rng.uniform(0.3, 2.0)))
+        if rng.random() < 0.4:
+            G.add_edge(cand, teams[rng.integers(len(teams))], type="CANDIDATE_OF", weight=float(rng.uniform(0.3, 2.0)))
+    return G
+
+
+GRAPHS = {"sample": _sample_graph, "random": _random_graph}
+
+
+def _roles(G: nx.Graph):
+    return [n for n, d in G.nodes(data=True) if d["type"] == "role"]
+
+
+def _reference(G: nx.Graph, role: str, candidates, alpha: float = 0.15) -> dict:
+    role_skills = {n for n in G[role] if G.nodes[n]["type"] == "skill"}
+    pairs = [(role, c) for c in candidates]
+    ppr = nx.pagerank(G, alpha=1 - alpha, personalization={role: 1.0}, weight="weight")
+    return {
+        "metapath": np.array(
+            [len(role_skills & {n for n in G[c] if G.nodes[n]["type"] == "skill"}) / len(role_skills) for c in candidates]
+        ),
+        "jaccard": np.array([score for _, _, score in nx.jaccard_coefficient(G, pairs)]),
+        "adamic_adar": np.array([score for _, _, score in nx.adamic_adar_index(G, pairs)]),
+        "ppr": np.array([ppr[c] for c in candidates]),
+    }
+
+
+@pytest.mark.parametrize("name", sorted(GRAPHS))
+def test_compiled_metrics_match_networkx(name):
+    G = GRAPHS[name]()
+    ckg = CompiledKG.from_graph(G)
+    for role in _roles(G):
+        expected = _reference(G, role, ckg.candidates)
+        for metric, values in expected.items():
+            np.testing.assert_allclose(getattr(ckg, metric)(role), values, rtol=0, atol=TOL, err_msg=f"{metric} {role}")
+
+
+@pytest.mark.parametrize("name", sorted(GRAPHS))
+def test_rank_candidates_by_kg_matches_networkx(name):
+    G = GRAPHS[name]()
+    candidates = [n for n, d in G.nodes(data=True) if d["type"] == "candidate"]
+    for role in _roles(G):
+        ref = _reference(G, role, candidates)
+        expected = {
+            c: 0.5 * ref["metapath"][i] + 0.4 * ref["ppr"][i] + 0.1 * ref["jaccard"][i] for i, c in enumerate(candidates)
+        }
+        ranked = rank_candidates_by_kg(G, role, top_k=len(candidates))
+        assert sorted(node for node, _, _ in ranked) == sorted(candidates)
+        scores = [score for _, score, _ in ranked]
+        assert all(a >= b for a, b in zip(scores, scores[1:]))
+        for node, score, breakdown in ranked:
+            i = candidates.index(node)
+            assert score == pytest.approx(expected[node], abs=TOL)
+            assert breakdown["meta"] == pytest.approx(ref["metapath"][i], abs=TOL)
+            assert breakdown["ppr"] == pytest.approx(ref["ppr"][i], abs=TOL)
+            assert breakdown["jaccard"] == pytest.approx(ref["jaccard"][i], abs=TOL)
+
+
+def _build_inputs(tmp_path):
+    """Frames with repeated ids and skills, blank team skills and candidate team links."""
+    resumes = pd.DataFrame(
+        {
+            "id": ["c1", "c2", "c1", "c3", "c4"],
+            "name": ["Ann", "Bo", "Ann B", "Cy", "Di"],
+            "years_experience": [3, 5.5, 4, 0, 1],
+            "canonical_skills": [["sql", "python"], ["excel", "sql", "sql"], ["python", "r"], [], ["go"]],
+            "team_id": ["T01", None, "T02", "T99", "T01"],
+        }
+    )
+    teams = pd.DataFrame(
+        {
+            "team_id": ["T01", "T02", "T03"],
+            "team_name": ["Feed", "Cold", "Agri"],
+            "team_skills": ["sql|excel", "python| |r", "ml"],
+            **{t: [0.1 * i + 0.05 * j for j in range(3)] for i, t in enumerate("OCEAN", 1)},
+        }
+    )
+    role = {"role": "Analyst", "required_skills": ["sql", "ml"], "nice_to_have": ["python", "ml"]}
+    path = tmp_path / "role.json"
+    path.write_text(json.dumps(role))
+    return resumes, teams, role, path
+
+
+def _reference_kg(resumes: pd.DataFrame, teams: pd.DataFrame, role: dict, cfg: KGConfig) -> nx.Graph:
+    """The node-by-node construction build_kg replaced."""
+    G = nx.Graph()
+    role_node = _node_id("role", role["role"])
+    G.add_node(role_node, type="role", name=role["role"])
+    for s in role.get("required_skills", []):
+        G.add_node(_node_id("skill", s), type="skill", name=s)
+        G.add_edge(role_node, _node_id("skill", s), type="REQUIRES", weight=cfg.weight_requires, required=True)
+    for s in role.get("nice_to_have", []):
+        if not G.has_node(_node_id("skill", s)):
+            G.add_node(_node_id("skill", s), type="skill", name=s)
+        G.add_edge(role_node, _node_id("skill", s), type="REQUIRES", weight=cfg.weight_requires * 0.6, required=False)
+    for _, t in teams.iterrows():
+        tnode = _node_id("team", t["team_id"])
+        G.add_node(tnode, type="team", name=t["team_name"], O=t["O"], C=t["C"], E=t["E"], A=t["A"], N=t["N"])
+        for s in t["team_skills"].split("|"):
+            s = s.strip()
+            if not s:
+                continue
+            if not G.has_node(_node_id("skill", s)):
+                G.add_node(_node_id("skill", s), type="skill", name=s)
+            G.add_edge(tnode, _node_id("skill", s), type="HAS_SKILL", weight=cfg.weight_has_skill)
+    for _, r in resumes.iterrows():
+        cnode = _node_id("candidate", r["id"])
+        G.add_node(cnode, type="candidate", name=r["name"], years=float(r.get("years_experience", 0)))
+        for s in r["canonical_skills"]:
+            if not G.has_node(_node_id("skill", s)):
+                G.add_node(_node_id("skill", s), type="skill", name=s)
+            G.add_edge(cnode, _node_id("skill", s), type="HAS_SKILL", weight=cfg.weight_has_skill)
+        if isinstance(r["team_id"], str) and r["team_id"] and G.has_node(_node_id("team", r["team_id"])):
+            G.add_edge(cnode, _node_id("team", r["team_id"]), type="CANDIDATE_OF", weight=cfg.weight_candidate_of)
+    return G
+
+
+def _by_type(G: nx.Graph) -> dict:
+    kinds = {}
+    for n, d in G.nodes(data=True):
+        kinds.setdefault(d["type"], []).append((n, d))
+    return kinds
+
+
+def test_build_kg_matches_reference(tmp_path):
+    resumes, teams, role, path = _build_inputs(tmp_path)
+    cfg = KGConfig(weight_has_skill=0.9)
+    G = build_kg(resumes, teams, path, cfg)
+    ref = _reference_kg(resumes, teams, role, cfg)
+
+    # Same nodes with the same attributes, in the same order within each type.
+    assert _by_type(G) == _by_type(ref)
+    assert G.number_of_edges() == ref.number_of_edges()
+    for u, v, d in ref.edges(data=True):
+        assert G.edges[u, v] == d, (u, v)
+
+    expected = CompiledKG.from_graph(ref)
+    for ckg in (CompiledKG.from_graph(G), build_compiled_kg(resumes, teams, path, cfg)):
+        assert (ckg.roles, ckg.skills, ckg.teams, ckg.candidates) == (
+            expected.roles, expected.skills, expected.teams, expected.candidates
+        )
+        for block in ("role_skill", "team_skill", "cand_skill", "cand_team"):
+            np.testing.assert_array_equal(getattr(ckg, block).toarray(), getattr(expected, block).toarray(), err_msg=block)
+        np.testing.assert_array_equal(ckg.degree, expected.degree)
@@ -0,0 +1,56 @@
+"""Two-stage (approximate) retrieval against exact scoring on a synthetic roster."""
+
+import pytest
+
+from bench.synth import write_workforce
+from mvp import retrieval
+from mvp.pipeline import RecruitingMVP
+from mvp.retrieval import recall_report, sample_queries
+
+ROWS = 4000
+SHORTLIST = 300
+# Share of the exact top-k the approximate top-k must keep (ties at the k-th score count).
+MIN_MEAN_RECALL = 0.95
+MIN_QUERY_RECALL = 0.7
+
+
+@pytest.fixture(scope="module")
+def mvp(tmp_path_factory):
+    candidates, _ = write_workforce(tmp_path_factory.mktemp("roster"), ROWS)
+    return RecruitingMVP(str(candidates))
+
+
+@pytest.mark.parametrize("ivf", [False, True], ids=["blocked", "ivf"])
+def test_approx_recall_against_exact(mvp, monkeypatch, ivf):
+    if ivf:
+        monkeypatch.setattr(retrieval, "IVF_MIN_ROWS", ROWS // 4)
+    mvp.__dict__.pop("_retriever", None)
+    report = recall_report(mvp, sample_queries(mvp, 30), k=10, shortlist_size=SHORTLIST)
+    assert (mvp.retriever().semantic.centroids is not None) == ivf
+    assert report["recallAtK"] >= MIN_MEAN_RECALL
+    assert report["minRecallAtK"] >= MIN_QUERY_RECALL
+    mvp.__dict__.pop("_retriever", None)
+
+
+def test_shortlist_keeps_every_row_on_small_rosters(mvp):
+    retriever = mvp.retriever()
+    shortlist = retriever.shortlist(["sql"], [], k=len(mvp.df))
+    assert len(shortlist) == len(mvp.df)
+
+
+def test_shortlist_stays_inside_given_rows(mvp):
+    import numpy as np
+
+    retriever = mvp.retriever()
+    required, nice = ["sql", "python"], ["cloud"]
+    rows = mvp.terms.postings("java")
+    assert len(rows) > 2 * 100
+    shortlist = retriever.shortlist(required, nice, k=100, rows=rows)
+    assert np.isin(shortlist, rows).all()
+
+    # The best rows among the filtered set are found, not just those near the role overall.
+    exact = mvp.score(required, nice, candidates=rows)
+    approx = mvp.score(required, nice, candidates=shortlist)
+    top = exact.top(10)
+    hits = exact.final_score[approx.top(10)] >= exact.final_score[top[-1]]
+    assert hits.mean() >= 0.9
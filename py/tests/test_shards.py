@@ -0,0 +1,27 @@
+"""Merging candidate shards: the last file wins for repeated ids."""
+
+import pandas as pd
+
+from mvp.shards import load_candidate_shards
+
+
+def _shard(path, rows):
+    pd.DataFrame(rows, columns=["EmployeeID", "Name", "Role", "Skills"]).to_csv(path, index=False)
+
+
+def test_later_shard_wins_and_rows_without_ids_are_kept(tmp_path):
+    _shard(tmp_path / "a.csv", [["E1", "Old One", "Analyst", "SQL"], [None, "No Id A", "Analyst", ""], ["E2", "Two", "Engineer", "Java"]])
+    _shard(tmp_path / "b.csv", [["E1", "New One", "Analyst", "Python"], [None, "No Id B", "Analyst", ""]])
+
+    merged = load_candidate_shards(tmp_path, workers=1)
+
+    assert sorted(merged.df["name"]) == ["New One", "No Id A", "No Id B", "Two"]
+    assert [shard["duplicatesDropped"] for shard in merged.shards] == [1, 0]
+    assert merged.report()["rows"] == len(merged.df) == len(merged.skill_matrix)
+
+
+def test_ids_repeated_within_one_shard_are_kept(tmp_path):
+    _shard(tmp_path / "a.csv", [["E1", "First", "Analyst", "SQL"], ["E1", "Second", "Analyst", "SQL"]])
+    merged = load_candidate_shards(tmp_path, workers=1)
+    assert merged.df["name"].tolist() == ["First", "Second"]
+    assert merged.report()["duplicatesDropped"] == 0
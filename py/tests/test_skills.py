@@ -0,0 +1,100 @@
+"""SkillMatcher against the per-synonym search it replaced."""
+
+import random
+import re
+
+import pytest
+
+from mvp.skills import SKILL_TAXONOMY, SkillMatcher, load_taxonomy, normalize_text
+
+OVERLAPPING = {
+    "java": ["java", "jvm", "spring"],
+    "javascript": ["javascript", "java script", "node", "node.js", "js"],
+    "node": ["node", "nodejs"],
+    "c": ["c"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", ".net", "net"],
+    "data": ["data", "data analysis", "data-analysis"],
+    "analysis": ["analysis", "analysis tools"],
+    "empty": [],
+}
+
+# Fragments that overlap as prefixes, across word boundaries and around + . - characters.
+FRAGMENTS = ["java", "script", "node", ".js", "js", "c", "++", "#", ".net", "net", "data", " ", "-", ".", "analysis", "spring", "x", "cpp", "tools"]
+
+
+def reference_extract(taxonomy, text):
+    """The original loop: each synonym between word boundaries of the normalised text."""
+    t = normalize_text(text or "")
+    found = set()
+    for canon, words in taxonomy.items():
+        for w in words:
+            if re.search(rf"\b{re.escape(w)}\b", t):
+                found.add(canon)
+                break
+    return found
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(FRAGMENTS) if rng.random() < 0.8 else rng.choice([" ", ", ", "/", "JAVA", "Node.JS"]) for _ in range(rng.randint(0, 14)))
+
+
+def _random_taxonomy(rng: random.Random) -> dict:
+    words = [w for w in FRAGMENTS if w.strip(" -.")] + ["java script", "node.js", "data analysis", "c++", "javascript"]
+    return {f"s{i}": rng.sample(words, rng.randint(0, 4)) for i in range(rng.randint(1, 8))}
+
+
+@pytest.mark.parametrize("taxonomy", [SKILL_TAXONOMY, OVERLAPPING], ids=["default", "overlapping"])
+def test_matches_reference_on_fixed_texts(taxonomy):
+    matcher = SkillMatcher(taxonomy)
+    texts = [
+        "",
+        "Java and JavaScript",
+        "javascript only",
+        "node.js backend",
+        "node-red, nodejs",
+        "Node. Worked with java script",
+        "c++ and c#, .net core",
+        "data-analysis: analysis tools for data",
+        "ml, machine learning, html",
+        "Supply-chain inventory via AWS / GCP",
+    ]
+    for text in texts:
+        assert matcher.extract(text) == reference_extract(taxonomy, text), text
+
+
+def test_matches_reference_fuzzed():
+    rng = random.Random(11)
+    for _ in range(300):
+        taxonomy = _random_taxonomy(rng)
+        matcher = SkillMatcher(taxonomy)
+        for _ in range(20):
+            text = _random_text(rng)
+            assert matcher.extract(text) == reference_extract(taxonomy, text), (taxonomy, text)
+
+
+def test_extract_batch_keeps_index():
+    import pandas as pd
+
+    matcher = SkillMatcher(OVERLAPPING)
+    texts = pd.Series(["java", "node.js", "c++ and c#"], index=[5, 3, 9])
+    out = matcher.extract_batch(texts)
+    assert list(out.index) == [5, 3, 9]
+    assert list(out) == [reference_extract(OVERLAPPING, t) for t in texts]
+
+
+def test_empty_synonyms_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="java"):
+        SkillMatcher({"java": ["java", " "], "sql": ["sql"]})
+    path = tmp_path / "taxonomy.json"
+    path.write_text('{"sql": ["sql", ""]}', encoding="utf-8")
+    with pytest.raises(ValueError, match="sql"):
+        load_taxonomy(path)
+
+
+def test_csv_rows_without_synonym_only_declare_the_skill(tmp_path):
+    path = tmp_path / "taxonomy.csv"
+    path.write_text("skill,synonym\nsql,sql\nsql,\ngo,\n", encoding="utf-8")
+    taxonomy = load_taxonomy(path)
+    assert taxonomy == {"sql": ["sql"], "go": []}
+    assert SkillMatcher(taxonomy).extract("go with sql") == reference_extract(taxonomy, "go with sql") == {"sql"}
@@ -0,0 +1,67 @@
+"""Snapshot round trip: what is read back equals what was written, and is mapped."""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from conftest import ROOT
+from mvp.kg import KGConfig, build_compiled_kg
+from mvp.pipeline import RecruitingMVP
+from mvp.snapshot import PPR_ALPHA, memory_report, read_snapshot, write_snapshot
+
+DATA = ROOT / "mvp" / "data"
+
+
+def _built():
+    mvp = RecruitingMVP(str(DATA / "sample_resumes.csv"))
+    roles = [DATA / "role_requirements.json"]
+    graph = build_compiled_kg(mvp.df, str(DATA / "sample_teams.csv"), roles, KGConfig(), skills_column="skills")
+    return mvp, graph
+
+
+def _assert_sparse_equal(a, b):
+    assert a.shape == b.shape
+    assert (sp.csr_matrix(a) != sp.csr_matrix(b)).nnz == 0
+
+
+def test_round_trip(tmp_path):
+    mvp, graph = _built()
+    write_snapshot(tmp_path / "snap", mvp, graph, key="k")
+    loaded, kg = read_snapshot(tmp_path / "snap")
+
+    columns = ["id", "name", "resume_text", "skills", "years_experience", "O", "C", "E", "A", "N", "canonical_skills"]
+    pd.testing.assert_frame_equal(loaded.df[columns], mvp.df[columns], check_dtype=False)
+    assert loaded.vectorizer.vocabulary_ == mvp.vectorizer.vocabulary_
+    np.testing.assert_array_equal(loaded.vectorizer.idf_, mvp.vectorizer.idf_)
+    _assert_sparse_equal(loaded.doc_matrix, mvp.doc_matrix)
+    np.testing.assert_array_equal(loaded.skill_matrix, mvp.skill_matrix)
+    assert loaded.skill_matcher.taxonomy == mvp.skill_matcher.taxonomy
+
+    for name in ("roles", "skills", "teams", "candidates"):
+        assert list(getattr(kg, name)) == list(getattr(graph, name))
+    for name in ("role_skill", "team_skill", "cand_skill", "cand_team"):
+        _assert_sparse_equal(getattr(kg, name), getattr(graph, name))
+    for role in graph.roles:
+        np.testing.assert_array_equal(kg.pagerank(role, PPR_ALPHA), graph.pagerank(role, PPR_ALPHA))
+
+    # Same answers from the loaded index.
+    required, nice = ["sql", "python"], ["cloud"]
+    pd.testing.assert_frame_equal(
+        loaded.search_candidates(required, nice, top_k=10).reset_index(drop=True),
+        mvp.search_candidates(required, nice, top_k=10).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_memory_report_counts_the_frame(tmp_path):
+    mvp, graph = _built()
+    write_snapshot(tmp_path / "snap", mvp, graph, key="k")
+    loaded, kg = read_snapshot(tmp_path / "snap")
+    report = memory_report(loaded, kg)
+
+    frame = report["arrays"]["frame"]
+    numeric = sum(loaded.df[c].to_numpy().nbytes for c in ["years_experience", "O", "C", "E", "A", "N"])
+    assert frame["sharedBytes"] == numeric
+    assert frame["privateBytes"] > 0  # decoded strings
+    assert report["arrays"]["docMatrix"]["privateBytes"] == 0
+    assert report["privateBytes"] >= frame["privateBytes"]
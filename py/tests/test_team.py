@@ -0,0 +1,125 @@
+"""Team formation search against exhaustive enumeration."""
+
+import numpy as np
+import pytest
+
+from mvp.team import TeamProblem, _Partial, brute_force_teams, optimize_teams
+
+
+def _problem(seed: int, diversity_weight: float = 0.0) -> TeamProblem:
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(5, 11))
+    known = int(rng.integers(0, 5))
+    unknown = int(rng.integers(0, 3))  # required skills no candidate column exists for
+    return TeamProblem(
+        scores=rng.random(n),
+        skills=rng.random((n, known)) < 0.3,
+        n_required=known + unknown,
+        personality=rng.random((n, 5)),
+        diversity_weight=diversity_weight,
+    )
+
+
+@pytest.mark.parametrize("diversity_weight", [0.0, 0.3])
+def test_incremental_objectives_match_evaluate(diversity_weight):
+    for seed in range(40):
+        problem = _problem(seed, diversity_weight)
+        state = _Partial.empty(problem)
+        for member in range(min(3, len(problem) - 1)):
+            objectives = problem._objectives(state)
+            for pos in range(len(problem)):
+                if pos in state.members:
+                    continue
+                expected = problem.evaluate(state.members + (pos,)).objective
+                assert objectives[pos] == pytest.approx(expected, abs=1e-12)
+            state = state.add(problem, member)
+
+
+def test_unknown_required_skills_are_gaps():
+    problem = TeamProblem(scores=[1.0, 1.0], skills=[[True], [False]], n_required=3)
+    assert problem.evaluate([0, 1]).coverage == pytest.approx(1 / 3)
+
+
+@pytest.mark.parametrize("diversity_weight", [0.0, 0.3])
+def test_optimize_matches_brute_force_on_small_pools(diversity_weight):
+    for seed in range(60):
+        problem = _problem(seed, diversity_weight)
+        k = int(np.random.default_rng(seed).integers(1, min(4, len(problem)) + 1))
+        found = optimize_teams(problem, k, top_n=3, time_budget=10.0)
+        exact = brute_force_teams(problem, k, top_n=3)
+        assert [o.objective for o in found] == pytest.approx([o.objective for o in exact], abs=1e-12), seed
+        for option in found:
+            assert option.objective == pytest.approx(problem.evaluate(option.members).objective, abs=1e-12)
+
+
+# ---------------------------------------------------------------------------
+# Placement of candidates into existing teams
+# ---------------------------------------------------------------------------
+
+def _placement_data():
+    import json
+
+    import pandas as pd
+
+    from conftest import ROOT
+    from mvp.pipeline import RecruitingMVP
+
+    data = ROOT / "mvp" / "data"
+    candidates = RecruitingMVP(str(data / "sample_resumes.csv")).df
+    teams = pd.read_csv(data / "sample_teams.csv")
+    role = json.loads((data / "role_requirements.json").read_text(encoding="utf-8"))
+    # Include a required skill no team lists, so it is a gap everywhere.
+    return candidates, teams, role["required_skills"] + ["kubernetes"]
+
+
+def _reference_scores(candidate, teams, required):
+    """The original per-team loop of recommend_team, unrounded."""
+    cand_skills = set(candidate["canonical_skills"] or [])
+    req = set(required)
+    cand_vec = candidate[["O", "C", "E", "A", "N"]].to_numpy(dtype=float)
+    scores = {}
+    for _, t in teams.iterrows():
+        team_skill_set = set(t["team_skills"].split("|")) if isinstance(t["team_skills"], str) else set()
+        team_gaps = req - team_skill_set
+        coverage = len(cand_skills & team_gaps) / max(1, len(team_gaps)) if team_gaps else 1.0
+        team_vec = t[["O", "C", "E", "A", "N"]].to_numpy(dtype=float)
+        personality = float(cand_vec @ team_vec / (np.linalg.norm(cand_vec) * np.linalg.norm(team_vec)))
+        diversity = 1.0 - len(cand_skills & team_skill_set) / max(1, len(req))
+        final = 0.55 * coverage + 0.35 * personality + 0.10 * diversity
+        scores[t["team_id"]] = (coverage, personality, diversity, final)
+    return scores
+
+
+def test_recommend_team_matches_reference_loop():
+    from mvp.team import recommend_team
+
+    candidates, teams, required = _placement_data()
+    for _, candidate in candidates.iterrows():
+        expected = _reference_scores(candidate, teams, required)
+        out = recommend_team(candidate, teams, required)
+        assert sorted(out["team_id"]) == sorted(expected)
+        assert list(out["final_score"]) == sorted(out["final_score"], reverse=True)
+        for row in out.itertuples():
+            values = (row.coverage_gaps, row.personality_fit, row.diversity_bonus, row.final_score)
+            assert values == tuple(round(v, 3) for v in expected[row.team_id]), (candidate["id"], row.team_id)
+
+
+def test_place_candidates_and_top_placements():
+    from mvp.team import place_candidates, top_placements
+
+    candidates, teams, required = _placement_data()
+    placement = place_candidates(candidates, teams, required)
+    team_ids = list(teams["team_id"])
+    for m, (_, candidate) in enumerate(candidates.iterrows()):
+        expected = _reference_scores(candidate, teams, required)
+        for t, team_id in enumerate(team_ids):
+            got = (placement.coverage[m, t], placement.personality[m, t], placement.diversity[m, t], placement.final[m, t])
+            assert got == pytest.approx(expected[team_id], abs=1e-12)
+
+    top = top_placements(placement, n=2, candidate_ids=candidates["id"])
+    assert len(top) == 2 * len(candidates)
+    for m, cid in enumerate(candidates["id"]):
+        rows = top[top["candidate_id"] == cid]
+        assert list(rows["rank"]) == [1, 2]
+        best = sorted(placement.final[m], reverse=True)[:2]
+        assert list(rows["final_score"]) == [round(float(v), 3) for v in best]